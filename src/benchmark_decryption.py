@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from update_all.libcrypto import load_libcrypto
+
+
+def openssl_decrypt(input_path: str, key_path: str) -> bytes:
+    return subprocess.run(
+        ['openssl', 'enc', '-aes-256-cbc', '-d', '-in', input_path, '-kfile', key_path, '-nosalt', '-iter', '1'],
+        check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    ).stdout
+
+
+def measure(name: str, runs: int, decrypt: Callable[[], bytes], expected: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        if decrypt() != expected:
+            raise SystemExit(f'{name} produced a different plaintext!')
+    average = (time.perf_counter() - start) / runs
+    print(f'{name:>10}: {average * 1000:9.2f}ms per decryption')
+    return average
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare the openssl subprocess and the in-process libcrypto decryption of a timeline sized file.')
+    parser.add_argument('--size', type=int, default=2 * 1024 * 1024, help='Size in bytes of the random plaintext.')
+    parser.add_argument('--runs', type=int, default=20, help='Decryptions measured on each path.')
+    args = parser.parse_args()
+
+    libcrypto = load_libcrypto()
+    if libcrypto is None:
+        print('libcrypto could not be loaded, nothing to compare.')
+        return 1
+
+    with tempfile.TemporaryDirectory() as folder:
+        key_path = os.path.join(folder, 'update_all.patreonkey')
+        input_path = os.path.join(folder, 'timeline_plus.enc')
+        Path(key_path).write_bytes(os.urandom(16).hex().encode() + b'\n')
+        plaintext = os.urandom(args.size)
+        Path(input_path).write_bytes(subprocess.run(
+            ['openssl', 'enc', '-aes-256-cbc', '-e', '-kfile', key_path, '-nosalt', '-iter', '1'],
+            input=plaintext, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ).stdout)
+
+        print(f'Decrypting {args.size} bytes {args.runs} times on each path...')
+        subprocess_time = measure('openssl', args.runs, lambda: openssl_decrypt(input_path, key_path), plaintext)
+        libcrypto_time = measure('libcrypto', args.runs, lambda: libcrypto.decrypt_with_kfile(Path(input_path).read_bytes(), Path(key_path).read_bytes()), plaintext)
+
+    print(f'libcrypto is {subprocess_time / libcrypto_time:.1f}x faster.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -88,6 +88,79 @@ print(f"Recreate:   {to_ms(recreate_median):.3f} ms")
 print(f"Reuse:      {to_ms(reuse_median):.3f} ms")
 print(f"Saving:     {to_ms(saving):.3f} ms per model ({saving / statistics.median(samples) * 100:.2f}%)")
 print("Samples:    2000 paired")
+
+from update_all.settings_screen_model_index import settings_screen_model_index
+from update_all.ui_model_utilities import gather_effects_by_type, gather_variable_declarations, search_in_model
+
+started = time.perf_counter_ns()
+index = settings_screen_model_index()
+index_build = time.perf_counter_ns() - started
+
+walk_samples = []
+lookup_samples = []
+new_model_samples = []
+for _ in range(100):
+    started = time.perf_counter_ns()
+    gather_variable_declarations(settings_screen_model(), "separate_db")
+    walk_samples.append(time.perf_counter_ns() - started)
+
+    started = time.perf_counter_ns()
+    index.variable_declarations("separate_db")
+    lookup_samples.append(time.perf_counter_ns() - started)
+
+    started = time.perf_counter_ns()
+    index.new_model()["items"]["main_menu_login"]
+    new_model_samples.append(time.perf_counter_ns() - started)
+
+print()
+print("settings_screen_model_index()")
+print(f"Build once: {to_ms(index_build):.3f} ms")
+print(f"Walk:       {to_ms(statistics.median(walk_samples)):.3f} ms per gather_variable_declarations(settings_screen_model())")
+print(f"Lookup:     {to_ms(statistics.median(lookup_samples)):.3f} ms per variable_declarations()")
+print(f"New model:  {to_ms(statistics.median(new_model_samples)):.3f} ms with one section loaded")
+print("Samples:    100")
+
+gather_samples = []
+search_samples = []
+for _ in range(20):
+    model = settings_screen_model()
+    started = time.perf_counter_ns()
+    gather_variable_declarations(model, "separate_db")
+    gather_effects_by_type(model, "mister_ini_add")
+    gather_samples.append(time.perf_counter_ns() - started)
+
+    model = settings_screen_model()
+    started = time.perf_counter_ns()
+    search_in_model([], model["base_types"], model, lambda result, item: None)
+    search_samples.append(time.perf_counter_ns() - started)
+    model = None
+
+print()
+print("Stateless gather_* and search_in_model, each call walks the model")
+print(f"Gather:     {to_ms(statistics.median(gather_samples)):.3f} ms for variables and effects")
+print(f"Search:     {to_ms(statistics.median(search_samples)):.3f} ms")
+print("Samples:    20")
+
+from update_all.tracing import Tracer
+
+memory_tracer = Tracer()
+memory_tracer.enable()
+memory_tracer.enable_memory_tracking()
+with memory_tracer.span("settings_screen_model"):
+    model = settings_screen_model()
+with memory_tracer.span("gather_variable_declarations"):
+    gather_variable_declarations(model, "separate_db")
+with memory_tracer.span("search_in_model"):
+    search_in_model([], model["base_types"], model, lambda result, item: None)
+with memory_tracer.span("new_model"):
+    index.new_model()
+model = None
+
+print()
+print("Memory high-water mark per span")
+for event in memory_tracer.events():
+    print(f"{event.name + ':':<30} {event.args['peak_rss_kb']} KB in {to_ms(event.duration * 1_000_000_000):.3f} ms")
+print(f"{'Whole run:':<30} {memory_tracer.run_peak_rss_kb()} KB")
 '''
     exec_ssh(
         'set -e\n'
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import argparse
+
+from test.settings_screen_key_replay import KEY_SCRIPTS, percentile_of, replay_keys
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Replay scripted key sequences through the settings screen without a terminal and report per-keystroke costs.')
+    parser.add_argument('scripts', nargs='*', help=f'Key scripts to replay, all of them by default: {", ".join(KEY_SCRIPTS)}')
+    parser.add_argument('--runs', type=int, default=20, help='Replays of each script used for the latency percentiles.')
+    parser.add_argument('--no-allocations', action='store_true', help='Skip the extra replay traced with tracemalloc.')
+    args = parser.parse_args()
+    unknown_scripts = [name for name in args.scripts if name not in KEY_SCRIPTS]
+    if unknown_scripts:
+        parser.error(f'unknown key scripts: {", ".join(unknown_scripts)}')
+
+    print(f'{"script":>22} {"keys":>5} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8} {"draws/key":>10} {"max KiB/key":>12}')
+    for name in args.scripts or KEY_SCRIPTS:
+        keys = KEY_SCRIPTS[name]
+        latencies = []
+        draw_calls = []
+        for _ in range(args.runs):
+            report = replay_keys(keys)
+            latencies.extend(report.latencies)
+            draw_calls = report.draw_calls
+
+        max_kib = '-'
+        if not args.no_allocations:
+            allocated_bytes = replay_keys(keys, trace_allocations=True).allocated_bytes
+            max_kib = f'{max(allocated_bytes, default=0) / 1024:.1f}'
+
+        percentiles = ' '.join(f'{percentile_of(latencies, p) * 1000:8.3f}' for p in (50, 90, 99, 100))
+        print(f'{name:>22} {len(keys):>5} {percentiles} {sum(draw_calls) / max(1, len(draw_calls)):10.1f} {max_kib:>12}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import unittest
+
+from test.settings_screen_key_replay import ESC, KEY_SCRIPTS, percentile_of, replay_keys
+from update_all.ui_model_utilities import Key
+
+
+class TestSettingsScreenKeyReplay(unittest.TestCase):
+
+    def test_replay_keys___with_every_key_script___measures_every_key(self):
+        for name, keys in KEY_SCRIPTS.items():
+            with self.subTest(name):
+                report = replay_keys(keys)
+
+                self.assertEqual(len(keys), len(report.latencies))
+                self.assertEqual(len(keys), len(report.draw_calls))
+                self.assertEqual(len(keys) + 1, len(report.headers))
+
+    def test_replay_keys___when_entering_and_leaving_submenu___visits_its_header(self):
+        report = replay_keys([Key.ENTER, ESC])
+
+        main_menu_header, submenu_header, back_header = report.headers
+        self.assertEqual('Main Distribution Settings', submenu_header)
+        self.assertEqual(main_menu_header, back_header)
+
+    def test_replay_keys___when_moving_down_the_main_menu___draws_each_frame_once(self):
+        report = replay_keys([Key.DOWN, Key.DOWN])
+
+        self.assertEqual(report.draw_calls[0], report.draw_calls[1])
+        self.assertEqual(3, report.frames)
+
+    def test_replay_keys___with_trace_allocations___reports_allocated_bytes_per_key(self):
+        report = replay_keys([Key.DOWN, Key.UP], trace_allocations=True)
+
+        self.assertEqual(2, len(report.allocated_bytes))
+        self.assertTrue(all(allocated >= 0 for allocated in report.allocated_bytes))
+
+    def test_percentile_of___with_values___returns_nearest_rank(self):
+        values = [5, 1, 4, 2, 3]
+
+        self.assertEqual((1, 3, 5), (percentile_of(values, 0), percentile_of(values, 50), percentile_of(values, 100)))
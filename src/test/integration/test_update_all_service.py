@@ -16,13 +16,16 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 import json
+import os
+import tempfile
 import unittest
 from concurrent.futures import Future
+from pathlib import Path
 from typing import Optional
 
 from update_all.config import Config
 from update_all.constants import FILE_mister_downloader_needs_reboot, EXIT_CODE_REQUIRES_EARLY_EXIT, \
-    COMMAND_SHOW_CHIP_ID_RESULT, FILE_update_all_pyz, FILE_settings_screen_model_json_zip, \
+    COMMAND_SHOW_CHIP_ID_RESULT, COMMAND_LATEST_LOG, FILE_update_all_pyz, FILE_settings_screen_model_json_zip, \
     FILE_update_all_self_update_downloader_log, FILE_update_all_self_update_resume, EXIT_CODE_CAN_CONTINUE, \
     BACKGROUND_JOBS_SOFT_TIMEOUT
 from update_all.countdown import CountdownOutcome
@@ -177,6 +180,21 @@ class TestUpdateAllService(unittest.TestCase):
         sut, _ = tester(config=Config(databases=default_databases(), transition_service_only=True), env_stub=stub)
         self.assertEqual(EXIT_CODE_REQUIRES_EARLY_EXIT, sut.full_run(UpdateAllServicePass.NewRun))
 
+    def test_full_run___with_latest_log_command___shows_the_log_without_following_lines_appended_after_opening_it(self):
+        sut, _ = tester(config=Config(databases=default_databases(), command=COMMAND_LATEST_LOG))
+        with tempfile.TemporaryDirectory() as folder:
+            log_path = os.path.join(folder, 'update_all.log')
+            Path(log_path).write_text('first\nsecond\n')
+            sut._file_system.resolve = lambda _path: log_path
+
+            self.assertEqual(0, sut.full_run(UpdateAllServicePass.NewRun))
+            with open(log_path, 'a') as f:
+                f.write('appended\n')
+
+            [(latest_log, follow)] = sut.log_viewer.show_calls
+            self.assertFalse(follow)
+            self.assertEqual(2, latest_log.line_count())
+
     def test_full_run___with_show_chip_id_result_command___opens_chip_id_result_menu_and_returns_without_update_flow(self):
         settings_screen = SettingsScreenStub(load_chip_id_result_menu_result='menu')
         sut, _ = tester(
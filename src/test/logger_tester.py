@@ -25,9 +25,6 @@ class NoLogger(Logger):
     def debug(self, *args, sep='', end='\n', flush=False):
         pass
 
-    def bench(self, _label):
-        pass
-
     def configure(self, _config):
         pass
 
@@ -0,0 +1,195 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from test.fake_filesystem import FileSystemFactory
+from test.file_system_tester_state import FileSystemState
+from test.update_all_service_tester import EnvironmentSetupTester, SettingsScreenPrinterStub, SettingsScreenTester
+from update_all.config import Config
+from update_all.local_store import LocalStore
+from update_all.other import GenericProvider, TerminalSize
+from update_all.ui_engine import Interpolator, UiRuntime
+from update_all.ui_engine_dialog_application import UiDialogDrawer, UiDialogDrawerFactory
+from update_all.ui_model_utilities import Key
+from update_all.update_output import NoopUpdateOutput
+
+ESC = 27
+
+KEY_SCRIPTS: Dict[str, List[Union[Key, int]]] = {
+    'main_menu_scroll': [Key.DOWN] * 12 + [Key.UP] * 12,
+    'main_menu_toggle': [Key.RIGHT, Key.ENTER, Key.ENTER, Key.ENTER, Key.ENTER, Key.LEFT],
+    'submenus_round_trip': [Key.ENTER, Key.DOWN, Key.DOWN, Key.DOWN, ESC, Key.DOWN, Key.ENTER, Key.DOWN, Key.DOWN, ESC] * 2,
+    'abort_dialog': [Key.RIGHT, Key.ENTER, Key.LEFT, ESC, Key.RIGHT, Key.LEFT, Key.RIGHT, Key.LEFT],
+}
+
+
+class KeyScriptFinished(Exception):
+    pass
+
+
+@dataclass
+class KeyReplayReport:
+    latencies: List[float] = field(default_factory=list)
+    draw_calls: List[int] = field(default_factory=list)
+    allocated_bytes: List[int] = field(default_factory=list)
+    headers: List[str] = field(default_factory=list)
+    frames: int = 0
+
+    def latency_percentile(self, percentile: float) -> float:
+        return percentile_of(self.latencies, percentile)
+
+
+def percentile_of(values: List[float], percentile: float) -> float:
+    if len(values) == 0:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+
+class _KeyReplay:
+    def __init__(self, keys: Iterable[Union[Key, int]], trace_allocations: bool):
+        self._keys = iter(keys)
+        self._trace_allocations = trace_allocations
+        self._key_started: Optional[float] = None
+        self._memory_before_key = 0
+        self._draws = 0
+        self.report = KeyReplayReport()
+
+    def record_draw(self) -> None:
+        self._draws += 1
+
+    def next_key(self, header: str) -> Union[Key, int]:
+        if self._key_started is not None:
+            self.report.latencies.append(time.perf_counter() - self._key_started)
+            self.report.draw_calls.append(self._draws)
+            if self._trace_allocations:
+                self.report.allocated_bytes.append(tracemalloc.get_traced_memory()[1] - self._memory_before_key)
+
+        self.report.headers.append(header)
+        key = next(self._keys, None)
+        if key is None:
+            raise KeyScriptFinished()
+
+        self._draws = 0
+        if self._trace_allocations:
+            tracemalloc.reset_peak()
+            self._memory_before_key = tracemalloc.get_traced_memory()[0]
+        self._key_started = time.perf_counter()
+        return key
+
+
+class RecordingDrawer(UiDialogDrawer):
+    """Drawer that interpolates and counts everything a screen would draw, and answers paint() with the next scripted key."""
+
+    def __init__(self, interpolator: Interpolator, replay: _KeyReplay):
+        self._interpolator = interpolator
+        self._replay = replay
+        self._header = ''
+        self._text_lines = 0
+
+    def start(self, data):
+        self._replay.record_draw()
+        self._header = self._interpolator.interpolate(data['header']) if 'header' in data else ''
+        self._text_lines = 0
+
+    def add_text_line(self, text):
+        self._replay.record_draw()
+        self._interpolator.interpolate(text)
+        self._text_lines += 1
+
+    def add_menu_entry(self, option, info, is_selected=False):
+        self._replay.record_draw()
+        self._interpolator.interpolate(option)
+        self._interpolator.interpolate(info)
+
+    def add_action(self, action, is_selected=False):
+        self._replay.record_draw()
+        self._interpolator.interpolate(action)
+
+    def add_inactive_action(self, length: int, is_selected=False):
+        self._replay.record_draw()
+
+    def show_overscan_preview(self) -> None:
+        self._replay.record_draw()
+
+    def paint(self) -> Union[Key, int]:
+        self._replay.record_draw()
+        return self._replay.next_key(self._header)
+
+    def clear(self) -> None:
+        self._replay.record_draw()
+
+    def total_text_lines(self) -> int:
+        return self._text_lines
+
+
+class _RecordingDrawerFactory(UiDialogDrawerFactory):
+    def __init__(self, replay: _KeyReplay):
+        self._replay = replay
+
+    def create_ui_dialog_drawer(self, interpolator: Interpolator) -> UiDialogDrawer:
+        return RecordingDrawer(interpolator, self._replay)
+
+
+class RecordingRuntime(UiRuntime):
+    def __init__(self, replay: _KeyReplay):
+        self._replay = replay
+
+    def initialize_runtime(self, cb: Callable[[], None]) -> None:
+        cb()
+
+    def update(self) -> None:
+        self._replay.report.frames += 1
+
+    def interrupt(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+
+def replay_keys(keys: Iterable[Union[Key, int]], files: Optional[Dict[str, Any]] = None, trace_allocations: bool = False) -> KeyReplayReport:
+    """Runs the real settings screen model and effects over a fake file system, feeding it the given keys."""
+    replay = _KeyReplay(keys, trace_allocations)
+    config_provider = GenericProvider[Config]()
+    store_provider = GenericProvider[LocalStore]()
+    file_system = FileSystemFactory(state=FileSystemState(files=files)).create_for_system_scope()
+    EnvironmentSetupTester(file_system=file_system, config_provider=config_provider, store_provider=store_provider).setup_environment(TerminalSize(columns=80, lines=40), NoopUpdateOutput())
+    settings_screen = SettingsScreenTester(
+        config_provider=config_provider,
+        store_provider=store_provider,
+        file_system=file_system,
+        settings_screen_printer=SettingsScreenPrinterStub(factory=_RecordingDrawerFactory(replay)),
+        ui_runtime=RecordingRuntime(replay),
+    )
+
+    if trace_allocations:
+        tracemalloc.start()
+    try:
+        settings_screen.load_main_menu()
+    except KeyScriptFinished:
+        pass
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+
+    return replay.report
@@ -16,6 +16,8 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 
+import hashlib
+import io
 import os
 import tempfile
 import unittest
@@ -28,7 +30,7 @@ from test.file_system_tester_state import FileSystemState
 from test.logger_tester import LoggerSpy
 from test.testing_objects import pocket_firmware_details_json
 from test.update_all_service_tester import LocalRepositoryTester
-from update_all.analogue_pocket.firmware_update import remove_old_firmware_files
+from update_all.analogue_pocket.firmware_update import remove_old_firmware_files, download_firmware
 
 
 def tester(files: dict[str, Any]):
@@ -96,6 +98,38 @@ class TestFirmwareUpdate(unittest.TestCase):
                 self.assertFalse(already_on_latest)
                 self.assertEqual([], os.listdir(mount))
 
+        def test_download_firmware___with_matching_size_and_md5___leaves_only_the_final_firmware_file(self) -> None:
+            with tempfile.TemporaryDirectory() as mount:
+                target = Path(mount, 'pocket_firmware_2.1.bin')
+
+                self.assertTrue(download_firmware(io.BytesIO(_firmware_bytes), target, _firmware_info(), LoggerSpy()))
+
+                self.assertEqual(_firmware_bytes, target.read_bytes())
+                self.assertEqual(['pocket_firmware_2.1.bin'], os.listdir(mount))
+
+        def test_download_firmware___with_wrong_md5___leaves_no_firmware_file_behind(self) -> None:
+            with tempfile.TemporaryDirectory() as mount:
+                target = Path(mount, 'pocket_firmware_2.1.bin')
+
+                self.assertFalse(download_firmware(io.BytesIO(_firmware_bytes), target, {**_firmware_info(), 'md5': 'bad'}, LoggerSpy()))
+
+                self.assertEqual([], os.listdir(mount))
+
+        def test_download_firmware___with_truncated_stream___leaves_no_firmware_file_behind(self) -> None:
+            with tempfile.TemporaryDirectory() as mount:
+                target = Path(mount, 'pocket_firmware_2.1.bin')
+
+                self.assertFalse(download_firmware(io.BytesIO(_firmware_bytes[:1000]), target, _firmware_info(), LoggerSpy()))
+
+                self.assertEqual([], os.listdir(mount))
+
+
+_firmware_bytes = bytes(range(256)) * 8000
+
+
+def _firmware_info() -> dict[str, Any]:
+    return {'size': 2.048, 'md5': hashlib.md5(_firmware_bytes).hexdigest(), 'file': 'pocket_firmware_2.1.bin', 'version': '2.1', 'url': 'https://analogue.co/fw'}
+
 
 def _touch(mount: str, *names: str) -> None:
     for name in names:
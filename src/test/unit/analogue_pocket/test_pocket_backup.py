@@ -0,0 +1,100 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from update_all.analogue_pocket import pocket_backup
+from update_all.analogue_pocket.pocket_backup import BackupStatus, backup_pocket_folder, load_backup_manifest, save_backup_manifest
+
+
+class TestPocketBackup(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pocket = os.path.join(self._tmp.name, 'pocket')
+        self.backup = os.path.join(self._tmp.name, 'backup')
+        os.makedirs(self.backup)
+        self._patch = patch.object(pocket_backup, 'BACKUP_FOLDER', self.backup)
+        self._patch.start()
+
+    def tearDown(self) -> None:
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def test_backup_pocket_folder___on_first_run___copies_every_file_as_new(self) -> None:
+        _write(self.pocket, 'Saves/gb/common/a.sav', 'Saves/gb/common/b.sav', 'Saves/gba/c.sav')
+
+        manifest = load_backup_manifest()
+        statuses = _statuses(backup_pocket_folder(self.pocket, 'Saves', manifest))
+
+        self.assertEqual({'a.sav': BackupStatus.NEW, 'b.sav': BackupStatus.NEW, 'c.sav': BackupStatus.NEW}, statuses)
+        self.assertEqual(b'Saves/gba/c.sav', Path(self.backup, 'Saves/gba/c.sav').read_bytes())
+        self.assertEqual(['gb/common/a.sav', 'gb/common/b.sav', 'gba/c.sav'], sorted(manifest['folders']['Saves']['files']))
+
+    def test_backup_pocket_folder___with_saved_manifest___only_copies_changed_files(self) -> None:
+        _write(self.pocket, 'Saves/a.sav', 'Saves/b.sav')
+        self._run_with_saved_manifest()
+
+        Path(self.pocket, 'Saves/b.sav').write_bytes(b'changed content')
+        statuses = self._run_with_saved_manifest()
+
+        self.assertEqual({'a.sav': BackupStatus.UNCHANGED, 'b.sav': BackupStatus.UPDATED}, statuses)
+        self.assertEqual(b'changed content', Path(self.backup, 'Saves/b.sav').read_bytes())
+
+    def test_backup_pocket_folder___when_pocket_files_and_folders_are_removed___deletes_them_from_backup(self) -> None:
+        _write(self.pocket, 'Saves/a.sav', 'Saves/gone/b.sav')
+        self._run_with_saved_manifest()
+
+        os.remove(os.path.join(self.pocket, 'Saves/gone/b.sav'))
+        os.rmdir(os.path.join(self.pocket, 'Saves/gone'))
+        statuses = self._run_with_saved_manifest()
+
+        self.assertEqual({'a.sav': BackupStatus.UNCHANGED, 'b.sav': BackupStatus.DELETED, 'gone': BackupStatus.DELETED}, statuses)
+        self.assertEqual(['a.sav'], os.listdir(os.path.join(self.backup, 'Saves')))
+
+    def test_backup_pocket_folder___without_manifest_but_with_up_to_date_backup___keeps_files_unchanged(self) -> None:
+        _write(self.pocket, 'Saves/a.sav')
+        _write(self.backup, 'Saves/a.sav', 'Saves/stale.sav')
+
+        statuses = _statuses(backup_pocket_folder(self.pocket, 'Saves'))
+
+        self.assertEqual({'a.sav': BackupStatus.UNCHANGED, 'stale.sav': BackupStatus.DELETED}, statuses)
+
+    def test_load_backup_manifest___with_corrupt_file___returns_empty_manifest(self) -> None:
+        Path(self.backup, pocket_backup.MANIFEST_FILENAME).write_text('{not json')
+        self.assertEqual({}, load_backup_manifest()['folders'])
+
+    def _run_with_saved_manifest(self):
+        manifest = load_backup_manifest()
+        statuses = _statuses(backup_pocket_folder(self.pocket, 'Saves', manifest))
+        save_backup_manifest(manifest)
+        return statuses
+
+
+def _write(root: str, *relative_paths: str) -> None:
+    for relative_path in relative_paths:
+        path = Path(root, relative_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(relative_path.encode())
+
+
+def _statuses(results) -> dict:
+    return {result['file']: result['status'] for result in results}
@@ -0,0 +1,120 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from update_all.analogue_pocket.snapshot_store import SnapshotStore, SnapshotStoreException, OBJECTS_FOLDER
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, 'root')
+        self.store_folder = os.path.join(self._tmp.name, 'snapshots')
+        os.makedirs(self.store_folder)
+        self.store = SnapshotStore(self.store_folder)
+        _write(self.root, {'Saves/a.sav': b'aaa', 'Saves/b.sav': b'aaa', 'Memories/c.sta': b'ccc'})
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_create___stores_identical_contents_once(self) -> None:
+        name = self._create('2024-01-01_00-00-00')
+
+        self.assertEqual(['Memories/c.sta', 'Saves/a.sav', 'Saves/b.sav'], sorted(self.store.load(name)['files']))
+        self.assertEqual(2, len(self._objects()))
+
+    def test_create___second_snapshot_of_unchanged_files___does_not_read_them_again(self) -> None:
+        self._create('2024-01-01_00-00-00')
+
+        with patch('update_all.analogue_pocket.snapshot_store.copy_file') as copy_file:
+            name = self._create('2024-01-02_00-00-00')
+
+        copy_file.assert_not_called()
+        self.assertEqual(3, len(self.store.load(name)['files']))
+
+    def test_create___with_changed_file___stores_only_the_new_content(self) -> None:
+        self._create('2024-01-01_00-00-00')
+        _write(self.root, {'Saves/a.sav': b'new content'})
+        self._create('2024-01-02_00-00-00')
+
+        self.assertEqual(3, len(self._objects()))
+
+    def test_restore___brings_back_the_snapshotted_contents(self) -> None:
+        name = self._create('2024-01-01_00-00-00')
+        _write(self.root, {'Saves/a.sav': b'overwritten'})
+        os.remove(os.path.join(self.root, 'Memories/c.sta'))
+
+        self.assertEqual(3, self.store.restore(name))
+
+        self.assertEqual(b'aaa', Path(self.root, 'Saves/a.sav').read_bytes())
+        self.assertEqual(b'ccc', Path(self.root, 'Memories/c.sta').read_bytes())
+
+    def test_export_zip___contains_every_snapshotted_file(self) -> None:
+        name = self._create('2024-01-01_00-00-00')
+        zip_path = os.path.join(self._tmp.name, 'export.zip')
+
+        self.store.export_zip(name, zip_path)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            self.assertEqual(['Memories/c.sta', 'Saves/a.sav', 'Saves/b.sav'], sorted(zipf.namelist()))
+            self.assertEqual(b'ccc', zipf.read('Memories/c.sta'))
+
+    def test_cleanup___keeps_newest_snapshots_and_drops_unreferenced_objects(self) -> None:
+        _write(self.root, {'Saves/a.sav': b'first'})
+        oldest = self._create('2024-01-01_00-00-00')
+        only_in_oldest = self.store.load(oldest)['files']['Saves/a.sav'][2]
+        _write(self.root, {'Saves/a.sav': b'second'})
+        self._create('2024-01-02_00-00-00')
+        _write(self.root, {'Saves/a.sav': b'third'})
+        self._create('2024-01-03_00-00-00')
+        self.assertIn(only_in_oldest, self._objects())
+
+        self.store.cleanup(['pocket-'], 2)
+
+        self.assertEqual(['pocket-2024-01-03_00-00-00', 'pocket-2024-01-02_00-00-00'], self.store.names('pocket-'))
+        referenced = {entry[2] for name in self.store.names() for entry in self.store.load(name)['files'].values()}
+        self.assertEqual(referenced, set(self._objects()))
+        self.assertNotIn(only_in_oldest, self._objects())
+
+    def test_load___with_unknown_name___raises(self) -> None:
+        with self.assertRaises(SnapshotStoreException):
+            self.store.load('pocket-missing')
+
+    def _create(self, timestamp: str) -> str:
+        with patch('update_all.analogue_pocket.snapshot_store.datetime') as datetime:
+            datetime.datetime.now.return_value.strftime.return_value = timestamp
+            return self.store.create('pocket-', self.root, ['Memories', 'Saves'])
+
+    def _objects(self) -> list[str]:
+        objects = []
+        for bucket in os.scandir(os.path.join(self.store_folder, OBJECTS_FOLDER)):
+            objects.extend(os.listdir(bucket.path))
+        return objects
+
+
+def _write(root: str, files: dict[str, bytes]) -> None:
+    for relative_path, content in files.items():
+        path = Path(root, relative_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
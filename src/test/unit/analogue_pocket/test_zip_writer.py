@@ -0,0 +1,118 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from update_all.analogue_pocket.zip_writer import ZipEntry, write_zip, should_store
+
+
+class TestZipWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self._tmp.name, 'out.zip')
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_write_zip___keeps_entry_order_and_contents(self) -> None:
+        files = {'Saves/%02d.txt' % i: (b'line %d\n' % i) * (i * 100 + 1) for i in range(20)}
+        entries = [ZipEntry(self._file(name, content), name) for name, content in files.items()]
+
+        self.assertEqual(20, write_zip(self.zip_path, entries))
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(list(files), zipf.namelist())
+            for name, content in files.items():
+                self.assertEqual(content, zipf.read(name))
+
+    def test_write_zip___compression_depends_on_the_entry(self) -> None:
+        entries = [
+            ZipEntry(self._file('text.txt', b'a' * 10000), 'text.txt'),
+            ZipEntry(self._file('game.zip', b'a' * 10000), 'game.zip'),
+            ZipEntry(self._file('small.sav', b'a' * 8192), 'small.sav'),
+            ZipEntry(self._file('random.bin', os.urandom(10000)), 'random.bin'),
+        ]
+
+        write_zip(self.zip_path, entries)
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual({
+                'text.txt': zipfile.ZIP_DEFLATED,
+                'game.zip': zipfile.ZIP_STORED,
+                'small.sav': zipfile.ZIP_STORED,
+                'random.bin': zipfile.ZIP_STORED,
+            }, {info.filename: info.compress_type for info in zipf.infolist()})
+
+    def test_write_zip___with_big_files_mixed_in___streams_them_in_order(self) -> None:
+        names = ['a.txt', 'big.txt', 'c.txt']
+        entries = [ZipEntry(self._file(name, name.encode() * 4000), name) for name in names]
+
+        with patch('update_all.analogue_pocket.zip_writer.ZIP_IN_MEMORY_MAX_SIZE', 10000):
+            write_zip(self.zip_path, entries)
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(names, zipf.namelist())
+            self.assertEqual(b'big.txt' * 4000, zipf.read('big.txt'))
+
+    def test_write_zip___with_read_ahead_over_the_byte_budget___writes_every_entry_in_order(self) -> None:
+        files = {'%02d.txt' % i: (b'%d' % i) * 5000 for i in range(8)}
+        entries = [ZipEntry(self._file(name, content), name) for name, content in files.items()]
+
+        with patch('update_all.analogue_pocket.zip_writer.ZIP_READ_AHEAD_MAX_BYTES', 12000):
+            self.assertEqual(8, write_zip(self.zip_path, entries))
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(files, {name: zipf.read(name) for name in zipf.namelist()})
+
+    def test_write_zip___with_non_ascii_name___is_readable_by_zipfile(self) -> None:
+        write_zip(self.zip_path, [ZipEntry(self._file('a.txt', b'abc' * 100), 'Saves/ポケモン.sav')])
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertEqual(b'abc' * 100, zipf.read('Saves/ポケモン.sav'))
+
+    def test_write_zip___with_date_time___overrides_file_mtime(self) -> None:
+        write_zip(self.zip_path, [ZipEntry(self._file('a.txt', b'a'), 'a.txt', (2001, 2, 3, 4, 5, 6))])
+
+        with zipfile.ZipFile(self.zip_path) as zipf:
+            self.assertEqual((2001, 2, 3, 4, 5, 6), zipf.getinfo('a.txt').date_time)
+
+    def test_should_store(self) -> None:
+        cases = [
+            ('Memories/Save States/gb/game.sta', 100_000_000, True),
+            ('Saves/gb/game.sav', 8192, True),
+            ('Saves/gba/game.sav', 1024 * 1024, False),
+            ('Settings/core.json', 100, False),
+        ]
+        for arcname, size, expected in cases:
+            with self.subTest(arcname=arcname, size=size):
+                self.assertEqual(expected, should_store(arcname, size))
+
+    def _file(self, name: str, content: bytes) -> str:
+        path = os.path.join(self._tmp.name, 'src', name)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(content)
+        return path
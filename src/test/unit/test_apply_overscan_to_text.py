@@ -19,7 +19,7 @@ import unittest
 from io import StringIO
 from unittest.mock import patch
 
-from update_all.logger import apply_overscan_to_text, PrintLogger
+from update_all.logger import apply_overscan_to_text, OverscanWrapper, PrintLogger
 
 
 class TestApplyOverscanToText(unittest.TestCase):
@@ -226,5 +226,34 @@ class TestApplyOverscanToText(unittest.TestCase):
         self.assertEqual('  abcd\n  e', stdout.getvalue())
 
 
+class TestOverscanWrapper(unittest.TestCase):
+    def test_wrap___with_table_row_pieces___pads_only_the_first_piece(self):
+        wrapper = OverscanWrapper(columns=40, overscan=2)
+
+        rendered = wrapper.wrap('%-10s' % 'MRA', '') + wrapper.wrap(' %-6s' % 'Core', '') + wrapper.wrap('', '\n')
+
+        self.assertEqual('  MRA        Core  \n', rendered)
+
+    def test_wrap___with_continuation_reaching_the_exact_width___breaks_the_line(self):
+        wrapper = OverscanWrapper(columns=8, overscan=2)
+
+        rendered = wrapper.wrap('ab', '') + wrapper.wrap('cd', '') + wrapper.wrap('e', '')
+
+        self.assertEqual('  abcd\n  e', rendered)
+
+    def test_wrap___with_the_same_long_line_twice___renders_it_the_same_way(self):
+        wrapper = OverscanWrapper(columns=16, overscan=2)
+        line = '#' * 30
+
+        self.assertEqual(wrapper.wrap(line, '\n'), wrapper.wrap(line, '\n'))
+        self.assertEqual('  ' + '#' * 12 + '\n  ' + '#' * 12 + '\n  ' + '#' * 6 + '\n', wrapper.wrap(line, '\n'))
+
+    def test_wrap___with_only_whitespace_wider_than_usable___renders_nothing_and_stays_at_line_start(self):
+        wrapper = OverscanWrapper(columns=8, overscan=2)
+
+        self.assertEqual('', wrapper.wrap(' ' * 10, ''))
+        self.assertEqual('  x\n', wrapper.wrap('x', '\n'))
+
+
 if __name__ == '__main__':
     unittest.main()
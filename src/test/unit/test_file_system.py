@@ -0,0 +1,102 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from update_all.file_system import copy_file, hash_file
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self._tmp.name, 'source.bin')
+        self.target = os.path.join(self._tmp.name, 'target.bin')
+        self.content = os.urandom(3 * 1024 * 1024 + 17)
+        Path(self.source).write_bytes(self.content)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_copy_file___copies_exact_content_and_returns_none(self) -> None:
+        self.assertIsNone(copy_file(self.source, self.target))
+        self.assertEqual(self.content, Path(self.target).read_bytes())
+
+    def test_copy_file___with_hash___returns_md5_of_the_copied_content(self) -> None:
+        md5 = copy_file(self.source, self.target, with_hash=True, buffer_size=64 * 1024)
+        self.assertEqual(hashlib.md5(self.content).hexdigest(), md5)
+        self.assertEqual(md5, hash_file(self.target))
+
+    def test_copy_file___with_progress___reports_growing_offsets_until_total(self) -> None:
+        for with_hash in [False, True]:
+            with self.subTest(with_hash=with_hash):
+                calls = []
+                copy_file(self.source, self.target, with_hash=with_hash, progress=lambda copied, total: calls.append((copied, total)), buffer_size=1024 * 1024)
+                self.assertEqual((len(self.content), len(self.content)), calls[-1])
+                self.assertEqual(sorted(calls), calls)
+
+    def test_copy_file___when_kernel_copy_is_unsupported___falls_back_to_buffered_copy(self) -> None:
+        def unsupported(_fd_in, _fd_out, _offset, _count):
+            raise OSError(errno.EXDEV, 'cross-device')
+
+        with patch('update_all.file_system._kernel_copy_functions', return_value=[unsupported, unsupported]):
+            copy_file(self.source, self.target)
+
+        self.assertEqual(self.content, Path(self.target).read_bytes())
+
+    def test_copy_file___when_kernel_copy_fails_midway___raises(self) -> None:
+        def broken(_fd_in, fd_out, offset, _count):
+            if offset > 0:
+                raise OSError(errno.EIO, 'io error')
+            return os.write(fd_out, b'x')
+
+        with patch('update_all.file_system._kernel_copy_functions', return_value=[broken]):
+            with self.assertRaises(OSError):
+                copy_file(self.source, self.target)
+
+    def test_copy_file___over_existing_bigger_target___truncates_it(self) -> None:
+        Path(self.target).write_bytes(self.content * 2)
+        copy_file(self.source, self.target, with_hash=True)
+        self.assertEqual(self.content, Path(self.target).read_bytes())
+
+    def test_copy_file___with_preserve_copystat___keeps_mtime(self) -> None:
+        os.utime(self.source, (1_000_000_000, 1_000_000_000))
+        copy_file(self.source, self.target, preserve=shutil.copystat)
+        self.assertEqual(os.path.getmtime(self.source), os.path.getmtime(self.target))
+
+    def test_copy_file___with_empty_source___creates_empty_target(self) -> None:
+        Path(self.source).write_bytes(b'')
+        self.assertEqual(hashlib.md5(b'').hexdigest(), copy_file(self.source, self.target, with_hash=True))
+        self.assertEqual(b'', Path(self.target).read_bytes())
+
+    def test_copy_file___onto_itself___raises_same_file_error_and_keeps_content(self) -> None:
+        with self.assertRaises(shutil.SameFileError):
+            copy_file(self.source, self.source)
+        self.assertEqual(self.content, Path(self.source).read_bytes())
+
+    def test_copy_file___onto_hard_link_of_source___raises_same_file_error_and_keeps_content(self) -> None:
+        os.link(self.source, self.target)
+        with self.assertRaises(shutil.SameFileError):
+            copy_file(self.source, self.target)
+        self.assertEqual(self.content, Path(self.source).read_bytes())
@@ -0,0 +1,69 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from update_all.libcrypto import BadDecrypt, kfile_password, load_libcrypto
+
+
+class TestLibCrypto(unittest.TestCase):
+    def test_kfile_password___takes_the_first_line_like_openssl_enc(self):
+        cases = [
+            (b'secret\n', b'secret'),
+            (b'secret\r\n', b'secret'),
+            (b'secret', b'secret'),
+            (b'secret\nother\n', b'secret'),
+            (b'x' * 200 + b'\n', b'x' * 127),
+        ]
+        for content, expected in cases:
+            with self.subTest(content=content):
+                self.assertEqual(expected, kfile_password(content))
+
+    def test_kfile_password___when_empty___raises_bad_decrypt(self):
+        self.assertRaises(BadDecrypt, kfile_password, b'\n')
+
+
+@unittest.skipUnless(shutil.which('openssl') is not None and load_libcrypto() is not None, 'needs openssl and libcrypto')
+class TestLibCryptoAgainstOpenSSL(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_decrypt_with_kfile___matches_openssl_enc_byte_for_byte(self):
+        for size in [0, 1, 15, 16, 17, 100_000]:
+            with self.subTest(size=size):
+                plaintext = os.urandom(size)
+                self.assertEqual(plaintext, load_libcrypto().decrypt_with_kfile(self._encrypt(plaintext, b'patreon-key\n'), b'patreon-key\n'))
+
+    def test_decrypt_with_kfile___with_a_wrong_key___raises_bad_decrypt(self):
+        ciphertext = self._encrypt(b'{"sections": []}' * 10, b'patreon-key\n')
+
+        self.assertRaises(BadDecrypt, load_libcrypto().decrypt_with_kfile, ciphertext, b'other-key\n')
+
+    def _encrypt(self, plaintext: bytes, key: bytes) -> bytes:
+        key_path = os.path.join(self._tmp.name, 'key')
+        Path(key_path).write_bytes(key)
+        return subprocess.run(['openssl', 'enc', '-aes-256-cbc', '-e', '-kfile', key_path, '-nosalt', '-iter', '1'],
+                              input=plaintext, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
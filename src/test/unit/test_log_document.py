@@ -0,0 +1,168 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from update_all.log_document import BlockDocument, ConcatDocument, ListDocument, LogFileDocument, MatchIndex, ViewerDocument, build_line_index, \
+    load_line_index, move_position, window_rows, first_position, last_position, LOG_DOCUMENT_READ_AHEAD, LOG_INDEX_EXTENSION
+from update_all.log_viewer import to_overscanned_doc
+
+
+class TestLogDocument(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self._tmp.name, 'update_all.log')
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_viewer_document___without_line_texts___can_not_be_created(self):
+        class RowsOnlyDocument(ViewerDocument):
+            def line_count(self): return 0
+            def line_rows(self, line): return []
+
+        with self.assertRaises(TypeError):
+            RowsOnlyDocument()
+
+    def test_build_line_index___with_and_without_trailing_newline(self):
+        self.assertEqual([0, 2, 5], list(build_line_index(self._log(b'a\nbc\n'))))
+        self.assertEqual([0, 2, 4], list(build_line_index(self._log(b'a\nbc'))))
+        self.assertEqual([0], list(build_line_index(self._log(b''))))
+
+    def test_load_line_index___with_save___reuses_the_saved_index_until_the_log_changes(self):
+        self._log(b'a\nb\n')
+        load_line_index(self.log_path, save_index=True)
+        Path(self.log_path + LOG_INDEX_EXTENSION).write_bytes(Path(self.log_path + LOG_INDEX_EXTENSION).read_bytes()[:-8] + (4).to_bytes(8, 'little'))
+
+        self.assertEqual([0, 2, 4], list(load_line_index(self.log_path)))
+
+        self._log(b'a\nb\nc\n')
+        self.assertEqual([0, 2, 4, 6], list(load_line_index(self.log_path)))
+
+    def test_line_rows___strips_ansi_and_wraps_like_the_overscanned_doc(self):
+        lines = ['\x1b[1mbold\x1b[0m line\n', 'abcdefghijklmnopqrstuvwxyz\n', '\n', 'last without newline']
+        doc = LogFileDocument(self._log(''.join(lines).encode()), columns=20, cols_overscan=2)
+
+        rows = [row for line in range(doc.line_count()) for row in doc.line_rows(line)]
+
+        self.assertEqual(to_overscanned_doc(['bold line\n'] + lines[1:], 20, 2), rows)
+
+    def test_line_rows___with_carriage_returns___splits_like_universal_newlines(self):
+        doc = LogFileDocument(self._log(b'a\r\nb\rc\n'), columns=20, cols_overscan=0)
+
+        self.assertEqual([['a\n'], ['b\n', 'c\n']], [doc.line_rows(0), doc.line_rows(1)])
+
+    def test_line_rows___on_a_big_log___only_decodes_the_block_around_the_line(self):
+        doc = LogFileDocument(self._log(b''.join(b'line %d\n' % i for i in range(10000))), columns=40, cols_overscan=2)
+
+        self.assertEqual(['  line 5000\n'], doc.line_rows(5000))
+        self.assertEqual(LOG_DOCUMENT_READ_AHEAD, len(doc._cache))
+
+    def test_move_position___walks_wrapped_rows_across_documents_and_stops_at_edges(self):
+        doc = ConcatDocument([
+            ListDocument([]),
+            LogFileDocument(self._log(b'abcdefghij\nxy\n'), columns=8, cols_overscan=1),
+            ListDocument(['t1', 't2']),
+        ])
+
+        self.assertEqual((0, 0), first_position(doc))
+        self.assertEqual((3, 0), last_position(doc))
+        self.assertEqual([' abcdef\n', ' ghij\n', ' xy\n', 't1', 't2'], window_rows(doc, (0, 0), 10))
+        self.assertEqual((2, 0), move_position(doc, (0, 0), 3))
+        self.assertEqual((0, 1), move_position(doc, (2, 0), -2))
+        self.assertEqual((0, 0), move_position(doc, (1, 0), -100))
+        self.assertEqual((3, 0), move_position(doc, (1, 0), 100))
+
+    def test_match_index___scans_in_chunks_and_finds_matches_ignoring_case(self):
+        doc = ConcatDocument([
+            LogFileDocument(self._log(b''.join(b'line %d%s\n' % (i, b' ERROR' if i % 10 == 3 else b'') for i in range(50))), columns=20, cols_overscan=0),
+            ListDocument(['Timeline error', 'ok']),
+        ])
+        index = MatchIndex(doc, 'error', chunk_lines=20)
+
+        self.assertFalse(index.scan_step())
+        self.assertEqual([3, 13], index.matches)
+        self.assertIsNone(index.next_match(13))
+
+        while not index.scan_step():
+            pass
+
+        self.assertEqual([3, 13, 23, 33, 43, 50], index.matches)
+        self.assertEqual(23, index.next_match(13))
+        self.assertEqual(3, index.previous_match(13))
+        self.assertIsNone(index.previous_match(3))
+        self.assertEqual(2, index.match_number(20))
+
+    def test_refresh___indexes_only_the_appended_lines_and_rerenders_an_unterminated_last_line(self):
+        doc = ConcatDocument([LogFileDocument(self._log(b'a\nb'), columns=20, cols_overscan=0), ListDocument(['t'])])
+        self.assertEqual(['a\n', 'b', 't'], window_rows(doc, (0, 0), 10))
+        self.assertFalse(doc.refresh())
+
+        with open(self.log_path, 'ab') as f:
+            f.write(b'c\nd\n')
+
+        self.assertTrue(doc.refresh())
+        self.assertEqual(['a\n', 'bc\n', 'd\n', 't'], window_rows(doc, (0, 0), 10))
+        self.assertEqual(list(build_line_index(self.log_path)), list(doc._parts[0]._offsets))
+
+    def test_refresh___on_a_truncated_log___indexes_it_again(self):
+        doc = LogFileDocument(self._log(b'first\nsecond\n'), columns=20, cols_overscan=0)
+        doc.line_rows(0)
+
+        self._log(b'new\n')
+
+        self.assertTrue(doc.refresh())
+        self.assertEqual(['new\n'], window_rows(doc, (0, 0), 10))
+
+    def test_match_index___rescan_from___picks_up_lines_appended_to_the_document(self):
+        doc = LogFileDocument(self._log(b'error\nfine err'), columns=20, cols_overscan=0)
+        index = MatchIndex(doc, 'error')
+        index.scan_step()
+        self.assertEqual([0], index.matches)
+
+        with open(self.log_path, 'ab') as f:
+            f.write(b'or\nerror again\n')
+        doc.refresh()
+        index.rescan_from(1)
+        index.scan_step()
+
+        self.assertEqual([0, 1, 2], index.matches)
+
+    def test_block_document___renders_only_the_blocks_it_reaches_and_reports_completion(self):
+        rendered = []
+        completed = []
+
+        def block(name, lines):
+            return len(lines), lambda: rendered.append(name) or lines
+
+        doc = BlockDocument([block('a', ['a1\n', 'a2\n']), (0, lambda: []), block('b', ['abcdefghij\n'])], columns=8, cols_overscan=1, on_complete=completed.append)
+
+        self.assertEqual(3, doc.line_count())
+        self.assertEqual([' abcdef\n', ' ghij\n'], doc.line_rows(2))
+        self.assertEqual(['b'], rendered)
+        self.assertEqual([], completed)
+
+        self.assertEqual(['a1\n', 'a2\n', 'abcdefghij\n'], doc.lines())
+        self.assertEqual([['a1\n', 'a2\n', 'abcdefghij\n']], completed)
+
+    def _log(self, content: bytes) -> str:
+        Path(self.log_path).write_bytes(content)
+        return self.log_path
@@ -45,11 +45,11 @@ class TestLogViewer(unittest.TestCase):
 
     def test_calculate_hud_message___uses_two_width_tiers_based_on_cnarrow(self):
         self.assertEqual(
-            '←↑↓→ Navigate · Any other key to EXIT',
+            '←↑↓→ Navigate · / Search · Other key EXIT',
             str(calculate_hud_message(_ScreenDims(_terminal_size(columns=80, lines=40), OverscanDim()))),
         )
         self.assertEqual(
-            '↑↓←→ Nav · Any key Exit',
+            '↑↓←→ Nav · / Search · Q Exit',
             str(calculate_hud_message(_ScreenDims(_terminal_size(columns=40, lines=18), OverscanDim()))),
         )
 
@@ -0,0 +1,132 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from update_all.logger import AsyncLogWriter, FileLoggerDecorator, PrintLogger, install_log_flush_signal_handlers
+
+
+class _CountingStringIO(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestAsyncLogWriter(unittest.TestCase):
+    def test_flush___makes_every_queued_write_visible_in_order(self):
+        writer = AsyncLogWriter()
+        target = _CountingStringIO()
+
+        for i in range(500):
+            writer.write(target, 'line %d\n' % i)
+        writer.flush()
+
+        self.assertEqual(''.join('line %d\n' % i for i in range(500)), target.getvalue())
+
+    def test_write___batches_flushes_instead_of_flushing_every_line(self):
+        writer = AsyncLogWriter(flush_interval=60, flush_bytes=1024 * 1024)
+        target = _CountingStringIO()
+
+        for i in range(500):
+            writer.write(target, 'line %d\n' % i)
+        writer.flush()
+
+        self.assertEqual(1, target.flushes)
+
+    def test_write___with_small_queue___does_not_lose_lines(self):
+        writer = AsyncLogWriter(queue_size=2)
+        target = _CountingStringIO()
+
+        for i in range(200):
+            writer.write(target, '%d,' % i)
+        writer.flush()
+
+        self.assertEqual(''.join('%d,' % i for i in range(200)), target.getvalue())
+
+    def test_flush_from_signal_handler___writes_and_flushes_everything_queued(self):
+        writer = AsyncLogWriter(flush_interval=60, flush_bytes=1024 * 1024)
+        target = _CountingStringIO()
+
+        for i in range(100):
+            writer.write(target, 'line %d\n' % i)
+        writer.flush_from_signal_handler(timeout=5.0)
+
+        self.assertEqual(''.join('line %d\n' % i for i in range(100)), target.getvalue())
+        self.assertEqual(1, target.flushes)
+
+    def test_flush_from_signal_handler___while_queue_mutex_is_held___returns_after_timeout(self):
+        writer = AsyncLogWriter()
+        writer.write(_CountingStringIO(), 'line\n')
+        writer.flush()
+
+        with writer._queue.mutex:
+            started = time.monotonic()
+            writer.flush_from_signal_handler(timeout=0.3)
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        writer.flush()
+
+
+class TestInstallLogFlushSignalHandlers(unittest.TestCase):
+    def test_install_log_flush_signal_handlers___without_sighup_like_on_windows___only_handles_sigterm(self):
+        fake_signal = MagicMock(spec=['SIGTERM', 'SIG_IGN', 'SIG_DFL', 'getsignal', 'signal'])
+        fake_signal.SIGTERM = 15
+
+        with patch('update_all.logger.signal', fake_signal):
+            install_log_flush_signal_handlers()
+
+        self.assertEqual([15], [call.args[0] for call in fake_signal.signal.call_args_list])
+
+
+class TestFileLoggerDecorator(unittest.TestCase):
+    def test_finalize___writes_every_printed_and_debug_line_to_the_final_logfile(self):
+        with tempfile.TemporaryDirectory() as folder:
+            logfile = os.path.join(folder, 'logs', 'update_all.log')
+            logger = FileLoggerDecorator(PrintLogger(), logfile)
+
+            with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                for i in range(100):
+                    logger.print('print', i)
+                logger.debug('debug line')
+                logger.finalize()
+
+            self.assertEqual(''.join('print%d\n' % i for i in range(100)), stdout.getvalue())
+            self.assertEqual(''.join('print%d\n' % i for i in range(100)) + 'debug line\n', Path(logfile).read_text())
+
+    def test_set_logfile_eager___keeps_lines_printed_before_and_after_switching(self):
+        with tempfile.TemporaryDirectory() as folder:
+            logfile = os.path.join(folder, 'eager.log')
+            logger = FileLoggerDecorator(PrintLogger(), os.path.join(folder, 'initial.log'))
+
+            with patch('sys.stdout', new_callable=io.StringIO):
+                logger.print('before')
+                logger.set_logfile(logfile, eager=True)
+                logger.print('after')
+                logger.finalize()
+
+            self.assertEqual('before\nafter\n', Path(logfile).read_text())
@@ -374,6 +374,35 @@ class TestMisterIniRepository(unittest.TestCase):
         self.assertEqual(original, sut.file_system.read_file_contents(FILE_MiSTer_ini))
         self.assertEqual([], sut.file_system.write_records)
 
+    def test_remove_mister_ini_key_from_sections___when_key_is_absent___returns_contents_without_writing(self):
+        original = '[mister]\nfoo=bar\n'
+        sut = MisterIniRepositoryTester(files={
+            FILE_MiSTer_ini: {'content': original},
+        })
+
+        changed, contents = sut.remove_mister_ini_key_from_sections(('mister', 'menu'), 'main', 'zaparoo/MiSTer_Zaparoo')
+
+        self.assertFalse(changed)
+        self.assertEqual(original, contents)
+        self.assertEqual([], sut.file_system.write_records)
+
+    def test_has_mister_ini_key___when_key_is_only_in_repeated_section___returns_false(self):
+        sut = MisterIniRepositoryTester(files={
+            FILE_MiSTer_ini: {'content': '[mister]\nfoo=bar\n[mister]\nmain=zaparoo/MiSTer_Zaparoo\n'},
+        })
+
+        self.assertFalse(sut.has_mister_ini_key(['mister'], 'main', 'zaparoo/MiSTer_Zaparoo'))
+
+    def test_has_mister_ini_key___after_write___sees_new_contents(self):
+        sut = MisterIniRepositoryTester(files={
+            FILE_MiSTer_ini: {'content': '[mister]\nfoo=bar\n'},
+        })
+        self.assertFalse(sut.has_mister_ini_key(['mister'], 'main', 'zaparoo/MiSTer_Zaparoo'))
+
+        sut.ensure_mister_ini_key('mister', 'main', 'zaparoo/MiSTer_Zaparoo')
+
+        self.assertTrue(sut.has_mister_ini_key(['mister'], 'main', 'zaparoo/MiSTer_Zaparoo'))
+
     def test_recreating_repository___forces_next_operation_to_read_mister_ini_again(self):
         sut = MisterIniRepositoryTester(files={
             FILE_MiSTer_ini: {'content': '[mister]\nfoo=bar\n'},
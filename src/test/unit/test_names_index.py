@@ -0,0 +1,93 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from test.fake_filesystem import FileSystemFactory
+from update_all.constants import FILE_names_txt, FILE_names_txt_index_cache
+from update_all.names_index import NamesIndex, parse_names_txt
+
+
+class TestNamesIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.names_path = os.path.join(self._tmp.name, 'names.txt')
+        self.cache_path = os.path.join(self._tmp.name, 'cache', 'names_index.json')
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_names___strips_entries_and_skips_malformed_lines(self):
+        Path(self.names_path).write_text('NES : Nintendo\n\nno colon\nGB:\nArcade_Foo: Foo: The Game\n')
+
+        self.assertEqual({'NES': 'Nintendo', 'Arcade_Foo': 'Foo: The Game'}, NamesIndex().names(self.names_path))
+
+    def test_upper_names___upper_cases_the_keys(self):
+        Path(self.names_path).write_text('Arcade_Foo: Foo\n')
+
+        self.assertEqual({'ARCADE_FOO': 'Foo'}, NamesIndex().upper_names(self.names_path))
+
+    def test_names___with_missing_file___returns_empty(self):
+        self.assertEqual({}, NamesIndex().names(self.names_path, self.cache_path))
+
+    def test_names___parses_once_until_the_file_changes(self):
+        Path(self.names_path).write_text('NES: Nintendo\n')
+        index = NamesIndex()
+
+        with patch('update_all.names_index.parse_names_txt', wraps=parse_names_txt) as parse:
+            index.names(self.names_path)
+            index.upper_names(self.names_path)
+            self.assertEqual(1, parse.call_count)
+
+            Path(self.names_path).write_text('NES: Famicom\n')
+            os.utime(self.names_path, ns=(1, 1))
+            self.assertEqual({'NES': 'Famicom'}, index.names(self.names_path))
+            self.assertEqual(2, parse.call_count)
+
+    def test_names___with_cache_path___serves_later_runs_from_the_serialized_cache(self):
+        Path(self.names_path).write_text('NES: Nintendo\n')
+        NamesIndex().names(self.names_path, self.cache_path)
+
+        with patch('update_all.names_index.parse_names_txt') as parse:
+            self.assertEqual({'NES': 'Nintendo'}, NamesIndex().names(self.names_path, self.cache_path))
+            parse.assert_not_called()
+
+
+
+class TestNamesIndexWithFileSystem(unittest.TestCase):
+    def setUp(self) -> None:
+        self.file_system = FileSystemFactory.from_state().create_for_system_scope()
+
+    def test_names___with_fake_file_system___reads_the_file_through_it(self):
+        self.file_system.write_file_contents(FILE_names_txt, 'NES: Nintendo\nno colon\n')
+
+        self.assertEqual({'NES': 'Nintendo'}, NamesIndex(self.file_system).names(FILE_names_txt))
+
+    def test_names___with_cache_path___serves_later_runs_from_the_cache_in_the_file_system(self):
+        self.file_system.write_file_contents(FILE_names_txt, 'NES: Nintendo\n')
+        NamesIndex(self.file_system).names(FILE_names_txt, FILE_names_txt_index_cache)
+
+        self.file_system.write_file_contents(FILE_names_txt, 'NES: Famicom\n')
+        self.assertEqual({'NES': 'Nintendo'}, NamesIndex(self.file_system).names(FILE_names_txt, FILE_names_txt_index_cache))
+
+    def test_names___with_missing_file___returns_empty(self):
+        self.assertEqual({}, NamesIndex(self.file_system).names(FILE_names_txt))
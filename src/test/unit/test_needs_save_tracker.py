@@ -0,0 +1,70 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import unittest
+
+from update_all.needs_save_tracker import NeedsSaveTracker
+from update_all.ui_engine import _UiSystem
+
+
+class TestNeedsSaveTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ui = _UiSystem('main', {}, None, None)
+        self.ui.set_value('a', '1')
+        self.ui.set_value('b', '1')
+        self.sut = NeedsSaveTracker()
+        self.computed = 0
+
+    def test_reasons___when_nothing_changed___reuses_previous_reasons(self):
+        self.assertEqual(['x'], self.reasons(baseline=None))
+        self.assertEqual(['x'], self.reasons(baseline=None))
+        self.assertEqual(1, self.computed)
+
+    def test_reasons___when_unrelated_variable_changes___reuses_previous_reasons(self):
+        self.reasons(baseline=None)
+        self.ui.set_value('b', '2')
+        self.reasons(baseline=None)
+        self.assertEqual(1, self.computed)
+
+    def test_reasons___when_dependency_changes___computes_again(self):
+        self.reasons(baseline=None)
+        self.ui.set_value('a', '2')
+        self.reasons(baseline=None)
+        self.assertEqual(2, self.computed)
+
+    def test_reasons___when_baseline_differs___computes_again(self):
+        self.reasons(baseline=('db1',))
+        self.reasons(baseline=('db1', 'db2'))
+        self.assertEqual(2, self.computed)
+
+    def test_reasons___after_invalidate___computes_again(self):
+        self.reasons(baseline=None)
+        self.sut.invalidate()
+        self.reasons(baseline=None)
+        self.assertEqual(2, self.computed)
+
+    def reasons(self, baseline):
+        def compute():
+            self.computed += 1
+            return ['x']
+
+        return self.sut.reasons(self.ui, 'check', ['a'], baseline, compute)
+
+
+if __name__ == '__main__':
+    unittest.main()
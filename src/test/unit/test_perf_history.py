@@ -0,0 +1,90 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import unittest
+
+from update_all.perf_history import append_perf_record, find_regressions, format_perf_report, make_perf_record, \
+    perf_history_runs, PerfRegression, PERF_HISTORY_MAX_RUNS
+from update_all.tracing import SpanEvent
+
+
+class TestPerfHistory(unittest.TestCase):
+    def test_make_perf_record___sums_update_all_phases_and_reads_counters(self):
+        events = [
+            span_event('update_all.setup_environment', 1.0),
+            span_event('update_all.setup_environment', 0.5),
+            span_event('update_all.downloader', 20.0),
+            span_event('arcade_organizer.organize', 3.0, mras=42),
+            span_event('update_all.full_run', 30.0),
+        ]
+
+        record = make_perf_record(events, {'update_all_http_requests': 3, 'update_all_http_bytes': 1000}, 25.0, 2048, 'abc', timestamp=100)
+
+        self.assertEqual({
+            'timestamp': 100,
+            'commit': 'abc',
+            'total': 25.0,
+            'phases': {'setup_environment': 1.5, 'downloader': 20.0},
+            'update_all_http_requests': 3,
+            'update_all_http_bytes': 1000,
+            'mras': 42,
+            'peak_rss_kb': 2048,
+        }, record)
+
+    def test_append_perf_record___keeps_only_the_latest_runs(self):
+        runs = perf_history_runs({'version': 1, 'runs': []})
+        for i in range(PERF_HISTORY_MAX_RUNS + 5):
+            runs = append_perf_record(runs, {'total': i})['runs']
+
+        self.assertEqual(PERF_HISTORY_MAX_RUNS, len(runs))
+        self.assertEqual(PERF_HISTORY_MAX_RUNS + 4, runs[-1]['total'])
+
+    def test_perf_history_runs___with_unknown_content___returns_empty(self):
+        for history in [None, {}, {'version': 0, 'runs': []}, {'version': 1, 'runs': 'x'}]:
+            with self.subTest(history=history):
+                self.assertEqual([], perf_history_runs(history))
+
+    def test_find_regressions___flags_only_markedly_slower_non_interactive_phases(self):
+        runs = [perf_run(10.0, downloader=5.0, arcade_organizer=1.0, settings_screen=1.0) for _ in range(5)]
+        record = perf_run(30.0, downloader=6.0, arcade_organizer=2.5, settings_screen=60.0)
+
+        self.assertEqual([PerfRegression('total', 30.0, 10.0)], find_regressions(runs, record))
+
+    def test_find_regressions___with_few_previous_runs___flags_nothing(self):
+        runs = [perf_run(10.0), perf_run(10.0)]
+
+        self.assertEqual([], find_regressions(runs, perf_run(100.0)))
+
+    def test_format_perf_report___marks_slower_phases(self):
+        runs = [perf_run(10.0, downloader=5.0) for _ in range(4)] + [perf_run(10.0, downloader=50.0)]
+
+        report = format_perf_report(runs)
+
+        self.assertIn('downloader', next(line for line in report if line.endswith('SLOWER')))
+        self.assertFalse(any(line.startswith('total') and line.endswith('SLOWER') for line in report))
+
+    def test_format_perf_report___without_runs___says_so(self):
+        self.assertEqual(['No performance history yet.'], format_perf_report([]))
+
+
+def span_event(name, duration, **args):
+    return SpanEvent(name, 0.0, duration, 1, 'MainThread', 1, args)
+
+
+def perf_run(total, **phases):
+    return {'timestamp': 0, 'total': total, 'phases': phases}
@@ -0,0 +1,73 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import os
+import tempfile
+import time
+import unittest
+
+from update_all.sampling_profiler import SamplingProfiler, profile_file_path, start_sampling_profiler
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_collapsed_stacks___after_busy_loop___contains_the_busy_function(self):
+        profiler = SamplingProfiler('cpu', interval=0.001)
+
+        profiler.start()
+        try:
+            busy_loop(0.2)
+        finally:
+            profiler.stop()
+
+        self.assertGreater(profiler.sample_count(), 0)
+        self.assertTrue(any('busy_loop (unit/test_sampling_profiler.py:' in line for line in profiler.collapsed_stacks()))
+        self.assertFalse(any('_sample (' in line for line in profiler.collapsed_stacks()))
+
+    def test_write_collapsed_stacks___writes_one_stack_and_count_per_line(self):
+        profiler = SamplingProfiler('wall', interval=0.001)
+        profiler.start()
+        try:
+            busy_loop(0.05)
+        finally:
+            profiler.stop()
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = profile_file_path(os.path.join(folder, 'logs', 'update_all.log'))
+            profiler.write_collapsed_stacks(path)
+            with open(path) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(os.path.join(folder, 'logs', 'update_all.profile.folded'), path)
+        self.assertEqual(profiler.sample_count(), sum(int(line.rsplit(' ', 1)[1]) for line in lines))
+
+    def test_start_sampling_profiler___when_flag_is_off___returns_none(self):
+        for value in ['', 'false', '0', 'unknown']:
+            with self.subTest(value=value):
+                self.assertIsNone(start_sampling_profiler(value))
+
+    def test_start_sampling_profiler___when_flag_is_true___starts_cpu_profiler(self):
+        profiler = start_sampling_profiler('true')
+        profiler.stop()
+
+        self.assertIsInstance(profiler, SamplingProfiler)
+
+
+def busy_loop(seconds: float) -> None:
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
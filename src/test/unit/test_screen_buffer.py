@@ -0,0 +1,108 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import unittest
+from types import SimpleNamespace
+
+from update_all.other import OverscanDim, TerminalSize
+from update_all.settings_screen_standard_curses_printer import _ScreenBuffer
+
+
+class TestScreenBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = WindowSpy()
+        self.runtime = SimpleNamespace(window=self.window)
+        self.sut = _ScreenBuffer(self.runtime, SimpleNamespace(term_size=TerminalSize(columns=10, lines=4), overscan_dim=OverscanDim()))
+
+    def test_flush___first_frame___writes_every_run(self):
+        self.sut.fill(0, 0, 10, ' ', 1)
+        self.sut.write(0, 2, 'abc', 2)
+
+        self.assertEqual(3, self.sut.flush())
+        self.assertEqual([
+            ('addstr', 0, 0, '  ', 1),
+            ('addstr', 0, 2, 'abc', 2),
+            ('addstr', 0, 5, '     ', 1),
+        ], self.window.calls)
+
+    def test_flush___with_same_frame_again___writes_nothing(self):
+        self.paint_frame('hello')
+        self.window.calls.clear()
+
+        self.paint_frame('hello')
+
+        self.assertEqual([], self.window.calls)
+
+    def test_flush___with_changed_cells___writes_only_changed_run(self):
+        self.paint_frame('hello')
+        self.window.calls.clear()
+
+        self.paint_frame('help!')
+
+        self.assertEqual([('addstr', 1, 3, 'p!', 0)], self.window.calls)
+
+    def test_flush___with_other_row_pending___leaves_painted_rows_alone(self):
+        self.paint_frame('hello')
+        self.window.calls.clear()
+
+        self.sut.write(3, 0, 'x', 0)
+        self.sut.flush()
+
+        self.assertEqual([('addstr', 3, 0, 'x', 0)], self.window.calls)
+
+    def test_flush___after_invalidate___writes_every_run_again(self):
+        self.paint_frame('hello')
+        self.window.calls.clear()
+
+        self.sut.invalidate()
+        self.paint_frame('hello')
+
+        self.assertEqual([('addstr', 1, 0, 'hello', 0)], self.window.calls)
+
+    def test_flush___when_runtime_window_is_recreated___writes_every_run_again(self):
+        self.paint_frame('hello')
+        self.runtime.window = WindowSpy()
+
+        self.paint_frame('hello')
+
+        self.assertEqual([('addstr', 1, 0, 'hello', 0)], self.runtime.window.calls)
+
+    def test_flush___with_run_reaching_bottom_right_cell___inserts_it(self):
+        self.sut.fill(3, 6, 10, ' ', 0)
+        self.sut.flush()
+
+        self.assertEqual([('insstr', 3, 6, '    ', 0)], self.window.calls)
+
+    def paint_frame(self, text):
+        self.sut.write(1, 0, text, 0)
+        self.sut.flush()
+
+
+class WindowSpy:
+    def __init__(self):
+        self.calls = []
+
+    def addstr(self, y, x, text, attr):
+        self.calls.append(('addstr', y, x, text, attr))
+
+    def insstr(self, y, x, text, attr):
+        self.calls.append(('insstr', y, x, text, attr))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,7 +27,7 @@ from update_all.databases import model_variables_by_db_id, db_ids_by_model_varia
     MIRROR_ANDI_BR, MIRROR_MYSTICAL_REALM_ORG
 from update_all.settings_screen_model import settings_screen_model, uninstall_db_action, uninstall_db_action_for_id, \
     uninstall_db_action_manuals
-from update_all.ui_engine import EffectChain, Interpolator, UiApplication, UiContext, UiRuntime, UiSection, \
+from update_all.ui_engine import BUILTIN_FORMATTERS, EffectChain, Interpolator, UiApplication, UiContext, UiRuntime, UiSection, \
     UiSectionFactory, execute_ui_engine
 from update_all.mister_ini_edits import parse_mister_ini_add, parse_mister_ini_del
 from update_all.ui_model_utilities import gather_variable_declarations, dynamic_convert_string, expand_type, \
@@ -229,7 +229,7 @@ class TestSettingsScreenModel(unittest.TestCase):
         self.assertEqual(target_variables, declared_variables)
 
     def test_target_formatters_are_declared_in_the_model(self):
-        target_formatters = gather_target_formatters(self.model)
+        target_formatters = gather_target_formatters(self.model) - set(BUILTIN_FORMATTERS)
         declared_formatters = set(gather_formatter_declarations(self.model))
 
         intersection = target_formatters & declared_formatters
@@ -0,0 +1,216 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from update_all.tracing import NOOP_SPAN, MemoryProbe, ProcStatusMemoryProbe, Tracer, make_memory_probe, trace_file_path
+
+
+class TestTracer(unittest.TestCase):
+    def test_span___when_disabled___returns_noop_and_records_nothing(self):
+        tracer = Tracer()
+
+        with tracer.span('a') as span:
+            span.count('items')
+
+        self.assertIs(NOOP_SPAN, span)
+        self.assertEqual([], tracer.events())
+
+    def test_span___with_nested_spans___records_depth_and_counters(self):
+        tracer = enabled_tracer()
+
+        with tracer.span('outer', kind='test'):
+            with tracer.span('inner') as inner:
+                inner.count('items')
+                inner.count('items', 2)
+
+        events = {event.name: event for event in tracer.events()}
+        self.assertEqual(0, events['outer'].depth)
+        self.assertEqual(1, events['inner'].depth)
+        self.assertEqual({'kind': 'test'}, events['outer'].args)
+        self.assertEqual({'items': 3}, events['inner'].args)
+        self.assertGreaterEqual(events['outer'].duration, events['inner'].duration)
+
+    def test_span___on_exception___records_error_and_reraises(self):
+        tracer = enabled_tracer()
+
+        with self.assertRaises(ValueError):
+            with tracer.span('failing'):
+                raise ValueError()
+
+        self.assertEqual({'error': 'ValueError'}, tracer.events()[0].args)
+
+    def test_span___in_another_thread___starts_at_depth_zero(self):
+        tracer = enabled_tracer()
+
+        def job():
+            with tracer.span('job'):
+                pass
+
+        with tracer.span('main'):
+            thread = threading.Thread(target=job)
+            thread.start()
+            thread.join()
+
+        events = {event.name: event for event in tracer.events()}
+        self.assertEqual(0, events['job'].depth)
+        self.assertNotEqual(events['main'].thread_id, events['job'].thread_id)
+
+    def test_add_listener___receives_every_finished_span(self):
+        tracer = enabled_tracer()
+        received = []
+        tracer.add_listener(lambda event: received.append(event.name))
+
+        with tracer.span('a'):
+            with tracer.span('b'):
+                pass
+
+        self.assertEqual(['b', 'a'], received)
+
+    def test_span___beyond_the_max_events___is_counted_as_dropped_but_still_sent_to_listeners(self):
+        tracer = enabled_tracer()
+        received = []
+        tracer.add_listener(lambda event: received.append(event.name))
+
+        with patch('update_all.tracing.TRACER_MAX_EVENTS', 2):
+            for name in ['a', 'b', 'c']:
+                with tracer.span(name):
+                    pass
+
+        self.assertEqual(['a', 'b'], [event.name for event in tracer.events()])
+        self.assertEqual(['a', 'b', 'c'], received)
+        self.assertEqual({'dropped_trace_events': 1}, tracer.counters())
+
+    def test_export_chrome_trace___writes_complete_events_and_thread_names(self):
+        tracer = enabled_tracer()
+        with tracer.span('store.load', path=object()):
+            pass
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = trace_file_path(os.path.join(folder, 'logs', 'update_all.log'))
+            tracer.export_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+
+        self.assertEqual(os.path.join(folder, 'logs', 'update_all.trace.json'), path)
+        complete, metadata = trace['traceEvents']
+        self.assertEqual(('store.load', 'store', 'X'), (complete['name'], complete['cat'], complete['ph']))
+        self.assertIsInstance(complete['args']['path'], str)
+        self.assertEqual('thread_name', metadata['name'])
+
+
+def enabled_tracer() -> Tracer:
+    tracer = Tracer()
+    tracer.enable()
+    return tracer
+
+
+class _FakeMemoryProbe(MemoryProbe):
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def allocate(self, kb):
+        self.current += kb
+        self.peak = max(self.peak, self.current)
+
+    def free(self, kb):
+        self.current -= kb
+
+    def peak_kb(self):
+        return self.peak
+
+    def reset(self):
+        self.peak = self.current
+
+    def run_peak_kb(self):
+        return self.peak
+
+
+class _VmHwmProbe(ProcStatusMemoryProbe):
+    def __init__(self, readings):
+        super().__init__()
+        self._readings = list(readings)
+
+    def _read_vm_hwm(self):
+        return self._readings.pop(0) if len(self._readings) > 1 else self._readings[0]
+
+
+class TestTracerMemoryTracking(unittest.TestCase):
+    def test_span___with_memory_tracking___records_the_peak_of_each_nested_span(self):
+        tracer = enabled_tracer()
+        probe = _FakeMemoryProbe()
+        tracer._memory_probe = probe
+
+        with tracer.span('outer'):
+            probe.allocate(100)
+            probe.free(100)
+            with tracer.span('inner'):
+                probe.allocate(30)
+                probe.free(30)
+            probe.allocate(10)
+
+        events = {event.name: event for event in tracer.events()}
+        self.assertEqual(30, events['inner'].args['peak_rss_kb'])
+        self.assertEqual(100, events['outer'].args['peak_rss_kb'])
+
+    def test_span___in_another_thread___does_not_track_memory(self):
+        tracer = enabled_tracer()
+        tracer._memory_probe = _FakeMemoryProbe()
+
+        def job():
+            with tracer.span('job'):
+                pass
+
+        thread = threading.Thread(target=job)
+        thread.start()
+        thread.join()
+
+        self.assertNotIn('peak_rss_kb', tracer.events()[0].args)
+
+    def test_run_peak_rss_kb___without_memory_tracking___returns_zero(self):
+        self.assertEqual(0, enabled_tracer().run_peak_rss_kb())
+
+    def test_proc_status_memory_probe_run_peak_kb___after_a_reset___keeps_the_peak_before_the_reset(self):
+        probe = _VmHwmProbe([500, 120, 130])
+
+        self.assertEqual(500, probe.peak_kb())
+        with tempfile.TemporaryDirectory() as temp_dir, patch('update_all.tracing.FILE_proc_self_clear_refs', os.path.join(temp_dir, 'clear_refs')):
+            probe.reset()
+
+        self.assertEqual(130, probe.peak_kb())
+        self.assertEqual(500, probe.run_peak_kb())
+
+    def test_memory_probe___without_all_methods___can_not_be_created(self):
+        class IncompleteProbe(MemoryProbe):
+            def peak_kb(self):
+                return 0
+
+        with self.assertRaises(TypeError):
+            IncompleteProbe()
+
+    def test_make_memory_probe___returns_a_positive_peak(self):
+        probe = make_memory_probe()
+        probe.reset()
+
+        self.assertGreater(probe.peak_kb(), 0)
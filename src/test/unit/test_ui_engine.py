@@ -0,0 +1,129 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import unittest
+
+from update_all.ui_engine import _Interpolator, _UiSystem, compile_template, Placeholder
+
+
+class TestInterpolator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ui = UiSystemSpy()
+        for key, value in {'name': 'mister', 'mode': '1', 'count': '3'}.items():
+            self.ui.set_value(key, value)
+        self.interpolator = _Interpolator({
+            'mode': {'0': 'off', '1': 'on'},
+            'upper': lambda value: value.upper(),
+            'plural': {'1': '{0}', '3': '{0}s'},
+        }, self.ui)
+
+    def test_interpolate___with_plain_text___returns_same_text(self):
+        self.assertEqual('Hello world', self.interpolator.interpolate('Hello world'))
+
+    def test_interpolate___with_variable___returns_its_value(self):
+        self.assertEqual('Hello mister!', self.interpolator.interpolate('Hello {name}!'))
+
+    def test_interpolate___with_variable_named_as_formatter___applies_formatter(self):
+        self.assertEqual('Mode: on', self.interpolator.interpolate('Mode: {mode}'))
+
+    def test_interpolate___with_formatter_modifier___applies_formatter(self):
+        self.assertEqual('MISTER', self.interpolator.interpolate('{name:upper}'))
+
+    def test_interpolate___with_formatter_arguments___formats_result_with_arguments(self):
+        self.assertEqual('3 files', self.interpolator.interpolate('{count} {count:plural=file}'))
+
+    def test_interpolate___with_unterminated_placeholder___keeps_it_as_literal(self):
+        self.assertEqual('mister {name', self.interpolator.interpolate('{name} {name'))
+
+    def test_interpolate___with_repeated_placeholder___reads_value_once(self):
+        self.assertEqual('mister mister', self.interpolator.interpolate('{name} {name}'))
+        self.assertEqual(['name'], self.ui.reads)
+
+    def test_interpolate___with_missing_formatter___raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.interpolator.interpolate('{name:missing}')
+
+    def test_dependencies___with_placeholders___returns_read_variables(self):
+        self.assertEqual(frozenset({'name', 'count', 'mode'}), self.interpolator.dependencies('{name:upper} {count:plural=a,b} {mode} {x'))
+
+    def test_interpolate___twice_without_changes___reads_values_once(self):
+        self.interpolator.interpolate('Hello {name}')
+        self.assertEqual('Hello mister', self.interpolator.interpolate('Hello {name}'))
+        self.assertEqual(['name'], self.ui.reads)
+
+    def test_interpolate___after_unrelated_variable_changes___reuses_previous_result(self):
+        self.interpolator.interpolate('Hello {name}')
+        self.ui.set_value('count', '1')
+        self.assertEqual('Hello mister', self.interpolator.interpolate('Hello {name}'))
+        self.assertEqual(['name'], self.ui.reads)
+
+    def test_interpolate___after_dependency_changes___renders_new_value(self):
+        self.interpolator.interpolate('Hello {name:upper}')
+        self.ui.set_value('name', 'fpga')
+        self.assertEqual('Hello FPGA', self.interpolator.interpolate('Hello {name:upper}'))
+
+
+class TestUiSystemRevisions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ui = UiSystemSpy()
+        self.ui.set_value('a', 'true')
+
+    def test_set_value___with_same_value___does_not_change_revision(self):
+        revision = self.ui.revision()
+        self.ui.set_value('a', 'true')
+        self.assertEqual(revision, self.ui.revision())
+        self.assertFalse(self.ui.changed_since(revision, ['a']))
+
+    def test_changed_since___with_changed_variable___returns_true(self):
+        revision = self.ui.revision()
+        self.ui.set_value('a', 'false')
+        self.assertTrue(self.ui.changed_since(revision, ['a']))
+
+    def test_changed_since___with_other_variable_changed___returns_false(self):
+        revision = self.ui.revision()
+        self.ui.set_value('b', 'false')
+        self.assertFalse(self.ui.changed_since(revision, ['a']))
+
+
+class UiSystemSpy(_UiSystem):
+    def __init__(self):
+        super().__init__('main', {}, None, None)
+        self.reads = []
+
+    def get_value(self, key: str) -> str:
+        self.reads.append(key)
+        return super().get_value(key)
+
+
+class TestCompileTemplate(unittest.TestCase):
+    def test_compile_template___with_mixed_text___splits_literals_and_placeholders(self):
+        self.assertEqual((
+            'a ',
+            Placeholder('x', 'x', None, None),
+            ' b ',
+            Placeholder('y:f', 'y', 'f', None),
+            Placeholder('z:g=1,2', 'z', 'g', ('1', '2')),
+            ' {w',
+        ), compile_template('a {x} b {y:f}{z:g=1,2} {w').parts)
+
+    def test_compile_template___called_twice_with_same_text___returns_cached_template(self):
+        self.assertIs(compile_template('cached {x}'), compile_template('cached {x}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
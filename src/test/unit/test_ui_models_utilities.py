@@ -18,7 +18,7 @@
 import unittest
 
 from update_all.ui_model_utilities import gather_variable_declarations, \
-    dynamic_convert_string
+    dynamic_convert_string, ModelIndex, gather_effects_by_type, search_in_model
 
 
 class TestUiModelsUtilities(unittest.TestCase):
@@ -35,6 +35,57 @@ class TestUiModelsUtilities(unittest.TestCase):
         expected = {"update_all_version", "arcade_offset_downloader"}
         self.assertEqual(expected, set(gather_variable_declarations(test_model(), 'x')))
 
+    def test_model_index_variable_declarations___match_gather_variable_declarations(self):
+        index = ModelIndex(test_model())
+        self.assertEqual(gather_variable_declarations(test_model()), index.variable_declarations())
+        self.assertEqual(gather_variable_declarations(test_model(), 'x'), index.variable_declarations('x'))
+
+    def test_model_index_effects_by_type___match_gather_effects_by_type(self):
+        self.assertEqual(gather_effects_by_type(test_model(), 'navigate'), ModelIndex(test_model()).effects_by_type('navigate'))
+
+    def test_model_index_new_model___returns_independent_copies_with_expanded_sections(self):
+        index = ModelIndex(test_model())
+        first = index.new_model()
+        first['items']['misc_menu']['header'] = 'changed'
+
+        second = index.new_model()
+        self.assertEqual('Misc | Other Settings', second['items']['misc_menu']['header'])
+        self.assertEqual('ui', second['items']['misc_menu']['type'])
+        self.assertEqual(['names_txt_menu', 'misc_menu'], list(second['items']))
+
+    def test_model_index_section_variables___returns_variables_declared_within_section(self):
+        index = ModelIndex(test_model())
+        self.assertEqual(['names_region'], list(index.section_variables('names_txt_menu')))
+        self.assertEqual(['arcade_offset_downloader'], list(index.section_variables('misc_menu')))
+        self.assertEqual({}, index.section_variables('missing_menu'))
+
+    def test_gather_variable_declarations___after_the_model_changes___sees_the_change(self):
+        model = test_model()
+        gather_variable_declarations(model, 'x')
+        model['items']['names_txt_menu']['variables']['names_region']['group'] = 'x'
+
+        self.assertEqual({'update_all_version', 'arcade_offset_downloader', 'names_region'}, set(gather_variable_declarations(model, 'x')))
+
+    def test_gather_variable_declarations___without_group___does_not_name_the_descriptions(self):
+        model = test_model()
+        declarations = gather_variable_declarations(model)
+        ModelIndex(model)
+
+        self.assertEqual([], [variable for variable, description in declarations.items() if 'name' in description])
+
+    def test_search_in_model___calls_cb_on_each_node_before_walking_the_next_ones(self):
+        model = test_model()
+        misc_menu = model['items']['misc_menu']
+        expanded = []
+        search_in_model(expanded, {}, model, lambda result, item: result.append('type' in misc_menu))
+        self.assertEqual([False, False, True, True], expanded)
+
+    def test_search_in_model___visits_nodes_in_depth_first_order(self):
+        model = test_model()
+        visited = []
+        search_in_model(visited, {}, model, lambda result, item: result.append(item.get('header', item.get('type'))))
+        self.assertEqual([None, 'Names TXT Settings', 'Misc | Other Settings', 'navigate'], visited)
+
 
 def test_model(): return {
     "variables": {
@@ -54,6 +105,7 @@ def test_model(): return {
             "variables": {
                 "arcade_offset_downloader": {"default": "false", "group": "x", "values": ["false", "true"]},
             },
+            "effects": [{"type": "navigate", "target": "names_txt_menu"}],
         }
     }
 }
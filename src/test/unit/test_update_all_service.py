@@ -16,16 +16,17 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 
-from unittest.mock import MagicMock
+import json
+from unittest.mock import MagicMock, patch
 import unittest
 
 from test.fake_filesystem import FileSystemFactory
 from update_all.config import Config
-from update_all.constants import FILE_patreon_key_prev, UPDATE_ALL_VERSION
+from update_all.constants import FILE_patreon_key_prev, FILE_patreon_key, FILE_names_txt, FILE_timeline_plus, FILE_timeline_render_cache, FILE_timeline_short, UPDATE_ALL_VERSION
 from update_all.encryption import EncryptionResult
 from update_all.other import GenericProvider
 from update_all.other import TerminalSize, OverscanDim
-from update_all.timeline import Timeline
+from update_all.timeline import Timeline, create_timeline_doc, timeline_doc_blocks
 from update_all.update_all_service import calculate_supporter_shoutout, calculate_outro_summary, calculate_success_summary, calculate_reading_sections_summary, format_run_time
 
 
@@ -134,7 +135,7 @@ class TestTimelineFallbacks(unittest.TestCase):
             RuntimeError('boom'),
         ), _RetroAccountStub(False))
 
-        timeline_plus_model, not_yet_updated = sut._extract_plus_model('timeline_plus.enc', 'timeline_plus_output.json')
+        timeline_plus_model, not_yet_updated, _key_hash = sut._extract_plus_model('timeline_plus.enc')
 
         self.assertIsNone(timeline_plus_model)
         self.assertFalse(not_yet_updated)
@@ -147,21 +148,133 @@ class TestTimelineFallbacks(unittest.TestCase):
             EncryptionResult.InvalidKey,
         ), _RetroAccountStub(True, RuntimeError('boom')))
 
-        timeline_plus_model, not_yet_updated = sut._extract_plus_model('timeline_plus.enc', 'timeline_plus_output.json')
+        timeline_plus_model, not_yet_updated, _key_hash = sut._extract_plus_model('timeline_plus.enc')
 
         self.assertIsNone(timeline_plus_model)
         self.assertFalse(not_yet_updated)
 
 
+class TestTimelinePlusCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.file_system = FileSystemFactory.from_state(files={
+            FILE_timeline_plus: {'hash': 'cipher-1'},
+            FILE_patreon_key: {'hash': 'key-1'},
+        }).create_for_system_scope()
+        self.config_provider = GenericProvider[Config]()
+        self.config_provider.initialize(Config(term_size=TerminalSize(columns=60, lines=40), overscan_dim=OverscanDim(cols=0, lines=0)))
+        self.encryption = _EncryptionStub()
+
+    def test_load_timeline_doc___twice_in_the_same_process___decrypts_once(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        timeline = self._timeline()
+        first_doc = timeline.load_timeline_doc().lines()
+
+        second_doc = timeline.load_timeline_doc().lines()
+
+        self.assertEqual(first_doc, second_doc)
+        self.assertIn(' [Core] First\n', second_doc)
+        self.assertEqual(1, self.encryption.calls)
+
+    def test_load_timeline_doc___in_a_later_session___decrypts_again_because_the_model_is_not_stored(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        self._timeline().load_timeline_doc()
+
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        self.assertIn(' [Core] First\n', self._timeline().load_timeline_doc().lines())
+        self.assertEqual(2, self.encryption.calls)
+
+    def test_load_timeline_doc___with_new_ciphertext___decrypts_again(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        timeline = self._timeline()
+        timeline.load_timeline_doc()
+
+        self.file_system.touch(FILE_timeline_plus)
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('Second')))
+
+        self.assertIn(' [Core] Second\n', timeline.load_timeline_doc().lines())
+        self.assertEqual(2, self.encryption.calls)
+
+    def test_load_timeline_doc___once_fully_rendered___serves_the_lines_from_the_render_cache(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        timeline = self._timeline()
+        expected = timeline.load_timeline_doc().lines()
+
+        with patch('update_all.timeline.render_doc_section') as render_doc_section:
+            doc = timeline.load_timeline_doc()
+            self.assertEqual(expected, doc.lines())
+            render_doc_section.assert_not_called()
+
+    def test_load_timeline_doc___once_fully_rendered___does_not_write_the_extended_timeline_to_disk(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+
+        self._timeline().load_timeline_doc().lines()
+
+        self.assertFalse(self.file_system.is_file(FILE_timeline_render_cache))
+
+    def test_load_timeline_doc___with_the_short_timeline___serves_the_lines_from_the_render_cache_in_later_sessions(self):
+        self.file_system.unlink(FILE_timeline_plus)
+        self.file_system.save_json(json.loads(_plus_model_bytes('Short')), FILE_timeline_short)
+        expected = self._timeline().load_timeline_doc().lines()
+
+        with patch('update_all.timeline.render_doc_section') as render_doc_section:
+            doc = self._timeline().load_timeline_doc()
+            self.assertEqual(expected, doc.lines())
+            render_doc_section.assert_not_called()
+
+    def test_load_timeline_doc___with_other_width___renders_again(self):
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+        timeline = self._timeline()
+        timeline.load_timeline_doc().lines()
+        self.config_provider.get().term_size = TerminalSize(columns=100, lines=40)
+
+        self.assertIn('=' * 100 + '\n', timeline.load_timeline_doc().lines())
+
+    def test_load_timeline_doc___with_names_txt_in_the_file_system___shows_the_names(self):
+        self.file_system.write_file_contents(FILE_names_txt, 'First: The First Core\n')
+        self.encryption.results.append((EncryptionResult.Success, _plus_model_bytes('First')))
+
+        self.assertIn(' [Core] The First Core\n', self._timeline().load_timeline_doc().lines())
+
+    def _timeline(self) -> Timeline:
+        return Timeline(MagicMock(), self.config_provider, self.file_system, self.encryption, _RetroAccountStub(False))
+
+
+class TestTimelineDocBlocks(unittest.TestCase):
+    def test_timeline_doc_blocks___line_counts_match_the_rendered_blocks(self):
+        model = {'sections': [
+            {'title': 'Empty', 'categories': []},
+            {'title': 'Today', 'categories': [
+                {'category': 'core', 'files': [{'type': 'standalone', 'name': 'NES'}]},
+                {'category': 'utility', 'files': [{'type': 'standalone', 'name': 'a'}, {'type': 'mra', 'name': 'b'}, {'type': 'standalone', 'name': ''}]},
+                {'category': 'system', 'files': []},
+            ]},
+        ]}
+        for columns in [40, 80]:
+            with self.subTest(columns=columns):
+                blocks = timeline_doc_blocks(model, {'NES': 'Nintendo'}, columns)
+
+                self.assertEqual([count for count, _render in blocks], [len(render()) for _count, render in blocks])
+                self.assertEqual(create_timeline_doc(model, {'NES': 'Nintendo'}, columns), [line for _count, render in blocks for line in render()])
+
+
+def _plus_model_bytes(name: str) -> bytes:
+    return json.dumps({'sections': [{'title': 'Today', 'categories': [{'category': 'core', 'files': [{'type': 'standalone', 'name': name}]}]}]}).encode()
+
+
 class _EncryptionStub:
     def __init__(self, *results):
-        self._results = list(results)
+        self.results = list(results)
+        self.calls = 0
 
-    def decrypt_file(self, _timeline_plus_model_path: str, _output: str, _key_file_path: str):
-        result = self._results.pop(0)
+    def decrypt_bytes(self, _timeline_plus_model_path: str, _key_file_path: str):
+        self.calls += 1
+        result = self.results.pop(0)
         if isinstance(result, Exception):
             raise result
-        return result
+        return result if isinstance(result, tuple) else (result, None)
+
+    def skip_environment_check(self):
+        pass
 
 
 class _RetroAccountStub:
@@ -41,8 +41,8 @@ from update_all.constants import KENV_COMMIT, KENV_CURL_SSL, DEFAULT_CURL_SSL_OP
     KENV_TIMELINE_SHORT_PATH, FILE_timeline_plus, KENV_HTTP_PROXY, KENV_HTTPS_PROXY, KENV_MIRROR_ID, \
     KENV_RETROACCOUNT_DOMAIN, DOMAIN_default_retroaccount, KENV_UPDATE_ALL_CHIP_ID_RESULT, \
     KENV_UPDATE_ALL_MISTER_DB_URL, KENV_UPDATE_ALL_DOWNLOADER_PATH, KENV_UPDATE_ALL_DOWNLOADER_URL, \
-    KENV_UPDATE_ALL_NON_INTERACTIVE, DEFAULT_UPDATE_ALL_NON_INTERACTIVE, \
-    KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH
+    KENV_UPDATE_ALL_NON_INTERACTIVE, DEFAULT_UPDATE_ALL_NON_INTERACTIVE, KENV_UPDATE_ALL_PROFILE, \
+    DEFAULT_UPDATE_ALL_PROFILE, KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH
 from update_all.countdown import Countdown
 from update_all.databases import DB_ID_DISTRIBUTION_MISTER, AllDBs, all_dbs
 from update_all.ini_repository import IniRepository, IniRepositoryInitializationError
@@ -94,6 +94,7 @@ def default_env():
         KENV_UPDATE_ALL_DOWNLOADER_URL: '',
         KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH: '',
         KENV_UPDATE_ALL_NON_INTERACTIVE: DEFAULT_UPDATE_ALL_NON_INTERACTIVE,
+        KENV_UPDATE_ALL_PROFILE: DEFAULT_UPDATE_ALL_PROFILE,
         KENV_RETROACCOUNT_DOMAIN: DOMAIN_default_retroaccount,
         'real_start_time': 0.0,
     }
@@ -361,7 +362,12 @@ class EnvironmentSetupStub(EnvironmentSetup):
 
 
 class LogViewerTester(LogViewer):
-    def show(self, file_path: str, popup_dict: Optional[dict[str, str]] = None, initial_index: int = 0) -> bool:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.show_calls = []
+
+    def show(self, file_path: str, popup_dict: Optional[dict[str, str]] = None, initial_index: int = 0, follow: bool = False, bottom_line: Optional[int] = None) -> bool:
+        self.show_calls.append((file_path, follow))
         return True
 
 class UpdateAllServiceTester(UpdateAllService):
@@ -401,6 +407,7 @@ class UpdateAllServiceTester(UpdateAllService):
             zaparoo_service=zaparoo_service,
         )
         self.ini_repository = ini_repository or IniRepositoryTester(file_system=file_system, os_utils=os_utils)
+        self.log_viewer = LogViewerTester(file_system, config_provider, store_provider, retroaccount)
         downloader_service = downloader_service or DownloaderService(
             NoLogger(),
             file_system,
@@ -434,7 +441,7 @@ class UpdateAllServiceTester(UpdateAllService):
             environment_setup=environment_setup,
             ao_service=ao_service,
             local_repository=local_repository or LocalRepositoryTester(file_system=file_system),
-            log_viewer=LogViewerTester(file_system, config_provider, store_provider, retroaccount),
+            log_viewer=self.log_viewer,
             timeline=TimelineTester(file_system=file_system, config_provider=config_provider, retroaccount=retroaccount),
             retroaccount=retroaccount,
             zaparoo_service=zaparoo_service,
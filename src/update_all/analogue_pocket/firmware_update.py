@@ -19,14 +19,14 @@
 from pathlib import Path
 import glob
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from update_all.analogue_pocket.http_gateway import HttpGateway, write_incoming_stream, HttpConfig
 from update_all.analogue_pocket.utils import pocket_mount
-from update_all.file_system import hash_file
 from update_all.local_repository import LocalRepository
 from update_all.logger import Logger
 from update_all.fetcher import context_from_curl_ssl
+from update_all.tracing import tracer
 
 
 def pocket_firmware_update(curl_ssl: str, local_repository: LocalRepository, logger: Logger, http_config: Optional[HttpConfig] = None):
@@ -69,28 +69,48 @@ def pocket_firmware_update(curl_ssl: str, local_repository: LocalRepository, log
 
         logger.debug(f'Downloading from {final_url} to {target_file}...')
         logger.print(f'Downloading firmware to {target_file}...')
-        write_incoming_stream(in_stream, str(target_file), timeout=180)
+        if not download_firmware(in_stream, target_file, firmware_info, logger):
+            return False
 
-    if not target_file.exists():
-        logger.print(f'ERROR! Missing file {firmware_info["file"]}')
-        return False
+    logger.print('Firmware updated successfully!')
 
-    decimals = count_decimals(firmware_info['size'])
-    size = round(float(target_file.stat().st_size) / 1_000_000, decimals)
-    logger.print(f'Downloaded {size}MB')
-    if size != firmware_info['size']:
-        logger.print(f'ERROR! Wrong size! {size} != {firmware_info["size"]}')
-        return False
+    return True
 
-    logger.print(f'Verifying MD5...')
-    md5 = hash_file(str(target_file))
-    if md5 != firmware_info['md5']:
-        logger.print(f'ERROR! Wrong MD5! {md5} != {firmware_info["md5"]}')
-        return False
 
-    logger.print('Firmware updated successfully!')
+def download_firmware(in_stream: Any, target_file: Path, firmware_info: Dict[str, Any], logger: Logger) -> bool:
+    """Writes the firmware under a temporary name while hashing it, and only renames it to
+    target_file once size and MD5 match, so the Pocket never sees a partial or corrupt firmware."""
+    temp_file = target_file.with_name(target_file.name + '.tmp')
+    try:
+        byte_count, md5 = write_incoming_stream(in_stream, str(temp_file), timeout=180, calc_md5=True, fsync=True)
+        tracer.count('update_all_http_requests')
+        tracer.count('update_all_http_bytes', byte_count)
+
+        decimals = count_decimals(firmware_info['size'])
+        size = round(float(byte_count) / 1_000_000, decimals)
+        logger.print(f'Downloaded {size}MB')
+        if size != firmware_info['size']:
+            logger.print(f'ERROR! Wrong size! {size} != {firmware_info["size"]}')
+            return False
 
-    return True
+        if md5 != firmware_info['md5']:
+            logger.print(f'ERROR! Wrong MD5! {md5} != {firmware_info["md5"]}')
+            return False
+
+        os.replace(temp_file, target_file)
+        _fsync_parent_dir(str(target_file))
+        return True
+    finally:
+        if temp_file.exists():
+            temp_file.unlink()
+
+
+def _fsync_parent_dir(path: str) -> None:
+    fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def remove_old_firmware_files(mount: str, latest_firmware_file: str, logger: Logger) -> bool:
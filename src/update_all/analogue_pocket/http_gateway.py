@@ -665,13 +665,16 @@ class _ParamsParser:
         return None
 
 
+import hashlib
 import os
 is_windows = os.name == 'nt'
 COPY_BUFSIZE = 256 * 1024 if is_windows else 128 * 1024
 
 
-def write_incoming_stream(in_stream: Any, target_path: str, timeout: int):
+def write_incoming_stream(in_stream: Any, target_path: str, timeout: int, calc_md5: bool = False, fsync: bool = False) -> tuple[int, str]:
     start_time = time.monotonic()
+    size = 0
+    md5_hasher = hashlib.md5() if calc_md5 else None
     with open(target_path, 'wb') as out_file:
         while True:
             elapsed_time = time.monotonic() - start_time
@@ -682,9 +685,17 @@ def write_incoming_stream(in_stream: Any, target_path: str, timeout: int):
             if not buf:
                 break
             out_file.write(buf)
+            size += len(buf)
+            if calc_md5:
+                md5_hasher.update(buf)
+
+        if fsync:
+            out_file.flush()
+            os.fsync(out_file.fileno())
+
+    return size, md5_hasher.hexdigest() if calc_md5 else ''
 
 
-import hashlib
 def write_stream_to_data(in_stream: Any, calc_md5: bool, timeout: int, /) -> tuple[bytes, str]:
     start_time = time.monotonic()
     data = bytearray()
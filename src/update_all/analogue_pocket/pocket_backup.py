@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """Backup Analogue Pocket saves to MiSTer."""
 
+import argparse
 import configparser
-import datetime
+import json
 import os.path
 import shutil
-import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-from typing import Dict, TypedDict
+from typing import Dict, Optional, Tuple, TypedDict
+
+from update_all.analogue_pocket.snapshot_store import SnapshotStore, SnapshotStoreException
+from update_all.file_system import copy_file
 
 # TODO: arcade high scores? dunno if that's a thing on AP
 # TODO: restore backup to pocket
@@ -28,8 +32,14 @@ SNAPSHOTS_FOLDER: str = os.path.join(BACKUP_FOLDER, "snapshots")
 POCKET_BACKUP_PREFIX: str = "pocket-"
 MISTER_BACKUP_PREFIX: str = "mister-"
 SYNCED_BACKUP_PREFIX: str = "synced-"
+SNAPSHOT_PREFIXES: list[str] = [POCKET_BACKUP_PREFIX, MISTER_BACKUP_PREFIX, SYNCED_BACKUP_PREFIX]
 # total number of snapshots to keep
 SNAPSHOTS_MAX: int = 5
+# record of the backed up Pocket files, stored in the backup folder
+MANIFEST_FILENAME: str = "backup_manifest.json"
+MANIFEST_VERSION: int = 1
+# concurrent copies from the Pocket, USB mass storage stalls with deeper queues
+BACKUP_COPY_WORKERS: int = 2
 
 # potential USB mount locations on MiSTer
 USB_MOUNTS: list[str] = [
@@ -128,9 +138,59 @@ def get_pocket_mount(mounts: list[str]) -> str or None:
     return None
 
 
-def backup_pocket_folder(pocket_mount: str, pocket_subfolder: str) -> dict:
+def load_backup_manifest() -> dict:
+    """Load the manifest describing the Pocket files that are already backed up, or an empty one."""
+    path = os.path.join(BACKUP_FOLDER, MANIFEST_FILENAME)
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"version": MANIFEST_VERSION, "folders": {}}
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "folders": {}}
+    return manifest
+
+
+def save_backup_manifest(manifest: dict):
+    """Atomically write the backup manifest next to the backed up folders."""
+    path = os.path.join(BACKUP_FOLDER, MANIFEST_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def scan_tree(root: str) -> Tuple[Dict[str, list[int]], list[str]]:
+    """Return ({relative file path: [size, mtime_ns]}, [relative dir paths]) using one scandir per directory."""
+    files: Dict[str, list[int]] = {}
+    dirs: list[str] = []
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        try:
+            iterator = os.scandir(os.path.join(root, relative_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with iterator:
+            for entry in iterator:
+                relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(relative_path)
+                    pending.append(relative_path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[relative_path] = [stat.st_size, stat.st_mtime_ns]
+    return files, dirs
+
+
+def backup_pocket_folder(pocket_mount: str, pocket_subfolder: str, manifest: Optional[dict] = None) -> dict:
     """Copy a folder from the Pocket to the backup location, skipping unchanged files
     and syncing deletions using the Pocket as the source of truth.
+    Unchanged files are decided against the manifest entry of the folder, which is
+    updated in place. Without a previous entry, the backup location is scanned once instead.
     Returns a generator that yields a dict for each file copied, with the result.
     """
     mister_path = os.path.join(BACKUP_FOLDER, pocket_subfolder)
@@ -138,112 +198,113 @@ def backup_pocket_folder(pocket_mount: str, pocket_subfolder: str) -> dict:
         os.mkdir(mister_path)
 
     pocket_path = os.path.join(pocket_mount, pocket_subfolder)
-
-    for root, dirs, files in os.walk(pocket_path):
-        # create any missing directories
-        for pocket_dir in dirs:
-            relative_root = os.path.relpath(root, pocket_path)
-            mister_dir = os.path.join(mister_path, relative_root, pocket_dir)
-
-            if not os.path.exists(mister_dir):
-                os.mkdir(mister_dir)
-
-        # copy any missing or updated files
-        for file in files:
-            pocket_file = os.path.join(root, file)
-            relative_file = os.path.relpath(pocket_file, pocket_path)
-            mister_file = os.path.join(mister_path, relative_file)
-
-            if os.path.exists(mister_file):
-                if os.path.getmtime(pocket_file) > os.path.getmtime(mister_file):
-                    shutil.copy2(pocket_file, mister_file)
-                    yield {
-                        "file": file,
-                        "status": BackupStatus.UPDATED,
-                    }
-                else:
-                    yield {
-                        "file": file,
-                        "status": BackupStatus.UNCHANGED,
-                    }
-            else:
-                shutil.copy2(pocket_file, mister_file)
-                yield {
-                    "file": file,
-                    "status": BackupStatus.NEW,
-                }
-
-        # delete any files that no longer exist on pocket
-        mister_root = os.path.join(mister_path, os.path.relpath(root, pocket_path))
-        for file in os.listdir(mister_root):
-            pocket_file = os.path.join(root, file)
-            mister_file = os.path.join(mister_root, file)
-
-            if not os.path.exists(pocket_file):
-                if os.path.isdir(mister_file):
-                    shutil.rmtree(mister_file)
-                else:
-                    os.remove(mister_file)
+    pocket_files, pocket_dirs = scan_tree(pocket_path)
+
+    if manifest is None:
+        manifest = {"version": MANIFEST_VERSION, "folders": {}}
+    previous = manifest["folders"].get(pocket_subfolder)
+    if previous is None:
+        previous_files, previous_dirs = scan_tree(mister_path)
+        is_unchanged = _is_unchanged_against_backup
+    else:
+        previous_files, previous_dirs = previous["files"], previous["dirs"]
+        is_unchanged = _is_unchanged_against_manifest
+
+    # create any missing directories, parents first
+    known_dirs = set(previous_dirs)
+    for pocket_dir in sorted(pocket_dirs):
+        if pocket_dir not in known_dirs:
+            os.makedirs(os.path.join(mister_path, pocket_dir), exist_ok=True)
+
+    # copy any missing or updated files
+    backed_up_files: Dict[str, list[int]] = {}
+    with ThreadPoolExecutor(max_workers=BACKUP_COPY_WORKERS) as executor:
+        copies = {}
+        for relative_file, stat in pocket_files.items():
+            previous_stat = previous_files.get(relative_file)
+            if previous_stat is not None and is_unchanged(stat, previous_stat):
+                backed_up_files[relative_file] = stat
                 yield {
-                    "file": file,
-                    "status": BackupStatus.DELETED,
+                    "file": os.path.basename(relative_file),
+                    "status": BackupStatus.UNCHANGED,
                 }
-
-
-def zip_backup(prefix: str):
-    """Create a zip file from all backed up folders and save it to the snapshots folder."""
-    path = os.path.join(
-        SNAPSHOTS_FOLDER,
-        prefix + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".zip",
-    )
-    if os.path.exists(path):
-        raise Exception("Snapshot already exists: {}".format(path))
-
-    zipf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
-
-    for folder in POCKET_BACKUP_FOLDERS:
-        for root, dirs, files in os.walk(os.path.join(BACKUP_FOLDER, folder)):
-            for file in files:
-                zipf.write(
-                    os.path.join(root, file),
-                    os.path.relpath(os.path.join(root, file), BACKUP_FOLDER),
-                )
-
-    zipf.close()
-
-
-def zip_mister():
-    """Create a zip file of saves and save states on MiSTer."""
-    path = os.path.join(
-        SNAPSHOTS_FOLDER,
-        MISTER_BACKUP_PREFIX + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".zip",
+                continue
+
+            future = executor.submit(
+                copy_file,
+                os.path.join(pocket_path, relative_file),
+                os.path.join(mister_path, relative_file),
+                preserve=shutil.copystat,
+            )
+            copies[future] = (relative_file, BackupStatus.NEW if previous_stat is None else BackupStatus.UPDATED)
+
+        for future in as_completed(copies):
+            future.result()
+            relative_file, status = copies[future]
+            backed_up_files[relative_file] = pocket_files[relative_file]
+            yield {
+                "file": os.path.basename(relative_file),
+                "status": status,
+            }
+
+    # delete any files and folders that no longer exist on pocket
+    for relative_file in previous_files:
+        if relative_file in pocket_files:
+            continue
+        try:
+            os.remove(os.path.join(mister_path, relative_file))
+        except FileNotFoundError:
+            pass
+        yield {
+            "file": os.path.basename(relative_file),
+            "status": BackupStatus.DELETED,
+        }
+
+    current_dirs = set(pocket_dirs)
+    for relative_dir in sorted(known_dirs - current_dirs, reverse=True):
+        shutil.rmtree(os.path.join(mister_path, relative_dir), ignore_errors=True)
+        yield {
+            "file": os.path.basename(relative_dir),
+            "status": BackupStatus.DELETED,
+        }
+
+    manifest["folders"][pocket_subfolder] = {"files": backed_up_files, "dirs": sorted(current_dirs)}
+
+
+def _is_unchanged_against_manifest(pocket_stat: list[int], manifest_stat: list[int]) -> bool:
+    return list(pocket_stat) == list(manifest_stat)
+
+
+def _is_unchanged_against_backup(pocket_stat: list[int], backup_stat: list[int]) -> bool:
+    return pocket_stat[1] <= backup_stat[1]
+
+
+def snapshot_backup(prefix: str) -> str:
+    """Record the backed up folders as a new snapshot in the snapshot store."""
+    return SnapshotStore(SNAPSHOTS_FOLDER).create(prefix, BACKUP_FOLDER, POCKET_BACKUP_FOLDERS)
+
+
+def snapshot_mister() -> str:
+    """Record the saves and save states on MiSTer as a new snapshot in the snapshot store."""
+    return SnapshotStore(SNAPSHOTS_FOLDER).create(
+        MISTER_BACKUP_PREFIX,
+        os.path.dirname(MISTER_SAVES_FOLDER),
+        [os.path.basename(MISTER_SAVES_FOLDER), os.path.basename(MISTER_SAVESTATES_FOLDER)],
     )
-    if os.path.exists(path):
-        raise Exception("Snapshot already exists: {}".format(path))
-
-    zipf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
-
-    for folder in [MISTER_SAVES_FOLDER, MISTER_SAVESTATES_FOLDER]:
-        for root, dirs, files in os.walk(folder):
-            for file in files:
-                zipf.write(
-                    os.path.join(root, file),
-                    os.path.relpath(os.path.join(root, file), os.path.dirname(folder)),
-                )
-
-    zipf.close()
 
 
 def cleanup_snapshots():
     """Delete old snapshots if we're over the limit."""
     snapshots = os.listdir(SNAPSHOTS_FOLDER)
-    for snapshot_type in [POCKET_BACKUP_PREFIX, MISTER_BACKUP_PREFIX, SYNCED_BACKUP_PREFIX]:
+    for snapshot_type in SNAPSHOT_PREFIXES:
         files = [s for s in snapshots if s.startswith(snapshot_type) and s.endswith(".zip")]
         files.sort(reverse=True)
         if len(files) > SNAPSHOTS_MAX:
             for snapshot in files[SNAPSHOTS_MAX:]:
                 os.remove(os.path.join(SNAPSHOTS_FOLDER, snapshot))
 
+    SnapshotStore(SNAPSHOTS_FOLDER).cleanup(SNAPSHOT_PREFIXES, SNAPSHOTS_MAX)
+
 
 class Config(TypedDict):
     """User configuration options from .ini file."""
@@ -304,10 +365,11 @@ def pocket_backup(logger):
 
     logger.print("Starting backup...")
 
+    manifest = load_backup_manifest()
     for folder in POCKET_BACKUP_FOLDERS:
         logger.print("Backing up {}...".format(folder), end="", flush=True)
 
-        for result in backup_pocket_folder(pocket_folder, folder):
+        for result in backup_pocket_folder(pocket_folder, folder, manifest):
             if result["status"] == BackupStatus.NEW:
                 logger.print("*", end="", flush=True)
             elif result["status"] == BackupStatus.UPDATED:
@@ -319,14 +381,15 @@ def pocket_backup(logger):
 
         logger.print("...Done!", flush=True)
 
+    save_backup_manifest(manifest)
     logger.print("Backup complete!", flush=True)
 
     logger.print("Creating Pocket snapshot...", end="", flush=True)
-    zip_backup(POCKET_BACKUP_PREFIX)
+    snapshot_backup(POCKET_BACKUP_PREFIX)
     logger.print("Done!", flush=True)
 
     logger.print("Creating MiSTer snapshot...", end="", flush=True)
-    zip_mister()
+    snapshot_mister()
     logger.print("Done!", flush=True)
 
     # TODO: sync goes here
@@ -340,6 +403,37 @@ def pocket_backup(logger):
     return True
 
 
+def run_pocket_snapshots_command(logger, argv=None) -> int:
+    """List, restore or export to zip the snapshots in the snapshot store."""
+    parser = argparse.ArgumentParser(prog="--pocket-snapshots", description="Update All Pocket snapshots")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("list")
+    restore_parser = subparsers.add_parser("restore")
+    restore_parser.add_argument("name")
+    restore_parser.add_argument("--target", help="folder to restore into, the original location by default")
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("name")
+    export_parser.add_argument("zip_path")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(SNAPSHOTS_FOLDER)
+    try:
+        if args.action == "list":
+            for name in store.names():
+                logger.print(name)
+        elif args.action == "restore":
+            count = store.restore(args.name, args.target)
+            logger.print("Restored {} files from {}".format(count, args.name))
+        elif args.action == "export":
+            count = store.export_zip(args.name, args.zip_path)
+            logger.print("Exported {} files from {} to {}".format(count, args.name, args.zip_path))
+    except SnapshotStoreException as e:
+        logger.print("ERROR! {}".format(e))
+        return 1
+
+    return 0
+
+
 if __name__ == '__main__':
     class SimpleLogger:
         def print(self, *args, **kwargs):
@@ -0,0 +1,177 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""Content-addressed snapshot store for the Pocket and MiSTer save backups.
+
+File contents are stored once under objects/ by their MD5, and every snapshot is
+a small JSON manifest mapping relative paths to [size, mtime_ns, md5].
+"""
+
+import datetime
+import json
+import os
+from typing import Dict, List, Optional
+
+from update_all.analogue_pocket.zip_writer import ZipEntry, write_zip
+from update_all.file_system import copy_file
+
+OBJECTS_FOLDER: str = "objects"
+SNAPSHOT_EXTENSION: str = ".json"
+SNAPSHOT_VERSION: int = 1
+
+
+class SnapshotStoreException(Exception):
+    pass
+
+
+class SnapshotStore:
+    def __init__(self, store_folder: str):
+        self._store_folder = store_folder
+        self._objects_folder = os.path.join(store_folder, OBJECTS_FOLDER)
+
+    def create(self, prefix: str, root: str, folders: List[str]) -> str:
+        """Snapshot every file under root/folder for each folder and return the snapshot name.
+        Only files whose size or mtime changed since the latest snapshot with the same prefix are read.
+        """
+        name = prefix + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        manifest_path = self._manifest_path(name)
+        if os.path.exists(manifest_path):
+            raise SnapshotStoreException("Snapshot already exists: {}".format(manifest_path))
+
+        latest = self.latest(prefix)
+        previous_files = {} if latest is None else self.load(latest)["files"]
+
+        files: Dict[str, list] = {}
+        for folder in folders:
+            for root_dir, _dirs, file_names in os.walk(os.path.join(root, folder)):
+                for file_name in file_names:
+                    path = os.path.join(root_dir, file_name)
+                    relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+                    stat = os.stat(path)
+                    previous = previous_files.get(relative_path)
+                    if previous is not None and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns \
+                            and os.path.exists(self._object_path(previous[2])):
+                        files[relative_path] = previous
+                    else:
+                        files[relative_path] = [stat.st_size, stat.st_mtime_ns, self._store_object(path)]
+
+        self._write_manifest(manifest_path, {
+            "version": SNAPSHOT_VERSION,
+            "root": root,
+            "files": files,
+        })
+        return name
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Snapshot names with the given prefix, newest first."""
+        try:
+            entries = os.listdir(self._store_folder)
+        except FileNotFoundError:
+            return []
+        names = [e[:-len(SNAPSHOT_EXTENSION)] for e in entries if e.startswith(prefix) and e.endswith(SNAPSHOT_EXTENSION)]
+        names.sort(reverse=True)
+        return names
+
+    def latest(self, prefix: str) -> Optional[str]:
+        names = self.names(prefix)
+        return names[0] if len(names) > 0 else None
+
+    def load(self, name: str) -> dict:
+        try:
+            with open(self._manifest_path(name), "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise SnapshotStoreException("Snapshot not found: {}".format(name))
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotStoreException("Unsupported snapshot version in {}".format(name))
+        return manifest
+
+    def restore(self, name: str, target_root: Optional[str] = None) -> int:
+        """Write the files of a snapshot back into target_root (the snapshotted root by default).
+        Returns the number of restored files.
+        """
+        manifest = self.load(name)
+        target_root = manifest["root"] if target_root is None else target_root
+        for relative_path, (_size, mtime_ns, md5) in manifest["files"].items():
+            target = os.path.join(target_root, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_target = target + ".tmp"
+            copy_file(self._object_path(md5), tmp_target)
+            os.replace(tmp_target, target)
+            os.utime(target, ns=(mtime_ns, mtime_ns))
+        return len(manifest["files"])
+
+    def export_zip(self, name: str, zip_path: str) -> int:
+        """Write the files of a snapshot into a regular zip archive. Returns the number of entries."""
+        manifest = self.load(name)
+        return write_zip(zip_path, (
+            ZipEntry(self._object_path(md5), relative_path, _zip_date_time(mtime_ns))
+            for relative_path, (_size, mtime_ns, md5) in sorted(manifest["files"].items())
+        ))
+
+    def cleanup(self, prefixes: List[str], keep: int) -> None:
+        """Delete all but the newest `keep` snapshots of each prefix, then drop unreferenced objects."""
+        for prefix in prefixes:
+            for name in self.names(prefix)[keep:]:
+                os.remove(self._manifest_path(name))
+
+        referenced = set()
+        for name in self.names():
+            referenced.update(entry[2] for entry in self.load(name)["files"].values())
+
+        if not os.path.isdir(self._objects_folder):
+            return
+
+        for bucket in os.scandir(self._objects_folder):
+            if not bucket.is_dir():
+                continue
+            for obj in os.scandir(bucket.path):
+                if obj.name not in referenced:
+                    os.remove(obj.path)
+
+    def _store_object(self, path: str) -> str:
+        os.makedirs(self._objects_folder, exist_ok=True)
+        tmp_path = os.path.join(self._objects_folder, "incoming.tmp")
+        md5 = copy_file(path, tmp_path, with_hash=True)
+        object_path = self._object_path(md5)
+        if os.path.exists(object_path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(tmp_path, object_path)
+        return md5
+
+    def _object_path(self, md5: str) -> str:
+        return os.path.join(self._objects_folder, md5[0:2], md5)
+
+    def _manifest_path(self, name: str) -> str:
+        return os.path.join(self._store_folder, name + SNAPSHOT_EXTENSION)
+
+    @staticmethod
+    def _write_manifest(path: str, manifest: dict) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def _zip_date_time(mtime_ns: int):
+    date_time = datetime.datetime.fromtimestamp(mtime_ns / 1_000_000_000).timetuple()[:6]
+    return (max(date_time[0], 1980),) + date_time[1:]
@@ -0,0 +1,210 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""Zip creation that deflates entries in a thread pool and writes the compressed bytes in order."""
+
+import os
+import struct
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Tuple
+
+# workers read and deflate entries while the writer thread only writes bytes, zlib releases the GIL meanwhile
+ZIP_WORKERS: int = 2
+# entries being deflated ahead of the writer
+ZIP_READ_AHEAD: int = ZIP_WORKERS * 2
+# source bytes held in memory by the entries being deflated ahead of the writer
+ZIP_READ_AHEAD_MAX_BYTES: int = 16 * 1024 * 1024
+ZIP_COMPRESSION_LEVEL: int = 6
+# bigger files are deflated in chunks on the writer thread instead of being held in memory
+ZIP_IN_MEMORY_MAX_SIZE: int = 8 * 1024 * 1024
+ZIP_STREAM_CHUNK_SIZE: int = 1024 * 1024
+# small .sav blobs barely shrink, storing them avoids the deflate work
+ZIP_STORED_SAV_MAX_SIZE: int = 32 * 1024
+# formats that are already compressed or hold incompressible save states
+ZIP_STORED_EXTENSIONS: frozenset = frozenset({
+    ".zip", ".7z", ".gz", ".rar", ".chd", ".png", ".jpg", ".jpeg",
+    ".sta", ".ss", ".state",
+})
+
+_CENTRAL_DIRECTORY_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+_END_OF_CENTRAL_DIRECTORY_STRUCT = struct.Struct("<4s4H2LH")
+_ZIP64_END_OF_CENTRAL_DIRECTORY_STRUCT = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+_ZIP64_VERSION = 45
+_UTF8_FILENAME_FLAG = 0x800
+
+
+class ZipEntry(NamedTuple):
+    source: str
+    arcname: str
+    date_time: Optional[Tuple[int, int, int, int, int, int]] = None
+
+
+def should_store(arcname: str, size: int) -> bool:
+    extension = os.path.splitext(arcname)[1].lower()
+    if extension in ZIP_STORED_EXTENSIONS:
+        return True
+    return extension == ".sav" and size <= ZIP_STORED_SAV_MAX_SIZE
+
+
+def write_zip(zip_path: str, entries: Iterable[ZipEntry], workers: int = ZIP_WORKERS) -> int:
+    """Write entries into a new zip at zip_path, in the given order. Returns the number of entries."""
+    read_ahead = max(ZIP_READ_AHEAD, workers)
+    written: List[zipfile.ZipInfo] = []
+    with open(zip_path, "wb") as target, ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        in_flight_bytes = 0
+        for entry in entries:
+            zinfo = _zip_info(entry)
+            in_memory = zinfo.file_size <= ZIP_IN_MEMORY_MAX_SIZE
+            size = zinfo.file_size if in_memory else 0
+            while pending and (len(pending) >= read_ahead or in_flight_bytes + size > ZIP_READ_AHEAD_MAX_BYTES):
+                in_flight_bytes -= _write_pending_entry(target, written, *pending.popleft())
+            future = executor.submit(_deflate_entry, entry, zinfo) if in_memory else None
+            pending.append((size, future, entry, zinfo))
+            in_flight_bytes += size
+        while pending:
+            _write_pending_entry(target, written, *pending.popleft())
+        _write_central_directory(target, written)
+    return len(written)
+
+
+def _zip_info(entry: ZipEntry) -> zipfile.ZipInfo:
+    zinfo = zipfile.ZipInfo.from_file(entry.source, entry.arcname)
+    if entry.date_time is not None:
+        zinfo.date_time = entry.date_time
+    zinfo.compress_type = zipfile.ZIP_STORED if should_store(entry.arcname, zinfo.file_size) else zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def _deflate_entry(entry: ZipEntry, zinfo: zipfile.ZipInfo) -> bytes:
+    with open(entry.source, "rb") as f:
+        data = f.read()
+
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        compressor = _compressor()
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) < len(data):
+            zinfo.compress_size = len(compressed)
+            return compressed
+        zinfo.compress_type = zipfile.ZIP_STORED
+
+    zinfo.compress_size = len(data)
+    return data
+
+
+def _compressor():
+    return zlib.compressobj(ZIP_COMPRESSION_LEVEL, zlib.DEFLATED, -15)
+
+
+def _write_pending_entry(target: BinaryIO, written: List[zipfile.ZipInfo], size: int, future: Optional[Future], entry: ZipEntry, zinfo: zipfile.ZipInfo) -> int:
+    zinfo.header_offset = target.tell()
+    if future is None:
+        _stream_entry(target, entry, zinfo)
+    else:
+        data = future.result()
+        target.write(zinfo.FileHeader())
+        target.write(data)
+    written.append(zinfo)
+    return size
+
+
+def _stream_entry(target: BinaryIO, entry: ZipEntry, zinfo: zipfile.ZipInfo) -> None:
+    # sizes are only known at the end, so the local header is written again once the data is in place
+    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+    zinfo.CRC = zinfo.compress_size = 0
+    target.write(zinfo.FileHeader(zip64))
+    compressor = _compressor() if zinfo.compress_type == zipfile.ZIP_DEFLATED else None
+    file_size = compress_size = crc = 0
+    with open(entry.source, "rb") as source:
+        while True:
+            chunk = source.read(ZIP_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            compress_size += len(chunk)
+            target.write(chunk)
+    if compressor is not None:
+        chunk = compressor.flush()
+        compress_size += len(chunk)
+        target.write(chunk)
+
+    zinfo.file_size, zinfo.compress_size, zinfo.CRC = file_size, compress_size, crc
+    end = target.tell()
+    target.seek(zinfo.header_offset)
+    target.write(zinfo.FileHeader(zip64))
+    target.seek(end)
+
+
+def _write_central_directory(target: BinaryIO, written: List[zipfile.ZipInfo]) -> None:
+    start = target.tell()
+    for zinfo in written:
+        target.write(_central_directory_record(zinfo))
+    end = target.tell()
+
+    count, size = len(written), end - start
+    if count > zipfile.ZIP_FILECOUNT_LIMIT or start > zipfile.ZIP64_LIMIT or size > zipfile.ZIP64_LIMIT:
+        target.write(_ZIP64_END_OF_CENTRAL_DIRECTORY_STRUCT.pack(
+            b"PK\x06\x06", _ZIP64_END_OF_CENTRAL_DIRECTORY_STRUCT.size - 12, _ZIP64_VERSION, _ZIP64_VERSION,
+            0, 0, count, count, size, start))
+        target.write(_ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_STRUCT.pack(b"PK\x06\x07", 0, end, 1))
+        count = min(count, 0xFFFF)
+        size = min(size, 0xFFFFFFFF)
+        start = min(start, 0xFFFFFFFF)
+    target.write(_END_OF_CENTRAL_DIRECTORY_STRUCT.pack(b"PK\x05\x06", 0, 0, count, count, size, start, 0))
+
+
+def _central_directory_record(zinfo: zipfile.ZipInfo) -> bytes:
+    zip64_fields = []
+    file_size, compress_size, header_offset = zinfo.file_size, zinfo.compress_size, zinfo.header_offset
+    if file_size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT:
+        zip64_fields += [file_size, compress_size]
+        file_size = compress_size = 0xFFFFFFFF
+    if header_offset > zipfile.ZIP64_LIMIT:
+        zip64_fields.append(header_offset)
+        header_offset = 0xFFFFFFFF
+
+    extra = zinfo.extra
+    extract_version = zinfo.extract_version
+    if zip64_fields:
+        extra = struct.pack("<HH" + "Q" * len(zip64_fields), 1, 8 * len(zip64_fields), *zip64_fields) + extra
+        extract_version = max(_ZIP64_VERSION, extract_version)
+
+    try:
+        filename = zinfo.filename.encode("ascii")
+        flag_bits = zinfo.flag_bits
+    except UnicodeEncodeError:
+        filename = zinfo.filename.encode("utf-8")
+        flag_bits = zinfo.flag_bits | _UTF8_FILENAME_FLAG
+
+    year, month, day, hour, minute, second = zinfo.date_time
+    dosdate = (year - 1980) << 9 | month << 5 | day
+    dostime = hour << 11 | minute << 5 | (second // 2)
+    return _CENTRAL_DIRECTORY_STRUCT.pack(
+        b"PK\x01\x02", max(extract_version, zinfo.create_version), zinfo.create_system, extract_version, 0,
+        flag_bits, zinfo.compress_type, dostime, dosdate, zinfo.CRC, compress_size, file_size,
+        len(filename), len(extra), len(zinfo.comment), 0, zinfo.internal_attr, zinfo.external_attr, header_offset,
+    ) + filename + extra + zinfo.comment
@@ -32,7 +32,9 @@ from typing import List, Dict, Any, Tuple, Optional
 from update_all.config import Config
 from update_all.constants import FILE_arcade_database_mad_db_json_zip
 from update_all.fetcher import Fetcher
+from update_all.file_system import copy_file
 from update_all.logger import Logger
+from update_all.names_index import NamesIndex
 from update_all.other import str_to_bool, GenericProvider
 
 
@@ -145,9 +147,10 @@ def default_fetcher() -> Fetcher:
     return Fetcher(provider)
 
 class ArcadeOrganizerService:
-    def __init__(self, printer: 'Logger', fetcher: Optional[Fetcher] = None):
+    def __init__(self, printer: 'Logger', fetcher: Optional[Fetcher] = None, names_index: Optional[NamesIndex] = None):
         self._printer = printer
         self._fetcher = fetcher or default_fetcher()
+        self._names_index = names_index or NamesIndex()
 
     def make_arcade_organizer_config(self, ini_file_str: str, base_path: str, http_proxy: str = ''):
         ini_file_path = Path(ini_file_str)
@@ -229,6 +232,7 @@ class ArcadeOrganizerService:
         if names_txt_file == f"{base_path}/names.txt":
             names_txt_file = f"{base_path}/Scripts/.config/arcade_names/arcade_names.txt"
         config['ARCADE_ORGANIZER_NAMES_TXT'] = Path(names_txt_file)
+        config['NAMES_INDEX_CACHE'] = Path("%s/names_index.json" % config['ARCADE_ORGANIZER_WORK_PATH'])
         config['CACHED_DATA_ZIP'] = Path("%s/data.zip" % config['ARCADE_ORGANIZER_WORK_PATH'])
         config['ORGDIR_FOLDERS_FILE'] = Path("%s/orgdir-folders" % config['ARCADE_ORGANIZER_WORK_PATH'])
         config['SSL_SECURITY_OPTION'] = os.getenv('SSL_SECURITY_OPTION', '--insecure')
@@ -313,7 +317,7 @@ class ArcadeOrganizerService:
         try:
             infra = Infrastructure(config, self._printer, self._fetcher)
             mra_finder = MraFinder(config, infra)
-            ao = ArcadeOrganizer(config, infra, mra_finder, self._printer)
+            ao = ArcadeOrganizer(config, infra, mra_finder, self._printer, self._names_index)
             ao.organize_all_mras()
             return check_pass_errors(infra.errors(), self._printer)
         except Exception as e:
@@ -325,7 +329,7 @@ class ArcadeOrganizerService:
     def run_arcade_organizer_print_orgdir_folders(self, config: Dict[str, Any]) -> Tuple[List[str], bool]:
         infra = Infrastructure(config, self._printer, self._fetcher)
         mra_finder = MraFinder(config, infra)
-        ao = ArcadeOrganizer(config, infra, mra_finder, self._printer)
+        ao = ArcadeOrganizer(config, infra, mra_finder, self._printer, self._names_index)
 
         folders = ao.calculate_orgdir_folders()
         return folders, check_pass_errors(infra.errors(), self._printer)
@@ -334,13 +338,18 @@ class ArcadeOrganizerService:
     def run_arcade_organizer_print_ini_options(self, config: Dict[str, Any]) -> bool:
         infra = Infrastructure(config, self._printer, self._fetcher)
         mra_finder = MraFinder(config, infra)
-        ao = ArcadeOrganizer(config, infra, mra_finder, self._printer)
+        ao = ArcadeOrganizer(config, infra, mra_finder, self._printer, self._names_index)
 
         for key, value in sorted(ao.calculate_ini_options().items()):
             self._printer.print("%s=%s" % (key, value))
 
         return check_pass_errors(infra.errors(), self._printer)
 
+def _copy_file_with_stat(src, dst):
+    copy_file(src, dst, preserve=shutil.copystat)
+    return dst
+
+
 def lineno():
     return getframeinfo(currentframe().f_back).lineno
 
@@ -428,7 +437,7 @@ class Infrastructure:
         else:
             try:
                 if self._config['NO_SYMLINKS']:
-                    shutil.copy(src, dst)
+                    copy_file(src, dst, preserve=shutil.copymode)
                 else:
                     os.symlink(src, dst)
             except FileExistsError:
@@ -448,16 +457,15 @@ class Infrastructure:
             self._printer.print("Using local Mister Arcade Descriptions database")
             src = self._config['MAD_DB']
             try:
-                shutil.copyfile(src, self._config['TMP_DATA_ZIP'])
+                md5 = copy_file(src, self._config['TMP_DATA_ZIP'], with_hash=True)
             except FileNotFoundError as _e:
                 self._printer.print("Couldn't find %s" % src)
                 self._printer.print()
                 return None
 
-            with open(self._config['TMP_DATA_ZIP'], 'rb') as tmp_data_zip:
-                self._printer.print("MD5 Hash: %s" % hashlib.md5(tmp_data_zip.read()).hexdigest())
-                self._printer.print()
-                return self._tmp_data_zip_path
+            self._printer.print("MD5 Hash: %s" % md5)
+            self._printer.print()
+            return self._tmp_data_zip_path
 
         self._printer.print("Downloading Mister Arcade Descriptions database")
 
@@ -559,7 +567,7 @@ class Infrastructure:
 
     def cache_names_file(self):
         if self._config['ARCADE_ORGANIZER_NAMES_TXT'].is_file():
-            shutil.copy(str(self._config['ARCADE_ORGANIZER_NAMES_TXT']), str(self._cached_names_path))
+            copy_file(str(self._config['ARCADE_ORGANIZER_NAMES_TXT']), str(self._cached_names_path), preserve=shutil.copymode)
 
     def handle_orgdir_outside_mra_folder(self):
         org_rp = Path(os.path.realpath(self._config['ORGDIR']))
@@ -571,7 +579,7 @@ class Infrastructure:
             try:
                 self.make_directory(org_cores.parent)
                 if self._config['NO_SYMLINKS']:
-                    shutil.copytree(str(mra_cores.absolute()), str(org_cores.absolute()))
+                    shutil.copytree(str(mra_cores.absolute()), str(org_cores.absolute()), copy_function=_copy_file_with_stat)
                 else:
                     os.symlink(str(mra_cores.absolute()), str(org_cores.absolute()))
             except FileExistsError:
@@ -656,7 +664,7 @@ class Infrastructure:
             self._are_files_md5_different(left_file, right_file)
 
     def copy_file(self, from_file, to_file):
-        shutil.copy(str(from_file), str(to_file))
+        copy_file(str(from_file), str(to_file), preserve=shutil.copymode)
 
     def remove_file(self, file_path):
         file_path.unlink()
@@ -766,11 +774,12 @@ class Infrastructure:
 
 
 class ArcadeOrganizer:
-    def __init__(self, config, infra, mra_finder, printer):
+    def __init__(self, config, infra, mra_finder, printer, names_index: Optional[NamesIndex] = None):
         self._config = config
         self._infra = infra
         self._mra_finder = mra_finder
         self._printer = printer
+        self._names_index = names_index or NamesIndex()
         self._init_cores_dict()
         self._init_names_txt_dict()
         self._cached_db = None
@@ -784,14 +793,8 @@ class ArcadeOrganizer:
                 self._cores_dict[core_name.upper()] = core_name
 
     def _init_names_txt_dict(self):
-        self._names_txt_dict = dict()
-        if self._config['ARCADE_ORGANIZER_NAMES_TXT'].is_file():
-            with self._config['ARCADE_ORGANIZER_NAMES_TXT'].open() as f:
-                for line in f:
-                    if ":" not in line:
-                        continue
-                    splits = line.split(':', 1)
-                    self._names_txt_dict[splits[0].upper()] = splits[1].strip()
+        cache_path = self._config.get('NAMES_INDEX_CACHE')
+        self._names_txt_dict = self._names_index.upper_names(str(self._config['ARCADE_ORGANIZER_NAMES_TXT']), None if cache_path is None else str(cache_path))
 
     def read_description(self, setname):
         mad_db = self.mad_dict
@@ -1268,7 +1271,8 @@ class ArcadeOrganizer:
     @property
     def mad_dict(self):
         if self._cached_db is None:
-            self._cached_db = self._infra.read_mad_db()
+            with self._printer.span('arcade_organizer.read_mad_db'):
+                self._cached_db = self._infra.read_mad_db()
         return self._cached_db
 
     def organize_all_mras(self):
@@ -1285,7 +1289,8 @@ class ArcadeOrganizer:
 
         self._infra.remove_any_previous_mad_db_files_in_tmp()
 
-        tmp_data_file = self._infra.download_mad_db_zip()
+        with self._printer.span('arcade_organizer.fetch_mad_db'):
+            tmp_data_file = self._infra.download_mad_db_zip()
 
         last_version, last_ini_date, last_mra_date = self._infra.read_last_run_file()
 
@@ -1345,7 +1350,9 @@ class ArcadeOrganizer:
 
         self._printer.print()
 
-        updated_mras = self._mra_finder.find_all_mras()
+        with self._printer.span('arcade_organizer.scan') as span:
+            updated_mras = self._mra_finder.find_all_mras()
+            span.set('mras', len(updated_mras))
 
         if len(updated_mras) == 0:
             self._printer.print("No new MRAs detected")
@@ -1364,18 +1371,20 @@ class ArcadeOrganizer:
         self._printer.print()
         self._printer.print("################################################################################")
 
-        for mra in updated_mras:
-            self.organize_single_mra(mra)
+        with self._printer.span('arcade_organizer.organize', mras=len(updated_mras)):
+            for mra in updated_mras:
+                self.organize_single_mra(mra)
 
-        self.organize_topdir()
+        with self._printer.span('arcade_organizer.finish'):
+            self.organize_topdir()
 
-        self._infra.write_orgdir_folders_file()
+            self._infra.write_orgdir_folders_file()
 
-        self._infra.handle_orgdir_outside_mra_folder()
+            self._infra.handle_orgdir_outside_mra_folder()
 
-        self._infra.write_last_run_file(ini_date, mra_date)
+            self._infra.write_last_run_file(ini_date, mra_date)
 
-        self._infra.cache_names_file()
+            self._infra.cache_names_file()
 
         self._printer.print("################################################################################")
         self._printer.print('%s ver. by theypsilon' % self._config['ARCADE_ORGANIZER_VERSION'])
@@ -46,6 +46,7 @@ class EnvDict(TypedDict):
     UPDATE_ALL_DOWNLOADER_URL: str
     UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH: str
     UPDATE_ALL_NON_INTERACTIVE: str
+    UPDATE_ALL_PROFILE: str
     RETROACCOUNT_DOMAIN: str
     real_start_time: float
 
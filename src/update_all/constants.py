@@ -30,6 +30,7 @@ DEFAULT_DEBUG: Final[str] = 'false'
 DEFAULT_TRANSITION_SERVICE_ONLY: Final[str] = 'false'
 DEFAULT_SKIP_DOWNLOADER: Final[str] = 'false'
 DEFAULT_UPDATE_ALL_NON_INTERACTIVE: Final[str] = 'false'
+DEFAULT_UPDATE_ALL_PROFILE: Final[str] = ''
 
 MISTER_ENVIRONMENT: Final[str] = 'mister'
 FILE_mister_version: Final[str] = '/MiSTer.version'
@@ -56,6 +57,7 @@ FILE_settings_screen_model_json_zip: Final[str] = 'Scripts/.config/update_all/se
 FILE_update_all_zipped_storage: Final[str] = 'Scripts/.config/update_all/update_all.json.zip'
 FILE_update_all_storage: Final[str] = 'Scripts/.config/update_all/update_all.json'
 FILE_update_all_log: Final[str] = 'Scripts/.config/update_all/update_all.log'
+FILE_update_all_perf_history: Final[str] = 'Scripts/.config/update_all/perf_history.json'
 FILE_update_all_self_update_resume: Final[str] = '/tmp/update_all_early_update_resume'
 FILE_update_all_self_update_downloader_log: Final[str] = 'Scripts/.config/update_all/self_update_downloader.log'
 FILE_update_all_chip_id_linker_log: Final[str] = 'Scripts/.config/update_all/chip-id-linker.log'
@@ -67,6 +69,7 @@ FILE_update_all_chip_id_rbf: Final[str] = "Scripts/.config/update_all/Linker.rbf
 FILE_timeline_short: Final[str] = "Scripts/.config/update_all/timeline.json"
 FILE_timeline_plus: Final[str] = "Scripts/.config/update_all/timeline_plus.enc"
 FILE_timeline_plus2: Final[str] = "Scripts/.config/update_all/timeline_plus2.enc"
+FILE_timeline_render_cache: Final[str] = "Scripts/.config/update_all/timeline_render_cache.json"
 FILE_update_all_ini: Final[str] = 'Scripts/update_all.ini'
 FILE_update_jtcores_ini: Final[str] = 'Scripts/update_jtcores.ini'
 FILE_update_jtcores_sh: Final[str] = 'Scripts/update_jtcores.sh'
@@ -80,6 +83,7 @@ FILE_jtbeta: Final[str] = 'games/mame/jtbeta.zip'
 FILE_jtbeta_alt: Final[str] = '_Arcade/mame/jtbeta.zip'
 FILE_jtbeta_md5: Final[str] = 'Scripts/.config/update_all/jtbeta.zip.md5'
 FILE_names_txt: Final[str] = 'names.txt'
+FILE_names_txt_index_cache: Final[str] = 'Scripts/.config/update_all/names_txt_index.json'
 FILE_MiSTer: Final[str] = 'MiSTer'
 FILE_MiSTer_delme: Final[str] = '.MiSTer.delme'
 FILE_MiSTer_ini: Final[str] = 'MiSTer.ini'
@@ -187,6 +191,7 @@ KENV_UPDATE_ALL_DOWNLOADER_PATH: Final[str] = 'UPDATE_ALL_DOWNLOADER_PATH'
 KENV_UPDATE_ALL_DOWNLOADER_URL: Final[str] = 'UPDATE_ALL_DOWNLOADER_URL'
 KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH: Final[str] = 'UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH'
 KENV_UPDATE_ALL_NON_INTERACTIVE: Final[str] = 'UPDATE_ALL_NON_INTERACTIVE'
+KENV_UPDATE_ALL_PROFILE: Final[str] = 'UPDATE_ALL_PROFILE'
 
 # Exit codes
 EXIT_CODE_REQUIRES_EARLY_EXIT: Final[int] = 1
@@ -94,7 +94,8 @@ class DownloaderService:
         attempts = ((True, True), (False, True), (False, False))
         for attempt, (consider_bin, consider_zip) in enumerate(attempts):
             self._logger.debug('Preparing Downloader launcher attempt ', attempt + 1, '/', len(attempts))
-            downloader_file = self._prepare_latest_downloader(config, consider_bin, consider_zip)
+            with self._logger.span('downloader.prepare_launcher', attempt=attempt + 1):
+                downloader_file = self._prepare_latest_downloader(config, consider_bin, consider_zip)
             if downloader_file is None:
                 self._logger.debug('Downloader launcher preparation failed')
                 return 1
@@ -103,7 +104,9 @@ class DownloaderService:
             if attempt == 0 and not quiet:
                 self._logger.print()
 
-            return_code = self._os_utils.execute_process(downloader_file, env, quiet, args=args)
+            with self._logger.span('downloader.launcher', attempt=attempt + 1) as span:
+                return_code = self._os_utils.execute_process(downloader_file, env, quiet, args=args)
+                span.set('return_code', return_code)
             if attempt == len(attempts) - 1 or not self._file_system.is_file(FILE_downloader_run_signal):
                 self._logger.debug('Downloader launcher finished with exit code ', return_code)
                 return return_code
@@ -25,6 +25,7 @@ from typing import Optional
 from update_all.config import Config
 from update_all.constants import FILE_patreon_key_md5, FILE_mister_version
 from update_all.file_system import FileSystem
+from update_all.libcrypto import BadDecrypt, load_libcrypto
 from update_all.logger import Logger
 from update_all.other import GenericProvider
 
@@ -81,24 +82,49 @@ class Encryption:
         return EncryptionResult.Success
 
     def decrypt_file(self, input_path: str, output_path: str, key_file_path: str) -> EncryptionResult:
+        result, _ = self._decrypt(input_path, key_file_path, output_path)
+        return result
+
+    def decrypt_bytes(self, input_path: str, key_file_path: str) -> tuple[EncryptionResult, Optional[bytes]]:
+        """Like decrypt_file, but the plaintext is read from the openssl pipe instead of being written to disk."""
+        return self._decrypt(input_path, key_file_path, None)
+
+    def _decrypt(self, input_path: str, key_file_path: str, output_path: Optional[str]) -> tuple[EncryptionResult, Optional[bytes]]:
         env_check_result = self._validate_environment()
         if env_check_result is not None:
-            return env_check_result
+            return env_check_result, None
 
         if not self._file_system.is_file(key_file_path):
             self._logger.debug(f"Encryption: Patreon Key file '{key_file_path}' does not exist.")
-            return EncryptionResult.MissingKey
+            return EncryptionResult.MissingKey, None
 
         if not self._file_system.is_file(input_path):
             self._logger.debug(f"Encryption: Input file '{input_path}' does not exist.")
-            return EncryptionResult.MissingInput
-
+            return EncryptionResult.MissingInput, None
+
+        libcrypto = load_libcrypto()
+        if libcrypto is not None:
+            try:
+                plaintext = libcrypto.decrypt_with_kfile(self._file_system.read_file_binary(input_path), self._file_system.read_file_binary(key_file_path))
+                if output_path is None:
+                    return EncryptionResult.Success, plaintext
+                self._file_system.write_file_bytes(output_path, plaintext)
+                return EncryptionResult.Success, None
+            except BadDecrypt as e:
+                self._print_invalid_patreon_key_message()
+                self._logger.debug(f"Encryption: libcrypto -> {e}")
+                return EncryptionResult.InvalidKey, None
+            except Exception as e:
+                self._logger.debug("Encryption: In-process decryption failed, falling back to OpenSSL.")
+                self._logger.debug(e)
+
+        output_args = [] if output_path is None else ["-out", self._file_system.download_target_path(output_path)]
         try:
-            subprocess.run([
+            process = subprocess.run([
                 'openssl',
                 "enc", "-aes-256-cbc", "-d",
                 "-in", self._file_system.download_target_path(input_path),
-                "-out", self._file_system.download_target_path(output_path),
+                *output_args,
                 "-kfile", self._file_system.download_target_path(key_file_path),
                 "-nosalt", "-iter", "1"
             ],
@@ -110,17 +136,17 @@ class Encryption:
             self._print_invalid_patreon_key_message()
             self._logger.debug(e)
             self._logger.debug(f"Encryption: stderr -> {e.stderr}")
-            return EncryptionResult.InvalidKey
+            return EncryptionResult.InvalidKey, None
         except FileNotFoundError as e:
             self._logger.debug("Encryption: OpenSSL not found in system PATH.")
             self._logger.debug(e)
-            return EncryptionResult.OtherError
+            return EncryptionResult.OtherError, None
         except Exception as e:
             self._logger.debug(f"Encryption: Unexpected error running OpenSSL.")
             self._logger.debug(e)
-            return EncryptionResult.OtherError
+            return EncryptionResult.OtherError, None
 
-        return EncryptionResult.Success
+        return EncryptionResult.Success, None if output_path is not None else process.stdout
 
     def _validate_environment(self) -> Optional[EncryptionResult]:
         if self._check_env and (platform.system() != 'Linux' or not self._file_system.is_file(FILE_mister_version)):
@@ -27,6 +27,7 @@ from typing import Optional, Any, Tuple
 from update_all.analogue_pocket.http_gateway import HttpGateway, HttpLogger, write_stream_to_data
 from update_all.config import Config
 from update_all.other import GenericProvider
+from update_all.tracing import tracer
 
 
 _RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
@@ -104,6 +105,8 @@ class Fetcher:
             try:
                 with gw.open(url, method, body, headers) as (final_url, in_stream):
                     data, _ = write_stream_to_data(in_stream, False, timeout)
+                    tracer.count('update_all_http_requests')
+                    tracer.count('update_all_http_bytes', len(data))
                     last_status = in_stream.status
                     last_data = data
                     if last_status not in _RETRYABLE_STATUS_CODES:
@@ -16,6 +16,7 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 
+import errno
 import os
 import hashlib
 import shutil
@@ -26,6 +27,7 @@ import zipfile
 import filecmp
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Callable, Optional
 from update_all.config import AllowDelete
 from update_all.constants import K_ALLOW_DELETE, FOLDER_scripts_config_lc
 from update_all.other import ClosableValue
@@ -273,12 +275,12 @@ class _FileSystem(FileSystem):
         os.replace(self._path(source), self._path(target))
 
     def copy(self, source, target):
-        return shutil.copyfile(self._path(source), self._path(target))
+        target = self._path(target)
+        copy_file(self._path(source), target)
+        return target
 
     def copy_fast(self, source, target):
-        with open(self._path(source), 'rb') as fsource:
-            with open(self._path(target), 'wb') as ftarget:
-                shutil.copyfileobj(fsource, ftarget, length=1024 * 1024 * 4)
+        copy_file(self._path(source), self._path(target), buffer_size=COPY_FAST_BUFFER_SIZE)
 
     def hash(self, path: str) -> str:
         return hash_file(self._path(path))
@@ -492,6 +494,92 @@ def hash_file(path: str) -> str:
         return file_hash.hexdigest()
 
 
+COPY_BUFFER_SIZE = 1024 * 1024
+COPY_FAST_BUFFER_SIZE = 1024 * 1024 * 4
+_KERNEL_COPY_CHUNK = 1024 * 1024 * 8
+_KERNEL_COPY_UNSUPPORTED_ERRNOS = {getattr(errno, name) for name in ('ENOSYS', 'EXDEV', 'EINVAL', 'EOPNOTSUPP', 'ENOTSUP', 'EBADF', 'EPERM', 'ENOTSOCK') if hasattr(errno, name)}
+
+CopyProgress = Callable[[int, int], None]
+
+
+def copy_file(source: str, target: str, with_hash: bool = False, progress: Optional[CopyProgress] = None,
+              preserve: Optional[Callable[[str, str], None]] = None, buffer_size: int = COPY_BUFFER_SIZE) -> Optional[str]:
+    """Copies source into target with the cheapest mechanism available.
+
+    Without hashing, the data is moved in-kernel with os.copy_file_range or os.sendfile.
+    Otherwise, or when the kernel refuses, it falls back to a single reusable user-space buffer.
+    Returns the md5 of the copied content when with_hash is set, None otherwise.
+    progress is called as progress(copied_bytes, total_bytes) after every chunk.
+    preserve, like shutil.copystat or shutil.copymode, is applied to (source, target) after copying.
+    Like shutil.copyfile, copying a file onto itself raises shutil.SameFileError instead of truncating it.
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        raise shutil.SameFileError(f'{source!r} and {target!r} are the same file')
+
+    with open(source, 'rb') as fsource, open(target, 'wb') as ftarget:
+        total = os.fstat(fsource.fileno()).st_size
+        if with_hash or not _copy_in_kernel(fsource.fileno(), ftarget.fileno(), total, progress):
+            file_hash = hashlib.md5() if with_hash else None
+            _copy_with_buffer(fsource, ftarget, total, buffer_size, file_hash, progress)
+        else:
+            file_hash = None
+
+    if preserve is not None:
+        preserve(source, target)
+
+    return None if file_hash is None else file_hash.hexdigest()
+
+
+def _copy_in_kernel(fd_source: int, fd_target: int, total: int, progress: Optional[CopyProgress]) -> bool:
+    for kernel_copy in _kernel_copy_functions():
+        copied = 0
+        try:
+            while True:
+                sent = kernel_copy(fd_source, fd_target, copied, _KERNEL_COPY_CHUNK)
+                if sent == 0:
+                    break
+                copied += sent
+                if progress is not None:
+                    progress(copied, total)
+        except OSError as e:
+            if copied == 0 and e.errno in _KERNEL_COPY_UNSUPPORTED_ERRNOS:
+                continue
+            raise
+        if copied == 0 and total > 0:
+            # Some pseudo and network filesystems report EOF right away instead of failing.
+            continue
+        return True
+
+    return False
+
+
+def _kernel_copy_functions():
+    if hasattr(os, 'copy_file_range'):
+        yield lambda fd_in, fd_out, offset, count: os.copy_file_range(fd_in, fd_out, count, offset, offset)
+    if hasattr(os, 'sendfile'):
+        yield lambda fd_in, fd_out, offset, count: os.sendfile(fd_out, fd_in, offset, count)
+
+
+def _copy_with_buffer(fsource, ftarget, total: int, buffer_size: int, file_hash, progress: Optional[CopyProgress]) -> None:
+    fsource.seek(0)
+    ftarget.seek(0)
+    ftarget.truncate()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        read = fsource.readinto(buffer)
+        if not read:
+            break
+        chunk = view[:read]
+        ftarget.write(chunk)
+        if file_hash is not None:
+            file_hash.update(chunk)
+        copied += read
+        if progress is not None:
+            progress(copied, total)
+
+
 def absolute_parent_folder(absolute_path):
     return str(Path(absolute_path).parent)
 
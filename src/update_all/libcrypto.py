@@ -0,0 +1,131 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""In-process replacement for `openssl enc -aes-256-cbc -d -kfile <key> -nosalt -iter 1`, through ctypes bindings to libcrypto."""
+
+import ctypes
+import ctypes.util
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+# openssl enc reads -kfile passwords with a 128 bytes BIO_gets buffer
+KFILE_PASSWORD_MAX_SIZE: int = 127
+LIBCRYPTO_NAMES: Tuple[str, ...] = ('libcrypto.so.3', 'libcrypto.so.1.1', 'libcrypto.so')
+AES_256_KEY_SIZE: int = 32
+AES_BLOCK_SIZE: int = 16
+
+
+class LibCryptoError(Exception):
+    pass
+
+
+class BadDecrypt(LibCryptoError):
+    pass
+
+
+def kfile_password(content: bytes) -> bytes:
+    """The password openssl enc takes from the contents of a -kfile: the first line, without its line ending."""
+    password = content[:KFILE_PASSWORD_MAX_SIZE]
+    newline = password.find(b'\n')
+    if newline != -1:
+        password = password[:newline + 1]
+    for _ in range(2):
+        if password[-1:] in (b'\n', b'\r'):
+            password = password[:-1]
+    if len(password) == 0:
+        raise BadDecrypt('zero length password')
+    return password
+
+
+def derive_key_iv(password: bytes) -> Tuple[bytes, bytes]:
+    """-iter 1 implies PBKDF2 with SHA-256, and -nosalt makes the salt empty."""
+    key_iv = hashlib.pbkdf2_hmac('sha256', password, b'', 1, AES_256_KEY_SIZE + AES_BLOCK_SIZE)
+    return key_iv[:AES_256_KEY_SIZE], key_iv[AES_256_KEY_SIZE:]
+
+
+class LibCrypto:
+    def __init__(self, lib: ctypes.CDLL):
+        self._lib = lib
+        lib.EVP_CIPHER_CTX_new.restype = ctypes.c_void_p
+        lib.EVP_CIPHER_CTX_new.argtypes = []
+        lib.EVP_CIPHER_CTX_free.restype = None
+        lib.EVP_CIPHER_CTX_free.argtypes = [ctypes.c_void_p]
+        lib.EVP_aes_256_cbc.restype = ctypes.c_void_p
+        lib.EVP_aes_256_cbc.argtypes = []
+        lib.EVP_DecryptInit_ex.restype = ctypes.c_int
+        lib.EVP_DecryptInit_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.EVP_DecryptUpdate.restype = ctypes.c_int
+        lib.EVP_DecryptUpdate.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int), ctypes.c_char_p, ctypes.c_int]
+        lib.EVP_DecryptFinal_ex.restype = ctypes.c_int
+        lib.EVP_DecryptFinal_ex.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int)]
+
+    def aes_256_cbc_decrypt(self, data: bytes, key: bytes, iv: bytes) -> bytes:
+        """Raises BadDecrypt when the PKCS#7 padding doesn't check out, which is how a wrong key shows up."""
+        ctx = self._lib.EVP_CIPHER_CTX_new()
+        if not ctx:
+            raise LibCryptoError('EVP_CIPHER_CTX_new failed')
+        try:
+            if self._lib.EVP_DecryptInit_ex(ctx, self._lib.EVP_aes_256_cbc(), None, key, iv) != 1:
+                raise LibCryptoError('EVP_DecryptInit_ex failed')
+            out = ctypes.create_string_buffer(len(data) + AES_BLOCK_SIZE)
+            out_len = ctypes.c_int(0)
+            if self._lib.EVP_DecryptUpdate(ctx, out, ctypes.byref(out_len), data, len(data)) != 1:
+                raise LibCryptoError('EVP_DecryptUpdate failed')
+            total = out_len.value
+            final_out = ctypes.create_string_buffer(AES_BLOCK_SIZE)
+            if self._lib.EVP_DecryptFinal_ex(ctx, final_out, ctypes.byref(out_len)) != 1:
+                raise BadDecrypt('bad decrypt')
+            return out.raw[:total] + final_out.raw[:out_len.value]
+        finally:
+            self._lib.EVP_CIPHER_CTX_free(ctx)
+
+    def decrypt_with_kfile(self, data: bytes, kfile_content: bytes) -> bytes:
+        key, iv = derive_key_iv(kfile_password(kfile_content))
+        return self.aes_256_cbc_decrypt(data, key, iv)
+
+
+_libcrypto: Optional[LibCrypto] = None
+_libcrypto_loaded = False
+_libcrypto_lock = threading.Lock()
+
+
+def load_libcrypto() -> Optional[LibCrypto]:
+    """The system libcrypto, or None when it can't be loaded. The lookup only happens once per process."""
+    global _libcrypto, _libcrypto_loaded
+    with _libcrypto_lock:
+        if not _libcrypto_loaded:
+            _libcrypto_loaded = True
+            _libcrypto = _open_libcrypto()
+        return _libcrypto
+
+
+def _open_libcrypto() -> Optional[LibCrypto]:
+    for name in LIBCRYPTO_NAMES:
+        try:
+            return LibCrypto(ctypes.CDLL(name))
+        except (OSError, AttributeError):
+            continue
+    # find_library runs ldconfig, so it is only the last resort
+    found = ctypes.util.find_library('crypto')
+    if found is None:
+        return None
+    try:
+        return LibCrypto(ctypes.CDLL(found))
+    except (OSError, AttributeError):
+        return None
@@ -59,8 +59,10 @@ class LocalRepository:
         return self._pocket_firmware_info
 
     def load_store(self) -> LocalStore:
-        self._logger.bench('Loading store...')
+        with self._logger.span('store.load'):
+            return self._load_store()
 
+    def _load_store(self) -> LocalStore:
         local_store_props = None
         for store_file_path in (FILE_update_all_storage, FILE_update_all_zipped_storage):
             if self._file_system.is_file(store_file_path):
@@ -0,0 +1,422 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""Documents for the log viewer that only decode, strip and wrap the lines being looked at."""
+
+import bisect
+import os
+import re
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from update_all.logger import apply_overscan_preserving_newlines
+
+LOG_INDEX_EXTENSION: str = '.idx'
+LOG_INDEX_MAGIC: bytes = b'UALIDX1\n'
+LOG_INDEX_CHUNK_SIZE: int = 1024 * 1024
+# lines are decoded in aligned blocks of this size, so scrolling reads ahead in both directions
+LOG_DOCUMENT_READ_AHEAD: int = 64
+LOG_DOCUMENT_CACHED_LINES: int = 1024
+# lines scanned per search step, small enough to keep the viewer loop responsive on the MiSTer ARM CPU
+SEARCH_CHUNK_LINES: int = 2000
+
+_ANSI_SGR = re.compile(r'\x1b\[[0-9;]*[mK]')
+_INDEX_HEADER = struct.Struct('<qq')
+
+Position = Tuple[int, int]
+
+
+class ViewerDocument(ABC):
+    @abstractmethod
+    def line_count(self) -> int:
+        """Number of source lines."""
+
+    @abstractmethod
+    def line_rows(self, line: int) -> List[str]:
+        """Screen rows of a source line, already wrapped to the viewer width."""
+
+    @abstractmethod
+    def line_texts(self, first: int, last: int) -> List[str]:
+        """Unwrapped text of the lines in [first, last), meant for scanning without touching the row cache."""
+
+    def refresh(self) -> bool:
+        """Picks up changes in the underlying source and returns whether the document changed."""
+        return False
+
+
+class ListDocument(ViewerDocument):
+    def __init__(self, rows: Sequence[str]):
+        self._rows = rows
+
+    def line_count(self) -> int:
+        return len(self._rows)
+
+    def line_rows(self, line: int) -> List[str]:
+        return [self._rows[line]]
+
+    def line_texts(self, first: int, last: int) -> List[str]:
+        return list(self._rows[first:last])
+
+
+class ConcatDocument(ViewerDocument):
+    def __init__(self, parts: List[ViewerDocument]):
+        self._parts = parts
+        self._starts: List[int] = []
+        total = 0
+        for part in parts:
+            self._starts.append(total)
+            total += part.line_count()
+        self._line_count = total
+
+    def line_count(self) -> int:
+        return self._line_count
+
+    def line_rows(self, line: int) -> List[str]:
+        part_index = bisect.bisect_right(self._starts, line) - 1
+        while self._parts[part_index].line_count() == 0:
+            part_index -= 1
+        return self._parts[part_index].line_rows(line - self._starts[part_index])
+
+    def line_texts(self, first: int, last: int) -> List[str]:
+        texts: List[str] = []
+        for part, start in zip(self._parts, self._starts):
+            part_first = max(first, start) - start
+            part_last = min(last, start + part.line_count()) - start
+            if part_first < part_last:
+                texts.extend(part.line_texts(part_first, part_last))
+        return texts
+
+    def refresh(self) -> bool:
+        changed = False
+        for part in self._parts:
+            changed = part.refresh() or changed
+        if changed:
+            self._starts = []
+            total = 0
+            for part in self._parts:
+                self._starts.append(total)
+                total += part.line_count()
+            self._line_count = total
+        return changed
+
+
+class LogFileDocument(ViewerDocument):
+    def __init__(self, file_path: str, columns: int, cols_overscan: int, save_index: bool = False):
+        self._file_path = file_path
+        self._columns = columns
+        self._cols_overscan = cols_overscan
+        self._offsets = load_line_index(file_path, save_index)
+        self._cache: 'OrderedDict[int, List[str]]' = OrderedDict()
+
+    def line_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def line_rows(self, line: int) -> List[str]:
+        rows = self._cache.get(line)
+        if rows is None:
+            self._load_block(line - line % LOG_DOCUMENT_READ_AHEAD)
+            rows = self._cache[line]
+        else:
+            self._cache.move_to_end(line)
+        return rows
+
+    def line_texts(self, first: int, last: int) -> List[str]:
+        return [_ANSI_SGR.sub('', text) for text in self._read_lines(first, last)]
+
+    def refresh(self) -> bool:
+        """Indexes only the bytes appended since the last refresh. A shrunk log is indexed again from scratch."""
+        try:
+            size = os.stat(self._file_path).st_size
+        except OSError:
+            return False
+        if size == self._offsets[-1]:
+            return False
+
+        if size < self._offsets[-1]:
+            self._offsets = build_line_index(self._file_path)
+            self._cache.clear()
+            return True
+
+        if self.line_count() > 0:
+            # the last line might have been unterminated, and then it keeps growing
+            self._cache.pop(self.line_count() - 1, None)
+        extend_line_index(self._file_path, self._offsets)
+        return True
+
+    def _load_block(self, first_line: int) -> None:
+        last_line = min(first_line + LOG_DOCUMENT_READ_AHEAD, self.line_count())
+        for line, text in enumerate(self._read_lines(first_line, last_line), first_line):
+            self._cache[line] = self._render(text)
+
+        while len(self._cache) > LOG_DOCUMENT_CACHED_LINES:
+            self._cache.popitem(last=False)
+
+    def _read_lines(self, first: int, last: int) -> List[str]:
+        start = self._offsets[first]
+        with open(self._file_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(self._offsets[last] - start)
+        return [data[self._offsets[line] - start:self._offsets[line + 1] - start].decode('utf-8', 'replace') for line in range(first, last)]
+
+    def _render(self, text: str) -> List[str]:
+        return wrap_rows(_ANSI_SGR.sub('', text.replace('\r\n', '\n').replace('\r', '\n')), self._columns, self._cols_overscan)
+
+
+class BlockDocument(ViewerDocument):
+    """Lines produced a block at a time, by render functions whose line counts are known upfront.
+
+    on_complete receives every line once all the blocks have been rendered.
+    """
+
+    def __init__(self, blocks: List[Tuple[int, Callable[[], List[str]]]], columns: int, cols_overscan: int,
+                 on_complete: Optional[Callable[[List[str]], None]] = None):
+        self._blocks = blocks
+        self._columns = columns
+        self._cols_overscan = cols_overscan
+        self._on_complete = on_complete
+        self._starts: List[int] = []
+        total = 0
+        for count, _render in blocks:
+            self._starts.append(total)
+            total += count
+        self._line_count = total
+        self._rendered: Dict[int, List[str]] = {index: [] for index, (count, _render) in enumerate(blocks) if count == 0}
+        self._rows: Dict[int, List[str]] = {}
+
+    def line_count(self) -> int:
+        return self._line_count
+
+    def line_rows(self, line: int) -> List[str]:
+        rows = self._rows.get(line)
+        if rows is None:
+            rows = wrap_rows(self._line(line), self._columns, self._cols_overscan)
+            self._rows[line] = rows
+        return rows
+
+    def line_texts(self, first: int, last: int) -> List[str]:
+        return [self._line(line) for line in range(first, last)]
+
+    def lines(self) -> List[str]:
+        return self.line_texts(0, self._line_count)
+
+    def rows(self) -> List[str]:
+        return [row for line in range(self._line_count) for row in self.line_rows(line)]
+
+    def _line(self, line: int) -> str:
+        index = bisect.bisect_right(self._starts, line) - 1
+        while self._blocks[index][0] == 0:
+            index -= 1
+        lines = self._rendered.get(index)
+        if lines is None:
+            count, render = self._blocks[index]
+            lines = render()
+            if len(lines) != count:
+                raise ValueError(f'Block {index} rendered {len(lines)} lines instead of {count}.')
+            self._rendered[index] = lines
+            if len(self._rendered) == len(self._blocks) and self._on_complete is not None:
+                self._on_complete([line for i in range(len(self._blocks)) for line in self._rendered[i]])
+        return lines[line - self._starts[index]]
+
+
+def wrap_rows(text: str, columns: int, cols_overscan: int) -> List[str]:
+    """Screen rows of a line of text, wrapped like to_overscanned_doc does."""
+    if columns - cols_overscan * 2 <= 0:
+        return [text]
+    return [line + line_end for line, line_end in apply_overscan_preserving_newlines([text], '', columns, cols_overscan, '')]
+
+
+class MatchIndex:
+    """Lines containing a case-insensitive query, built a chunk of lines at a time by calling scan_step."""
+
+    def __init__(self, doc: ViewerDocument, query: str, chunk_lines: int = SEARCH_CHUNK_LINES):
+        self.query = query
+        self.matches: List[int] = []
+        self._doc = doc
+        self._needle = query.lower()
+        self._chunk_lines = chunk_lines
+        self._scanned = 0
+
+    @property
+    def scanned_lines(self) -> int:
+        return self._scanned
+
+    @property
+    def done(self) -> bool:
+        return self._scanned >= self._doc.line_count()
+
+    def scan_step(self) -> bool:
+        """Scans the next chunk of lines and returns whether the whole document has been scanned."""
+        if self.done or self._needle == '':
+            self._scanned = self._doc.line_count()
+            return True
+        first = self._scanned
+        last = min(first + self._chunk_lines, self._doc.line_count())
+        needle = self._needle
+        for line, text in enumerate(self._doc.line_texts(first, last), first):
+            if needle in text.lower():
+                self.matches.append(line)
+        self._scanned = last
+        return self.done
+
+    def rescan_from(self, line: int) -> None:
+        """Forgets what was scanned from line onwards, for documents that changed there."""
+        line = max(0, line)
+        del self.matches[bisect.bisect_left(self.matches, line):]
+        self._scanned = min(self._scanned, line)
+
+    def next_match(self, line: int) -> Optional[int]:
+        """First match after line, None if there is none among the lines scanned so far."""
+        index = bisect.bisect_right(self.matches, line)
+        return self.matches[index] if index < len(self.matches) else None
+
+    def previous_match(self, line: int) -> Optional[int]:
+        index = bisect.bisect_left(self.matches, line)
+        return self.matches[index - 1] if index > 0 else None
+
+    def match_number(self, line: int) -> int:
+        """1-based number of the match at line, or of the last match before it."""
+        return bisect.bisect_right(self.matches, line)
+
+
+def build_line_index(file_path: str) -> array:
+    """Start offset of every line, followed by the offset where the last line ends."""
+    offsets = array('q', [0])
+    extend_line_index(file_path, offsets)
+    return offsets
+
+
+def extend_line_index(file_path: str, offsets: array) -> None:
+    """Updates offsets from build_line_index in place with the lines appended to the file since it was built."""
+    with open(file_path, 'rb') as f:
+        if len(offsets) > 1:
+            f.seek(offsets[-1] - 1)
+            if f.read(1) != b'\n':
+                offsets.pop()
+        position = offsets[-1]
+        f.seek(position)
+        while True:
+            chunk = f.read(LOG_INDEX_CHUNK_SIZE)
+            if not chunk:
+                break
+            newline = chunk.find(b'\n')
+            while newline != -1:
+                offsets.append(position + newline + 1)
+                newline = chunk.find(b'\n', newline + 1)
+            position += len(chunk)
+    if offsets[-1] != position:
+        offsets.append(position)
+
+
+def load_line_index(file_path: str, save_index: bool = False) -> array:
+    """Reads the index saved next to the log when it still matches the log, otherwise builds it."""
+    stat = os.stat(file_path)
+    index_path = file_path + LOG_INDEX_EXTENSION
+    offsets = _read_saved_line_index(index_path, stat.st_size, stat.st_mtime_ns)
+    if offsets is not None:
+        return offsets
+
+    offsets = build_line_index(file_path)
+    if save_index:
+        try:
+            with open(index_path + '.tmp', 'wb') as f:
+                f.write(LOG_INDEX_MAGIC)
+                f.write(_INDEX_HEADER.pack(stat.st_size, stat.st_mtime_ns))
+                offsets.tofile(f)
+            os.replace(index_path + '.tmp', index_path)
+        except OSError:
+            pass
+    return offsets
+
+
+def _read_saved_line_index(index_path: str, size: int, mtime_ns: int) -> Optional[array]:
+    try:
+        with open(index_path, 'rb') as f:
+            if f.read(len(LOG_INDEX_MAGIC)) != LOG_INDEX_MAGIC:
+                return None
+            if _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size)) != (size, mtime_ns):
+                return None
+            data = f.read()
+    except (OSError, struct.error):
+        return None
+
+    offsets = array('q')
+    if len(data) % offsets.itemsize != 0:
+        return None
+    offsets.frombytes(data)
+    if len(offsets) == 0 or offsets[-1] != size:
+        return None
+    return offsets
+
+
+def next_position(doc: ViewerDocument, position: Position) -> Optional[Position]:
+    line, row = position
+    if row + 1 < len(doc.line_rows(line)):
+        return line, row + 1
+    for line in range(line + 1, doc.line_count()):
+        if len(doc.line_rows(line)) > 0:
+            return line, 0
+    return None
+
+
+def previous_position(doc: ViewerDocument, position: Position) -> Optional[Position]:
+    line, row = position
+    if row > 0:
+        return line, row - 1
+    for line in range(line - 1, -1, -1):
+        rows = len(doc.line_rows(line))
+        if rows > 0:
+            return line, rows - 1
+    return None
+
+
+def first_position(doc: ViewerDocument) -> Optional[Position]:
+    for line in range(doc.line_count()):
+        if len(doc.line_rows(line)) > 0:
+            return line, 0
+    return None
+
+
+def last_position(doc: ViewerDocument) -> Optional[Position]:
+    for line in range(doc.line_count() - 1, -1, -1):
+        rows = len(doc.line_rows(line))
+        if rows > 0:
+            return line, rows - 1
+    return None
+
+
+def move_position(doc: ViewerDocument, position: Position, delta: int) -> Position:
+    """Moves delta rows forward (or backwards when negative), stopping at the document edges."""
+    step = next_position if delta > 0 else previous_position
+    for _ in range(abs(delta)):
+        moved = step(doc, position)
+        if moved is None:
+            break
+        position = moved
+    return position
+
+
+def window_rows(doc: ViewerDocument, top: Position, count: int) -> List[str]:
+    rows: List[str] = []
+    position: Optional[Position] = top
+    while position is not None and len(rows) < count:
+        rows.append(doc.line_rows(position[0])[position[1]])
+        position = next_position(doc, position)
+    return rows
@@ -18,16 +18,20 @@
 # https://github.com/theypsilon/Update_All_MiSTer
 
 import os
-from typing import Optional, NamedTuple
+import time
+from typing import Optional, NamedTuple, Union
 
 from update_all.constants import DEFAULT_LOG_VIEWER_THEME
 from update_all.file_system import FileSystem
+from update_all.log_document import ViewerDocument, ListDocument, LogFileDocument, MatchIndex, first_position, last_position, move_position, window_rows
 from update_all.logger import apply_overscan_preserving_newlines
 from update_all.local_store import LocalStore
 from update_all.config import Config
 from update_all.other import GenericProvider, ScreenDims
 from update_all.retroaccount import RetroAccountService
 
+# a stat call every half second is enough to follow a log, and free when it doesn't grow
+LOG_VIEWER_FOLLOW_POLL_INTERVAL: float = 0.5
 
 def clamp(v, lo, hi): return max(lo, min(v, hi))
 def clip_range(start: int, length: int, limit: int) -> tuple[int, int]:
@@ -69,20 +73,10 @@ def to_overscanned_doc(doc: list[str], columns: int, cols_overscan: int) -> list
     return result
 
 
-def create_log_document(file_path: str) -> list[str]:
+def create_log_document(file_path: str, columns: int, cols_overscan: int, save_index: bool = False) -> ViewerDocument:
     if not os.path.exists(file_path):
-        return []
-
-    with open(file_path, 'r') as file:
-        file_content = file.readlines()
-
-    import re
-    ansi_sgr = re.compile(r'\x1b\[[0-9;]*[mK]')
-
-    document = []
-    for line in file_content:
-        document.append(ansi_sgr.sub('', line))
-    return document
+        return ListDocument([])
+    return LogFileDocument(file_path, columns, cols_overscan, save_index=save_index)
 
 
 class LogViewer:
@@ -92,7 +86,8 @@ class LogViewer:
         self._store_provider = store_provider
         self._retroaccount = retroaccount
 
-    def show(self, doc: list[str], popup_dict: Optional[dict[str, str]] = None, initial_index: int = 0) -> bool:
+    def show(self, doc: Union[ViewerDocument, list[str]], popup_dict: Optional[dict[str, str]] = None, initial_index: int = 0, follow: bool = False, bottom_line: Optional[int] = None) -> bool:
+        """The viewer starts initial_index rows above the end, or with bottom_line as the last line of the page when given."""
         config = self._config_provider.get()
         if config.monochrome_ui:
             ui_theme = DEFAULT_LOG_VIEWER_THEME
@@ -103,7 +98,7 @@ class LogViewer:
                 and store.get_use_settings_screen_theme_in_log_viewer()
             )
             ui_theme = store.get_theme() if can_use_custom_theme else DEFAULT_LOG_VIEWER_THEME
-        view_document(doc, popup_dict or {}, initial_index, ui_theme, config)
+        view_document(doc, popup_dict or {}, initial_index, ui_theme, config, follow, bottom_line)
         return True
 
 
@@ -129,8 +124,8 @@ class HudMessage(NamedTuple):
 
 def calculate_hud_message(screen_dims: ScreenDims) -> HudMessage:
     if screen_dims.term_size.cnarrow:
-        return HudMessage('↑↓←→', 'Nav', '·', 'Any key Exit')
-    return HudMessage('←↑↓→', 'Navigate', '·', 'Any other key to EXIT')
+        return HudMessage('↑↓←→', 'Nav', '·', '/ Search · Q Exit')
+    return HudMessage('←↑↓→', 'Navigate', '·', '/ Search · Other key EXIT')
 
 
 def calculate_hud_layout(screen_dims: ScreenDims) -> HudLayout:
@@ -158,12 +153,15 @@ def calculate_hud_layout(screen_dims: ScreenDims) -> HudLayout:
     )
 
 
-def view_document(document: list[str], popup_dict: dict[int, list[str]], initial_index: int, theme: Optional[str], screen_dims: ScreenDims) -> None:
+def view_document(document: Union[ViewerDocument, list[str]], popup_dict: dict[int, list[str]], initial_index: int, theme: Optional[str], screen_dims: ScreenDims, follow: bool = False, bottom_line: Optional[int] = None) -> None:
     import curses
+
+    if not isinstance(document, ViewerDocument):
+        document = ListDocument(document)
     from update_all.colors_curses import init_colors, make_color_theme, colors
 
     class ViewerGui:
-        def __init__(self, window: curses.window, max_cols: int, max_lines: int, document: list[str],
+        def __init__(self, window: curses.window, max_cols: int, max_lines: int, document: ViewerDocument,
                      initial_index: int, hud_layout: HudLayout):
             self.window = window
             self.mcols = max_cols
@@ -173,7 +171,14 @@ def view_document(document: list[str], popup_dict: dict[int, list[str]], initial
             self._hud_layout = hud_layout
             self.frame_start = hud_layout.page_top_y
             self.frame_end = hud_layout.page_rows
-            self.mindex = max(1, len(document) - self.frame_end)
+            self.first_top, self.max_top = self.scroll_limits()
+            self.next_poll = time.monotonic() + LOG_VIEWER_FOLLOW_POLL_INTERVAL
+            self.search: Optional[MatchIndex] = None
+            self.typing_query = False
+            self.query = ''
+            self.search_origin = self.first_top
+            self.pending_jump: Optional[tuple[int, int]] = None
+            self.current_match: Optional[int] = None
 
             self._hud_msg = calculate_hud_message(screen_dims)
             text_area = hud_layout.width - 7
@@ -211,7 +216,7 @@ def view_document(document: list[str], popup_dict: dict[int, list[str]], initial
             self.window.hline(clamp(y, 0, self.mlines - 1), x, attr | curses.color_pair(colors.LOG_VIEWER_TEXT_COLOR),
                               length)
 
-        def draw_hud(self, hud_percent: str, top: bool = True) -> None:
+        def draw_hud(self, hud_percent: str, top: bool = True, status: Optional[str] = None) -> None:
             hl = self._hud_layout
             if top:
                 y_text, y_line = hl.top_text_y, hl.top_line_y
@@ -235,17 +240,22 @@ def view_document(document: list[str], popup_dict: dict[int, list[str]], initial
             hud_text_attr = curses.A_NORMAL | curses.color_pair(colors.LOG_VIEWER_HUD_TEXT_COLOR)
             hud_sym_attr = curses.color_pair(colors.LOG_VIEWER_HUD_SYMBOL_COLOR)
             yt = clamp(y_text, 0, self.mlines - 1)
-            x, length = clip_range(cx, len(hm.nav_symbols), self.mcols - 1)
-            self.window.addstr(yt, x, hm.nav_symbols[:length], hud_sym_attr)
-            cx += len(hm.nav_symbols) + 1
-            x, length = clip_range(cx, len(hm.nav_text), self.mcols - 1)
-            self.window.addstr(yt, x, hm.nav_text[:length], hud_text_attr)
-            cx += len(hm.nav_text) + 1
-            x, length = clip_range(cx, 1, self.mcols - 1)
-            self.window.addstr(yt, x, hm.sep_symbol, hud_sym_attr)
-            cx += 2
-            x, length = clip_range(cx, len(hm.any_key_text), self.mcols - 1)
-            self.window.addstr(yt, x, hm.any_key_text[:length], hud_text_attr)
+            if status is not None:
+                status = status[:max(0, hl.width - 9)]
+                x, length = clip_range(hl.left + 2, len(status), self.mcols - 1)
+                self.window.addstr(yt, x, status[:length], hud_text_attr)
+            else:
+                x, length = clip_range(cx, len(hm.nav_symbols), self.mcols - 1)
+                self.window.addstr(yt, x, hm.nav_symbols[:length], hud_sym_attr)
+                cx += len(hm.nav_symbols) + 1
+                x, length = clip_range(cx, len(hm.nav_text), self.mcols - 1)
+                self.window.addstr(yt, x, hm.nav_text[:length], hud_text_attr)
+                cx += len(hm.nav_text) + 1
+                x, length = clip_range(cx, 1, self.mcols - 1)
+                self.window.addstr(yt, x, hm.sep_symbol, hud_sym_attr)
+                cx += 2
+                x, length = clip_range(cx, len(hm.any_key_text), self.mcols - 1)
+                self.window.addstr(yt, x, hm.any_key_text[:length], hud_text_attr)
             num_part = hud_percent[:-1]
             x, length = clip_range(hl.left + hl.width - 5, 3, self.mcols - 1)
             self.window.addstr(yt, x, '   '[:length], hud_text_attr)
@@ -271,50 +281,150 @@ def view_document(document: list[str], popup_dict: dict[int, list[str]], initial
             x, length = clip_range(hl.left + hl.width - 1, 1, self.mcols)
             self.window.hline(clamp(y_line, 0, self.mlines - 1), x, corner_right | lines_attr, length)
 
+        def scroll_limits(self):
+            first_top = first_position(self.document) or (0, 0)
+            last = last_position(self.document)
+            return first_top, first_top if last is None else max(first_top, move_position(self.document, last, 1 - self.frame_end))
+
+        def poll_document(self, top):
+            """Follows the lines appended to the document. Keeps the view pinned to the bottom if it was there."""
+            old_line_count = self.document.line_count()
+            if not self.document.refresh():
+                return top, False
+
+            at_bottom = top >= self.max_top
+            line_count = self.document.line_count()
+            if self.search is not None:
+                self.search.rescan_from(0 if line_count < old_line_count else old_line_count - 1)
+            self.first_top, self.max_top = self.scroll_limits()
+            if at_bottom or top > self.max_top:
+                top = self.max_top
+            return top, True
+
+        def hud_percent(self, top) -> str:
+            if top >= self.max_top or self.max_top[0] == 0:
+                return '100%'
+            return f'{int(top[0] * 100 / self.max_top[0])}%'
+
+        def search_status(self, top) -> Optional[str]:
+            if self.typing_query:
+                return f'/{self.query}_'
+            if self.search is None:
+                return None
+            scanning = '' if self.search.done else '+'
+            if self.search.done and len(self.search.matches) == 0:
+                return f"'{self.query}' not found"
+            line = top[0] if self.current_match is None else self.current_match
+            return f"'{self.query}' {self.search.match_number(line)}/{len(self.search.matches)}{scanning}"
+
+        def restart_search(self) -> None:
+            self.search = MatchIndex(self.document, self.query) if self.query != '' else None
+            self.pending_jump = (1, self.search_origin[0] - 1) if self.search is not None else None
+            self.current_match = None
+
+        def resolve_pending_jump(self, top):
+            direction, from_line = self.pending_jump
+            if direction > 0:
+                target = self.search.next_match(from_line)
+                settled = target is not None or self.search.done
+            else:
+                target = self.search.previous_match(from_line)
+                settled = self.search.scanned_lines >= from_line or self.search.done
+            if not settled:
+                return top
+            self.pending_jump = None
+            if target is None:
+                return top
+            # matches near the end can't scroll to the top of the page, so the match is tracked apart from top
+            self.current_match = target
+            return min((target, 0), self.max_top)
+
+        def initial_top(self):
+            if bottom_line is None:
+                return move_position(self.document, self.max_top, -self.initial_index)
+            line = clamp(bottom_line, 0, self.document.line_count() - 1)
+            if line < 0 or len(self.document.line_rows(line)) == 0:
+                return self.first_top
+            return min(move_position(self.document, (line, 0), 1 - self.frame_end), self.max_top)
+
         def loop(self):
-            index = self.initial_index
-            last_index = None
+            top = self.initial_top()
+            last_top = None
+            last_status = None
             viewing = True
 
             self.window.bkgd(' ', curses.color_pair(colors.LOG_VIEWER_BACKGROUND_COLOR))
 
             while viewing:
-                if last_index is None or last_index != index:
-                    last_index = index
-
-                    if len(self.document) > self.frame_end:
-                        page = self.document[len(self.document) - index - self.frame_end:len(self.document) - index]
-                    else:
-                        page = self.document
+                if follow and time.monotonic() >= self.next_poll:
+                    self.next_poll = time.monotonic() + LOG_VIEWER_FOLLOW_POLL_INTERVAL
+                    top, changed = self.poll_document(top)
+                    if changed:
+                        last_top = None
+                if self.search is not None and not self.search.done:
+                    self.search.scan_step()
+                if self.pending_jump is not None:
+                    top = self.resolve_pending_jump(top)
+
+                status = self.search_status(top)
+                if last_top is None or last_top != top or last_status != status:
+                    last_top = top
+                    last_status = status
+
+                    page = window_rows(self.document, top, self.frame_end) if self.document.line_count() > 0 else []
 
                     bg = curses.color_pair(colors.LOG_VIEWER_BACKGROUND_COLOR)
                     for i in range(self.frame_end):
                         y = i + self.frame_start
                         self.window.hline(y, 0, ord(' ') | bg, self.mcols)
-                    for i, line in enumerate(page[:self.frame_end]):
+                    for i, line in enumerate(page):
                         y = i + self.frame_start
                         self.addstr_log(y, 0, line)
 
-                    hud_percent = f'{100 - (int(index * 100 / self.mindex))}%'
+                    hud_percent = self.hud_percent(top)
                     self.draw_hud(hud_percent, top=True)
-                    self.draw_hud(hud_percent, top=False)
+                    self.draw_hud(hud_percent, top=False, status=status)
 
                 key = self.window.getch()
-                if key == curses.KEY_UP:
-                    index += 1
+                if self.typing_query:
+                    if key in (curses.KEY_ENTER, 10, 13):
+                        self.typing_query = False
+                    elif key == 27:
+                        self.typing_query = False
+                        self.query = ''
+                        self.restart_search()
+                        top = self.search_origin
+                    elif key in (curses.KEY_BACKSPACE, 127, 8):
+                        self.query = self.query[:-1]
+                        self.restart_search()
+                    elif 32 <= key < 127:
+                        self.query += chr(key)
+                        self.restart_search()
+                elif key == ord('/'):
+                    self.typing_query = True
+                    self.query = ''
+                    self.search_origin = top
+                    self.restart_search()
+                elif key in (ord('n'), ord('N')) and self.search is not None:
+                    from_line = top[0] if self.current_match is None else self.current_match
+                    self.pending_jump = (1 if key == ord('n') else -1, from_line)
+                elif key == curses.KEY_UP:
+                    top = move_position(self.document, top, -1)
+                    self.current_match = None
                 elif key == curses.KEY_DOWN:
-                    index -= 1
+                    top = move_position(self.document, top, 1)
+                    self.current_match = None
                 elif key == curses.KEY_LEFT or key == curses.KEY_PPAGE:
-                    index += self.mlines
+                    top = move_position(self.document, top, -self.mlines)
+                    self.current_match = None
                 elif key == curses.KEY_RIGHT or key == curses.KEY_NPAGE:
-                    index -= self.mlines
+                    top = move_position(self.document, top, self.mlines)
+                    self.current_match = None
                 elif key != -1:
                     viewing = False
 
-                if index < 0:
-                    index = 0
-                elif index > self.mindex:
-                    index = self.mindex
+                if top > self.max_top:
+                    top = self.max_top
 
                 curses.doupdate()
 
@@ -15,11 +15,17 @@
 
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
+import atexit
 import datetime
+import functools
 import os
+import queue
+import re
 import shutil
+import signal
 import tempfile
 import sys
+import threading
 import time
 import traceback
 from abc import ABC, abstractmethod
@@ -27,6 +33,7 @@ from io import TextIOWrapper
 from typing import Optional
 
 from update_all.constants import FILE_update_all_log, FILE_update_all_print_tmp_log
+from update_all.tracing import SpanEvent, trace_file_path, tracer
 
 
 class Logger(ABC):
@@ -42,13 +49,155 @@ class Logger(ABC):
     def debug(self, *args, sep='', end='\n', flush=True):
         """print only to debug target"""
 
-    @abstractmethod
-    def bench(self, label):
-        """print only to debug target"""
+    def span(self, name, **args):
+        """times the enclosed block as a nested span, only recorded when tracing is enabled"""
+        return tracer.span(name, **args)
 
     def finalize(self):
         """to be called at the very end, should not call any method after this one"""
 
+# how often the writer thread checks for flushes requested from signal handlers
+_FLUSH_REQUEST_POLL_INTERVAL: float = 0.1
+
+
+class AsyncLogWriter:
+    """Writes log text into files from a background thread.
+
+    Writes are queued (blocking when the bounded queue is full) and the thread batches them,
+    flushing every file it touched once flush_bytes are pending or flush_interval elapsed.
+    flush() blocks until everything queued before it has been written and flushed.
+    flush_from_signal_handler() does the same without touching the queue, see its docstring.
+    """
+
+    def __init__(self, queue_size: int = 1024, flush_interval: float = 0.5, flush_bytes: int = 64 * 1024):
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._flush_interval = flush_interval
+        self._flush_bytes = flush_bytes
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flushed_on_request = threading.Event()
+
+    def write(self, file, text: str) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put((file, text))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def flush_from_signal_handler(self, timeout: float = 1.0) -> None:
+        """Asks the writer thread to drain the queue and flush, waiting at most timeout for it.
+
+        A signal may interrupt the main thread while it holds the queue mutex inside write(),
+        so this only raises a flag that the writer thread polls instead of queueing anything.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._flushed_on_request.clear()
+        self._flush_requested.set()
+        self._flushed_on_request.wait(timeout)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='AsyncLogWriter', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        dirty_files = {}
+        pending_bytes = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = _FLUSH_REQUEST_POLL_INTERVAL
+            if len(dirty_files) > 0:
+                timeout = max(0.0, min(timeout, self._flush_interval - (time.monotonic() - last_flush)))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            flush_requested = self._flush_requested.is_set()
+            flush_events = []
+            while True:
+                if isinstance(item, tuple):
+                    file, text = item
+                    _write_log_text(file, text)
+                    dirty_files[id(file)] = file
+                    pending_bytes += len(text)
+                elif isinstance(item, threading.Event):
+                    flush_events.append(item)
+
+                if not flush_requested:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if len(flush_events) == 0 and not flush_requested \
+                    and pending_bytes < self._flush_bytes and time.monotonic() - last_flush < self._flush_interval:
+                continue
+
+            for file in dirty_files.values():
+                try:
+                    file.flush()
+                except BaseException:
+                    pass
+            dirty_files.clear()
+            pending_bytes = 0
+            last_flush = time.monotonic()
+
+            for event in flush_events:
+                event.set()
+            if flush_requested:
+                self._flush_requested.clear()
+                self._flushed_on_request.set()
+
+
+def _write_log_text(file, text: str) -> None:
+    try:
+        file.write(text)
+    except UnicodeEncodeError:
+        file.write(text.encode('utf8', 'surrogateescape').decode(getattr(file, 'encoding', None) or 'utf8', 'backslashreplace'))
+    except BaseException as error:
+        print('An unknown exception occurred during logging: %s' % str(error))
+
+
+_log_writer = AsyncLogWriter()
+
+
+def flush_log_writer():
+    _log_writer.flush()
+
+
+def install_log_flush_signal_handlers(signals=None):
+    """Flushes pending log writes before the previous handler of each signal runs. Main thread only."""
+    if signals is None:
+        signals = tuple(signum for signum in (getattr(signal, name, None) for name in ('SIGTERM', 'SIGHUP')) if signum is not None)
+    for signum in signals:
+        previous = signal.getsignal(signum)
+
+        def handler(received, frame, previous=previous):
+            _log_writer.flush_from_signal_handler(timeout=1.0)
+            if callable(previous):
+                previous(received, frame)
+            elif previous != signal.SIG_IGN:
+                signal.signal(received, signal.SIG_DFL)
+                os.kill(os.getpid(), received)
+
+        try:
+            signal.signal(signum, handler)
+        except (ValueError, OSError):
+            pass
+
+
 _print_tmp_log_file: Optional[TextIOWrapper] = None
 def open_print_tmp_log_file():
     if os.path.exists(FILE_update_all_print_tmp_log):
@@ -59,6 +208,7 @@ def open_print_tmp_log_file():
 def close_print_tmp_log_file():
     global _print_tmp_log_file
     if _print_tmp_log_file is not None:
+        _log_writer.flush()
         _print_tmp_log_file.close()
         _print_tmp_log_file = None
 
@@ -75,17 +225,89 @@ def apply_overscan_to_text(args, sep: str, columns: int, overscan: int) -> list[
     return [pad + line for line in lines]
 
 
+# every boundary str.splitlines breaks on, texts without them are a single line
+_LINE_BOUNDARIES = re.compile('[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+_WRAP_CACHE_MAX_TEXT: int = 1024
+
+
+class OverscanWrapper:
+    """Wraps printed text inside the overscan margins, remembering the column of an unterminated line between calls."""
+
+    def __init__(self, columns: int, overscan: int):
+        self.columns = columns
+        self.overscan = overscan
+        self._pad = ' ' * overscan
+        self._usable = columns - overscan * 2
+        self._column = 0
+
+    def wrap(self, text: str, end: str) -> str:
+        if self._column == 0:
+            return self._wrap_from_line_start(text, end)
+        return self._continue_line(text + end)
+
+    def _wrap_from_line_start(self, text: str, end: str) -> str:
+        if text != '' and len(text) <= self._usable and _LINE_BOUNDARIES.search(text) is None:
+            self._column = 0 if end == '\n' else len(text)
+            return self._pad + text + end
+
+        if len(text) <= _WRAP_CACHE_MAX_TEXT:
+            rendered_lines = _cached_wrap_lines(text, end, self.columns, self.overscan)
+        else:
+            rendered_lines = _wrap_lines(text, end, self.columns, self.overscan)
+
+        if len(rendered_lines) == 0:
+            self._column = 0
+            return ''
+
+        line, line_end = rendered_lines[-1]
+        if line_end == '\n':
+            self._column = 0
+        elif self.overscan > 0 and line.startswith(self._pad):
+            self._column = len(line) - self.overscan
+        else:
+            self._column = len(line)
+        return ''.join(line + line_end for line, line_end in rendered_lines)
+
+    def _continue_line(self, text: str) -> str:
+        if text == '':
+            return ''
+
+        if self._column + len(text) < self._usable and '\n' not in text:
+            self._column += len(text)
+            return text
+
+        parts: list[str] = []
+        column = self._column
+        for index, segment in enumerate(text.split('\n')):
+            if index > 0:
+                parts.append('\n')
+                column = 0
+            position = 0
+            while position < len(segment):
+                if column == 0:
+                    parts.append(self._pad)
+                piece = segment[position:position + max(1, self._usable - column)]
+                parts.append(piece)
+                position += len(piece)
+                column += len(piece)
+                if column >= self._usable:
+                    parts.append('\n')
+                    column = 0
+
+        self._column = column
+        return ''.join(parts)
+
+
 def apply_overscan_preserving_newlines(args, sep: str, columns: int, overscan: int, end: str) -> list[tuple[str, str]]:
-    text = sep.join(str(a) for a in args)
-    rendered_lines: list[tuple[str, str]] = []
+    return list(_wrap_lines(sep.join(str(a) for a in args), end, columns, overscan))
 
+
+def _wrap_lines(text: str, end: str, columns: int, overscan: int) -> tuple[tuple[str, str], ...]:
     if text == '':
-        return [(line, end) for line in apply_overscan_to_text([''], '', columns, overscan)]
+        return tuple((line, end) for line in apply_overscan_to_text([''], '', columns, overscan))
 
     chunks = text.splitlines(keepends=True)
-    if len(chunks) == 0:
-        chunks = [text]
-
+    rendered_lines: list[tuple[str, str]] = []
     for chunk_index, chunk in enumerate(chunks):
         has_newline = chunk.endswith('\n')
         chunk_text = chunk[:-1] if has_newline else chunk
@@ -97,64 +319,20 @@ def apply_overscan_preserving_newlines(args, sep: str, columns: int, overscan: i
             line_end = chunk_end if line_index == len(chunk_lines) - 1 else '\n'
             rendered_lines.append((line, line_end))
 
-    return rendered_lines
-
-
-def apply_overscan_continuing_line(args, sep: str, columns: int, overscan: int, current_line: str,
-                                   end: str) -> tuple[list[tuple[str, str]], str]:
-    text = sep.join(str(a) for a in args) + end
-    if text == '':
-        return [], current_line
-
-    pad = ' ' * overscan
-    usable = columns - overscan * 2
-    rendered_lines: list[tuple[str, str]] = []
-    current_chars: list[str] = []
-
-    for char in text:
-        if char == '\n':
-            rendered_lines.append((''.join(current_chars), '\n'))
-            current_chars = []
-            current_line = ''
-            continue
-
-        if current_line == '':
-            current_chars.append(pad)
+    return tuple(rendered_lines)
 
-        current_chars.append(char)
-        current_line += char
-        if len(current_line) >= usable:
-            rendered_lines.append((''.join(current_chars), '\n'))
-            current_chars = []
-            current_line = ''
 
-    if len(current_chars) > 0:
-        rendered_lines.append((''.join(current_chars), ''))
-
-    return rendered_lines, current_line
-
-
-def get_unterminated_overscan_line(rendered_lines: list[tuple[str, str]], overscan: int) -> str:
-    if len(rendered_lines) == 0:
-        return ''
-
-    line, line_end = rendered_lines[-1]
-    if line_end == '\n':
-        return ''
-
-    pad = ' ' * overscan
-    if overscan > 0 and line.startswith(pad):
-        return line[overscan:]
-    return line
+_cached_wrap_lines = functools.lru_cache(maxsize=256)(_wrap_lines)
 
 
 class PrintLogger(Logger):
     def __init__(self):
         self._verbose_mode = False
         self._start_time = None
+        self._printing_spans = False
         self._overscan = 0
         self._columns = 0
-        self._overscan_current_line = ''
+        self._overscan_wrapper: Optional[OverscanWrapper] = None
 
     def set_local_repository(self, local_repository):
         pass
@@ -163,38 +341,39 @@ class PrintLogger(Logger):
         if config.verbose:
             self._verbose_mode = True
             self._start_time = config.start_time
+            tracer.enable()
+            tracer.enable_memory_tracking()
+            if not self._printing_spans:
+                self._printing_spans = True
+                tracer.add_listener(self._print_span)
         self._overscan = config.overscan_dim.cols
         self._columns = config.term_size.columns
-        self._overscan_current_line = ''
+        self._overscan_wrapper = None
         open_print_tmp_log_file()
 
     def print(self, *args, sep='', end='\n', flush=True):
         if self._overscan == 0:
             self._do_print(*args, sep=sep, end=end, file=sys.stdout, flush=flush)
         else:
-            if self._overscan_current_line == '':
-                rendered_lines = apply_overscan_preserving_newlines(args, sep, self._columns, self._overscan, end)
-                self._overscan_current_line = get_unterminated_overscan_line(rendered_lines, self._overscan)
-            else:
-                rendered_lines, self._overscan_current_line = apply_overscan_continuing_line(
-                    args, sep, self._columns, self._overscan, self._overscan_current_line, end
-                )
-
-            for line, line_end in rendered_lines:
-                self._do_print(line, sep='', end=line_end, file=sys.stdout, flush=flush)
+            wrapper = self._overscan_wrapper
+            if wrapper is None or wrapper.columns != self._columns or wrapper.overscan != self._overscan:
+                wrapper = self._overscan_wrapper = OverscanWrapper(self._columns, self._overscan)
+            text = args[0] if len(args) == 1 and type(args[0]) is str else sep.join(str(a) for a in args)
+            self._do_print(wrapper.wrap(text, end), sep='', end='', file=sys.stdout, flush=flush)
         if _print_tmp_log_file is not None:
-            self._do_print(*args, sep=sep, end=end, file=_print_tmp_log_file, flush=flush)
+            _log_writer.write(_print_tmp_log_file, _join_log_args(args, sep, end))
 
     def debug(self, *args, sep='', end='\n', flush=True):
         if self._verbose_mode:
             self._do_print(*_transform_debug_args(args), sep=sep, end=end, file=sys.stdout, flush=flush)
 
-    def bench(self, label):
+    def _print_span(self, event: SpanEvent):
         if self._start_time is not None:
-            self._do_print('%s| %s' % (str(datetime.timedelta(seconds=time.monotonic() - self._start_time))[0:-4], label), sep='', end='\n', file=sys.stdout, flush=True)
+            peak = ' peak %.1fMB' % (event.args['peak_rss_kb'] / 1024) if 'peak_rss_kb' in event.args else ''
+            self._do_print('%s| %s%s %.1fms%s' % (str(datetime.timedelta(seconds=time.monotonic() - self._start_time))[0:-4], '  ' * event.depth, event.name, event.duration * 1000, peak), sep='', end='\n', file=sys.stdout, flush=True)
 
     def finalize(self):
-        pass
+        _log_writer.flush()
 
     @staticmethod
     def _do_print(*args, sep, end, file, flush):
@@ -222,9 +401,6 @@ class TrivialLoggerDecorator(Logger):
     def debug(self, *args, sep='', end='\n', flush=True):
         self._decorated_logger.debug(*args, sep=sep, end=end, flush=flush)
 
-    def bench(self, label):
-        self._decorated_logger.bench(label)
-
     def finalize(self):
         self._decorated_logger.finalize()
 
@@ -236,6 +412,10 @@ class FileLoggerDecorator(TrivialLoggerDecorator):
         self._eager_logfile: Optional[TextIOWrapper] = None
         self._final_logfile_path = initial_logfile_path
         self._append_to_final_logfile = append
+        self._export_trace = False
+
+    def logfile_path(self):
+        return self._final_logfile_path
 
     def set_logfile(self, logfile_path, append=False, eager=False):
         self._final_logfile_path = logfile_path
@@ -248,6 +428,7 @@ class FileLoggerDecorator(TrivialLoggerDecorator):
         if parent:
             os.makedirs(parent, exist_ok=True)
 
+        _log_writer.flush()
         self._logfile.flush()
         self._eager_logfile = open(
             self._final_logfile_path,
@@ -265,6 +446,7 @@ class FileLoggerDecorator(TrivialLoggerDecorator):
             os.path.join(config.base_system_path, FILE_update_all_log),
             append=self._append_to_final_logfile,
         )
+        self._export_trace = config.verbose
         self._decorated_logger.configure(config)
 
     def finalize(self):
@@ -272,6 +454,13 @@ class FileLoggerDecorator(TrivialLoggerDecorator):
         if self._logfile is None:
             return
 
+        _log_writer.flush()
+        if self._export_trace and tracer.enabled:
+            try:
+                tracer.export_chrome_trace(trace_file_path(self._final_logfile_path))
+            except Exception as e:
+                print('Could not export trace: %s' % str(e))
+
         if self._eager_logfile is not None:
             self._eager_logfile.close()
             self._eager_logfile = None
@@ -313,7 +502,7 @@ class FileLoggerDecorator(TrivialLoggerDecorator):
     def _do_print_in_file(self, *args, sep, end, flush):
         logfile = self._eager_logfile if self._eager_logfile is not None else self._logfile
         if logfile is not None:
-            print(*args, sep=sep, end=end, file=logfile, flush=flush)
+            _log_writer.write(logfile, _join_log_args(args, sep, end))
 
 
 class DebugOnlyLoggerDecorator(TrivialLoggerDecorator):
@@ -325,6 +514,10 @@ class DebugOnlyLoggerDecorator(TrivialLoggerDecorator):
         self._decorated_logger.debug(*args, sep=sep, end=end, flush=flush)
 
 
+def _join_log_args(args, sep: Optional[str], end: Optional[str]) -> str:
+    return (' ' if sep is None else sep).join(str(a) for a in args) + ('\n' if end is None else end)
+
+
 def _transform_debug_args(args):
     exception_msgs = []
     rest_args = []
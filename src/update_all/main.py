@@ -31,11 +31,13 @@ from update_all.constants import DEFAULT_CURL_SSL_OPTIONS, \
     KENV_LC_HTTP_PROXY, KENV_LC_HTTPS_PROXY, KENV_HTTPS_PROXY, KENV_MIRROR_ID, KENV_UPDATE_ALL_CHIP_ID_RESULT, \
     KENV_RETROACCOUNT_DOMAIN, DOMAIN_default_retroaccount, MEDIA_FAT, FILE_update_all_log, \
     KENV_UPDATE_ALL_MISTER_DB_URL, KENV_UPDATE_ALL_DOWNLOADER_PATH, KENV_UPDATE_ALL_DOWNLOADER_URL, \
-    KENV_UPDATE_ALL_NON_INTERACTIVE, DEFAULT_UPDATE_ALL_NON_INTERACTIVE, \
-    KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH
+    KENV_UPDATE_ALL_NON_INTERACTIVE, DEFAULT_UPDATE_ALL_NON_INTERACTIVE, KENV_UPDATE_ALL_PROFILE, \
+    DEFAULT_UPDATE_ALL_PROFILE, KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH
 
-from update_all.logger import FileLoggerDecorator, PrintLogger
+from update_all.logger import FileLoggerDecorator, PrintLogger, install_log_flush_signal_handlers
 from update_all.other import GenericProvider
+from update_all.sampling_profiler import profile_file_path, start_sampling_profiler
+from update_all.tracing import tracer
 
 
 def main(env, args=None):
@@ -47,6 +49,9 @@ def main(env, args=None):
         initial_logfile_path(),
         append=len(args) > 1 and args[1] == '--continue',
     )
+    install_log_flush_signal_handlers()
+    tracer.enable()
+    profiler = start_sampling_profiler(env.get(KENV_UPDATE_ALL_PROFILE, DEFAULT_UPDATE_ALL_PROFILE))
     # noinspection PyBroadException
     try:
         exit_code = execute_update_all(logger, local_repository_provider, env, args=args)
@@ -57,6 +62,12 @@ def main(env, args=None):
         logger.print(traceback.format_exc())
         exit_code = 1
     finally:
+        if profiler is not None:
+            profiler.stop()
+            try:
+                profiler.write_collapsed_stacks(profile_file_path(logger.logfile_path()))
+            except OSError as e:
+                logger.debug('Could not write profile: ', e)
         logger.finalize()
 
     return exit_code
@@ -73,6 +84,12 @@ def execute_update_all(logger: FileLoggerDecorator, local_repository_provider, e
     if len(args) > 1 and args[1] == '--chip-id-linker':
         from update_all.chip_id_linker import run_chip_id_linker_command
         return run_chip_id_linker_command(logger, args[2:])
+    if len(args) > 1 and args[1] == '--pocket-snapshots':
+        from update_all.analogue_pocket.pocket_backup import run_pocket_snapshots_command
+        return run_pocket_snapshots_command(logger, args[2:])
+    if len(args) > 1 and args[1] == '--perf-report':
+        from update_all.perf_history import run_perf_report_command
+        return run_perf_report_command(logger, args[2:])
 
     from update_all.update_all_service import UpdateAllServiceFactory, UpdateAllServicePass
     if len(args) > 1 and args[1] == '--continue':
@@ -111,6 +128,7 @@ def read_env(default_commit: str, real_start_time: float) -> EnvDict:
         KENV_UPDATE_ALL_DOWNLOADER_URL: os.getenv(KENV_UPDATE_ALL_DOWNLOADER_URL, ''),
         KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH: os.getenv(KENV_UPDATE_ALL_DOWNLOADER_PYTHON_COMPATIBLE_PATH, ''),
         KENV_UPDATE_ALL_NON_INTERACTIVE: os.getenv(KENV_UPDATE_ALL_NON_INTERACTIVE, DEFAULT_UPDATE_ALL_NON_INTERACTIVE),
+        KENV_UPDATE_ALL_PROFILE: os.getenv(KENV_UPDATE_ALL_PROFILE, DEFAULT_UPDATE_ALL_PROFILE),
         KENV_RETROACCOUNT_DOMAIN: os.getenv(KENV_RETROACCOUNT_DOMAIN, DOMAIN_default_retroaccount),
         'real_start_time': real_start_time
     }
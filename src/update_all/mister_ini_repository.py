@@ -18,7 +18,7 @@
 
 import os
 import re
-from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from update_all.constants import FILE_MiSTer_ini, FILE_MiSTer_ini_update_all_backup
 from update_all.file_system import FileSystem
@@ -34,6 +34,7 @@ class MisterIniRepository:
         self._file_system = file_system
         self._logger = logger
         self._mister_ini_cache: Dict[str, Tuple[bool, str]] = {}
+        self._parsed_mister_ini_cache: Dict[str, Tuple[str, _ParsedMisterIni]] = {}
         self._mister_ini_backup_handled_paths = set()
 
     def _clear_mister_ini_cache(self, path: str = None) -> None:
@@ -114,6 +115,10 @@ class MisterIniRepository:
             path: str = FILE_MiSTer_ini,
             dry_run: bool = False,
     ) -> Tuple[bool, str]:
+        if not self._parsed_mister_ini(path).has_key_in_sections(sections, key, value):
+            exists, contents = self._read_mister_ini(path)
+            return False, contents if exists else ''
+
         return self._change_mister_ini(
             lambda contents: _remove_mister_ini_key_from_sections(
                 contents,
@@ -133,23 +138,22 @@ class MisterIniRepository:
             value: str,
             path: str = FILE_MiSTer_ini,
     ) -> bool:
-        exists, contents = self._read_mister_ini(path)
-        if not exists:
-            return False
-
-        return _mister_ini_has_key_in_sections(
-            contents,
-            sections,
-            key,
-            value,
-        )
+        return self._parsed_mister_ini(path).has_key_in_sections(sections, key, value)
 
     def is_rbf_hide_datecode_enabled(self, path: str = FILE_MiSTer_ini) -> bool:
-        exists, contents = self._read_mister_ini(path)
-        if not exists:
-            return False
+        return self._parsed_mister_ini(path).has_top_level_key('rbf_hide_datecode', '1')
+
+    def _parsed_mister_ini(self, path: str = FILE_MiSTer_ini) -> '_ParsedMisterIni':
+        # Parsed once per contents, so lookups during a session don't split and match every line again.
+        _exists, contents = self._read_mister_ini(path)
+        cache_key = self._cache_key(path)
+        cached = self._parsed_mister_ini_cache.get(cache_key)
+        if cached is not None and cached[0] is contents:
+            return cached[1]
 
-        return _mister_ini_has_top_level_key(contents, 'rbf_hide_datecode', '1')
+        parsed = _ParsedMisterIni(contents)
+        self._parsed_mister_ini_cache[cache_key] = contents, parsed
+        return parsed
 
     def _change_mister_ini(
             self,
@@ -265,6 +269,36 @@ class MisterIniRepository:
             self._logger.debug(e)
 
 
+class _ParsedMisterIni:
+    def __init__(self, contents: str):
+        self._top_level: List[Tuple[str, str]] = []
+        self._sections: Dict[str, List[Tuple[str, str]]] = {}
+        current = self._top_level
+        for line in contents.splitlines(keepends=True):
+            section_name = _mister_ini_section_name(line)
+            if section_name is not None:
+                # Like _find_section_range, only the first section with a given name counts.
+                section_key = section_name.lower()
+                current = [] if section_key in self._sections else self._sections.setdefault(section_key, [])
+                continue
+
+            parsed_key_value = _mister_ini_key_value(line)
+            if parsed_key_value is not None:
+                current.append((_normalized_mister_ini_name(parsed_key_value[0]), _normalized_mister_ini_value(parsed_key_value[1])))
+
+    def has_key_in_sections(self, sections: Sequence[str], key: str, value: Optional[str]) -> bool:
+        return any(self._has_key(self._sections.get(section.lower(), []), key, value) for section in sections)
+
+    def has_top_level_key(self, key: str, value: str) -> bool:
+        return self._has_key(self._top_level, key, value)
+
+    @staticmethod
+    def _has_key(key_values: List[Tuple[str, str]], key: str, value: Optional[str]) -> bool:
+        key = _normalized_mister_ini_name(key)
+        value = None if value is None else _normalized_mister_ini_value(value)
+        return any(parsed_key == key and (value is None or parsed_value == value) for parsed_key, parsed_value in key_values)
+
+
 def _pending_mister_ini_path(path: str) -> str:
     return _hidden_mister_ini_sibling_path(path, '.new')
 
@@ -402,43 +436,6 @@ def _remove_mister_ini_key_from_sections(
     return updated
 
 
-def _mister_ini_has_key_in_sections(contents: str, sections: Sequence[str], key: str, value: str) -> bool:
-    if contents == '':
-        return False
-
-    lines = contents.splitlines(keepends=True)
-    for section in sections:
-        section_range = _find_section_range(lines, section)
-        if section_range is None:
-            continue
-
-        section_start, section_end = section_range
-        if any(
-                _mister_ini_names_equal(parsed_key, key)
-                and _mister_ini_values_equal(parsed_value, value)
-                for _index, parsed_key, parsed_value in _iter_mister_ini_key_values(lines, section_start + 1, section_end)
-        ):
-            return True
-
-    return False
-
-
-def _mister_ini_has_top_level_key(contents: str, key: str, value: str) -> bool:
-    if contents == '':
-        return False
-
-    lines = contents.splitlines(keepends=True)
-    first_section_index = next(
-        (index for index, line in enumerate(lines) if _mister_ini_section_name(line) is not None),
-        len(lines),
-    )
-    return any(
-        _mister_ini_names_equal(parsed_key, key)
-        and _mister_ini_values_equal(parsed_value, value)
-        for _index, parsed_key, parsed_value in _iter_mister_ini_key_values(lines, 0, first_section_index)
-    )
-
-
 def _add_mister_ini_section(contents: str, section: str, key_line: str, prepend: bool) -> str:
     block = f'[{section}]\n{key_line}'
     if contents == '':
@@ -498,7 +495,11 @@ def _iter_mister_ini_key_values(lines, start: int, end: int):
 
 
 def _mister_ini_names_equal(a: str, b: str) -> bool:
-    return a.strip().lower() == b.strip().lower()
+    return _normalized_mister_ini_name(a) == _normalized_mister_ini_name(b)
+
+
+def _normalized_mister_ini_name(name: str) -> str:
+    return name.strip().lower()
 
 
 def _mister_ini_section_names_equal(a: str, b: str) -> bool:
@@ -506,7 +507,11 @@ def _mister_ini_section_names_equal(a: str, b: str) -> bool:
 
 
 def _mister_ini_values_equal(a: str, b: str) -> bool:
-    return re.sub(r'\s+', '', a).lower() == re.sub(r'\s+', '', b).lower()
+    return _normalized_mister_ini_value(a) == _normalized_mister_ini_value(b)
+
+
+def _normalized_mister_ini_value(value: str) -> str:
+    return re.sub(r'\s+', '', value).lower()
 
 
 def _line_body(line: str) -> str:
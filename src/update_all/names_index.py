@@ -0,0 +1,158 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+from update_all.file_system import FileSystem
+
+NAMES_INDEX_CACHE_VERSION: int = 1
+
+Signature = Tuple[int, Union[int, float]]
+
+
+class NamesIndex:
+    """Parses names.txt style 'key: value' files once per size and mtime, and shares the result between its users.
+
+    With a file_system, files are accessed through it. Otherwise paths must be real paths.
+    The returned dicts are shared, so they must not be modified.
+    """
+
+    def __init__(self, file_system: Optional[FileSystem] = None):
+        self._files = _OsNamesFiles() if file_system is None else _FileSystemNamesFiles(file_system)
+        self._lock = threading.Lock()
+        self._names: Dict[str, Tuple[Signature, Dict[str, str]]] = {}
+        self._upper_names: Dict[str, Tuple[Signature, Dict[str, str]]] = {}
+
+    def names(self, path: str, cache_path: Optional[str] = None) -> Dict[str, str]:
+        """Case-sensitive lookup. When cache_path is given, the parsed names are serialized there for later runs."""
+        signature = self._files.signature(path)
+        if signature is None:
+            return {}
+        with self._lock:
+            cached = self._names.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            names = self._read_cache(cache_path, path, signature) if cache_path is not None else None
+            if names is None:
+                names = self._files.parse(path)
+                if cache_path is not None:
+                    self._files.write_cache(cache_path, {'version': NAMES_INDEX_CACHE_VERSION, 'path': path, 'signature': list(signature), 'names': names})
+            self._names[path] = (signature, names)
+            return names
+
+    def upper_names(self, path: str, cache_path: Optional[str] = None) -> Dict[str, str]:
+        """Same names with upper-cased keys, for case-insensitive lookups."""
+        names = self.names(path, cache_path)
+        signature = self._files.signature(path)
+        with self._lock:
+            cached = self._upper_names.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            upper_names = {key.upper(): value for key, value in names.items()}
+            self._upper_names[path] = (signature, upper_names)
+            return upper_names
+
+    def _read_cache(self, cache_path: str, path: str, signature: Signature) -> Optional[Dict[str, str]]:
+        cache = self._files.read_cache(cache_path)
+        if not isinstance(cache, dict) or cache.get('version') != NAMES_INDEX_CACHE_VERSION \
+                or cache.get('path') != path or cache.get('signature') != list(signature):
+            return None
+        names = cache.get('names')
+        return names if isinstance(names, dict) else None
+
+
+def parse_names_txt(path: str) -> Dict[str, str]:
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse_names_lines(f)
+
+
+def parse_names_lines(lines) -> Dict[str, str]:
+    names: Dict[str, str] = {}
+    for line in lines:
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        key = key.strip()
+        value = value.strip()
+        if key and value:
+            names[key] = value
+    return names
+
+
+class _OsNamesFiles:
+    def signature(self, path: str) -> Optional[Signature]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def parse(self, path: str) -> Dict[str, str]:
+        return parse_names_txt(path)
+
+    def read_cache(self, cache_path: str) -> Any:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_cache(self, cache_path: str, cache: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+
+class _FileSystemNamesFiles:
+    def __init__(self, file_system: FileSystem):
+        self._file_system = file_system
+
+    def signature(self, path: str) -> Optional[Signature]:
+        try:
+            if not self._file_system.is_file(path):
+                return None
+            return self._file_system.file_size(path), self._file_system.file_mtime(path)
+        except OSError:
+            return None
+
+    def parse(self, path: str) -> Dict[str, str]:
+        return parse_names_lines(self._file_system.read_file_contents(path).splitlines())
+
+    def read_cache(self, cache_path: str) -> Any:
+        try:
+            if not self._file_system.is_file(cache_path):
+                return None
+            return self._file_system.load_dict_from_file(cache_path, '.json')
+        except (OSError, ValueError):
+            return None
+
+    def write_cache(self, cache_path: str, cache: Dict[str, Any]) -> None:
+        try:
+            self._file_system.make_dirs_parent(cache_path)
+            self._file_system.save_json(cache, cache_path)
+        except OSError:
+            pass
@@ -0,0 +1,46 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from update_all.ui_engine import UiContext
+
+
+class NeedsSaveTracker:
+    """Keeps the needs-save reasons of every file check, with the UI revision and the saved state they were computed from.
+
+    A check only runs again when one of its UI variables changed since then, or when its
+    saved state (baseline) is different. Anything else that rewrites the files on disk must
+    call invalidate().
+    """
+
+    def __init__(self):
+        self._checks: Dict[str, Tuple[int, Any, List[str]]] = {}
+
+    def reasons(self, ui: UiContext, check: str, variables: Iterable[str], baseline: Any, compute: Callable[[], Iterable[str]]) -> List[str]:
+        cached = self._checks.get(check)
+        if cached is not None and cached[1] == baseline and not ui.changed_since(cached[0], variables):
+            return cached[2]
+
+        revision = ui.revision()
+        reasons = list(compute())
+        self._checks[check] = (revision, baseline, reasons)
+        return reasons
+
+    def invalidate(self) -> None:
+        self._checks.clear()
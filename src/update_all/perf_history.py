@@ -0,0 +1,177 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""Bounded per-run performance history and the regression checks built on top of it."""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from update_all.constants import FILE_update_all_perf_history, MEDIA_FAT
+from update_all.tracing import SpanEvent
+
+try:
+    import resource
+except ImportError:
+    resource = None  # type: ignore[assignment]
+
+PERF_HISTORY_VERSION: int = 1
+PERF_HISTORY_MAX_RUNS: int = 30
+# fewer previous runs than this make the median too noisy to flag anything
+PERF_REGRESSION_MIN_RUNS: int = 3
+PERF_REGRESSION_RATIO: float = 1.5
+PERF_REGRESSION_MIN_SECONDS: float = 2.0
+# phases that wait on the user, they are recorded but never flagged
+PERF_INTERACTIVE_PHASES: frozenset = frozenset({'countdown', 'settings_screen', 'log_viewer_and_timeline'})
+PERF_PHASE_PREFIX: str = 'update_all.'
+PERF_TOTAL: str = 'total'
+
+
+class PerfRegression(NamedTuple):
+    phase: str
+    seconds: float
+    median: float
+
+
+def peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def make_perf_record(events: List[SpanEvent], counters: Dict[str, int], total_seconds: float, peak_rss: int, commit: str, timestamp: Optional[float] = None) -> Dict[str, Any]:
+    phases: Dict[str, float] = {}
+    phase_peaks: Dict[str, int] = {}
+    mras = 0
+    for event in events:
+        if event.name == 'arcade_organizer.organize':
+            mras += int(event.args.get('mras', 0))
+        if not event.name.startswith(PERF_PHASE_PREFIX) or event.name == PERF_PHASE_PREFIX + 'full_run':
+            continue
+        phase = event.name[len(PERF_PHASE_PREFIX):]
+        phases[phase] = phases.get(phase, 0.0) + event.duration
+        if 'peak_rss_kb' in event.args:
+            phase_peaks[phase] = max(phase_peaks.get(phase, 0), event.args['peak_rss_kb'])
+
+    record = {
+        'timestamp': int(time.time() if timestamp is None else timestamp),
+        'commit': commit,
+        PERF_TOTAL: round(total_seconds, 3),
+        'phases': {phase: round(seconds, 3) for phase, seconds in phases.items()},
+        # only Update All's own fetches, the Downloader subprocess doesn't report its traffic
+        'update_all_http_requests': counters.get('update_all_http_requests', 0),
+        'update_all_http_bytes': counters.get('update_all_http_bytes', 0),
+        'mras': mras,
+        'peak_rss_kb': peak_rss,
+    }
+    if len(phase_peaks) > 0:
+        record['phase_peak_rss_kb'] = phase_peaks
+    return record
+
+
+def perf_history_runs(history: Any) -> List[Dict[str, Any]]:
+    if not isinstance(history, dict) or history.get('version') != PERF_HISTORY_VERSION or not isinstance(history.get('runs'), list):
+        return []
+    return history['runs']
+
+
+def append_perf_record(runs: List[Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Any]:
+    return {'version': PERF_HISTORY_VERSION, 'runs': (runs + [record])[-PERF_HISTORY_MAX_RUNS:]}
+
+
+def phase_seconds(record: Dict[str, Any], phase: str) -> Optional[float]:
+    if phase == PERF_TOTAL:
+        return record.get(PERF_TOTAL)
+    return record.get('phases', {}).get(phase)
+
+
+def find_regressions(runs: List[Dict[str, Any]], record: Dict[str, Any]) -> List[PerfRegression]:
+    """Phases of record that are markedly slower than their median over the previous runs."""
+    regressions = []
+    for phase in [PERF_TOTAL] + sorted(record.get('phases', {})):
+        if phase in PERF_INTERACTIVE_PHASES:
+            continue
+        previous = [seconds for seconds in (phase_seconds(run, phase) for run in runs) if seconds is not None]
+        if len(previous) < PERF_REGRESSION_MIN_RUNS:
+            continue
+        seconds = phase_seconds(record, phase)
+        median = statistics.median(previous)
+        if seconds > median * PERF_REGRESSION_RATIO and seconds - median > PERF_REGRESSION_MIN_SECONDS:
+            regressions.append(PerfRegression(phase, seconds, median))
+    return regressions
+
+
+def format_regressions(regressions: List[PerfRegression]) -> str:
+    return 'Slower than usual: ' + ', '.join('%s %.1fs (usually %.1fs)' % (r.phase, r.seconds, r.median) for r in regressions)
+
+
+def format_perf_report(runs: List[Dict[str, Any]]) -> List[str]:
+    if len(runs) == 0:
+        return ['No performance history yet.']
+
+    latest, previous = runs[-1], runs[:-1]
+    lines = [
+        'Performance of the latest run (%s) against the %d previous runs:' % (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(latest['timestamp'])), len(previous)),
+        '',
+        '%-28s %10s %10s %10s %10s' % ('PHASE', 'LATEST', 'MEDIAN', 'MAX', 'PEAK RSS'),
+    ]
+    flagged = {regression.phase for regression in find_regressions(previous, latest)}
+    phases = [PERF_TOTAL] + sorted({phase for run in runs for phase in run.get('phases', {})})
+    phase_peaks = latest.get('phase_peak_rss_kb', {})
+    for phase in phases:
+        seconds = phase_seconds(latest, phase)
+        previous_seconds = [s for s in (phase_seconds(run, phase) for run in previous) if s is not None]
+        lines.append('%-28s %10s %10s %10s %10s%s' % (
+            phase,
+            _format_seconds(seconds),
+            _format_seconds(statistics.median(previous_seconds) if previous_seconds else None),
+            _format_seconds(max(previous_seconds) if previous_seconds else None),
+            '%.1fMB' % (phase_peaks[phase] / 1024) if phase in phase_peaks else '-',
+            '  SLOWER' if phase in flagged else '',
+        ))
+    lines.append('')
+    lines.append('Update All HTTP requests: %d, Update All HTTP bytes: %d, MRAs organized: %d, peak RSS: %d KB' % (
+        latest.get('update_all_http_requests', 0), latest.get('update_all_http_bytes', 0), latest.get('mras', 0), latest.get('peak_rss_kb', 0)
+    ))
+    return lines
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else '%.1fs' % seconds
+
+
+def run_perf_report_command(logger, argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='update_all --perf-report', description='Compares the latest Update All run against the previous ones.')
+    parser.add_argument('--history', default=os.path.join(MEDIA_FAT, FILE_update_all_perf_history), help='Path to the performance history file.')
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.history, 'r') as f:
+            runs = perf_history_runs(json.load(f))
+    except FileNotFoundError:
+        runs = []
+    except (OSError, ValueError) as e:
+        logger.print('Could not read %s: %s' % (args.history, e))
+        return 1
+
+    for line in format_perf_report(runs):
+        logger.print(line)
+    return 0
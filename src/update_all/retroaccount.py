@@ -259,17 +259,16 @@ class RetroAccountService(RetroAccountClient):
 
     def mister_sync(self, output: UpdateOutput) -> None:
         output.sync_started()
-        self._logger.bench('RetroAccountService.mister_sync start')
         self._reset_sync_effects()
         try:
-            transition = self._build_mister_sync_transition()
-            if transition is not None:
-                self._apply_sync_transition(transition, output)
+            with self._logger.span('retroaccount.mister_sync'):
+                transition = self._build_mister_sync_transition()
+                if transition is not None:
+                    self._apply_sync_transition(transition, output)
         except Exception as e:
             self._logger.debug('RetroAccountService.mister_sync failed:')
             self._logger.debug(e)
         finally:
-            self._logger.bench('RetroAccountService.mister_sync end')
             output.sync_finished()
 
     def _build_mister_sync_transition(self) -> Optional[_SyncTransition]:
@@ -322,9 +321,8 @@ class RetroAccountService(RetroAccountClient):
                 self._logger.debug(f"RetroAccountService: jtbeta.zip could not be hashed")
                 self._logger.debug(e)
 
-        self._logger.bench('RetroAccountService Gateway mister_sync start')
-        result, response = self._retroaccount_gateway.mister_sync(device_id, refresh_token, patreon_key_fingerprint, jtbeta_fingerprint)
-        self._logger.bench('RetroAccountService Gateway mister_sync end')
+        with self._logger.span('retroaccount.gateway_mister_sync'):
+            result, response = self._retroaccount_gateway.mister_sync(device_id, refresh_token, patreon_key_fingerprint, jtbeta_fingerprint)
 
         if result == SessionResult.VALID and isinstance(response, dict):
             new_user_json = response.get('tokens', None)
@@ -414,21 +412,18 @@ class RetroAccountService(RetroAccountClient):
             self._unlink_update_all_patreon_key()
 
         if transition.install_update_all_patreon_key_file:
-            self._logger.bench('RetroAccountService: Installing Update All Patreon Key START')
-            self._install_update_all_patreon_key(transition.install_update_all_patreon_key_file)
-            self._logger.bench('RetroAccountService: Installing Update All Patreon Key END')
+            with self._logger.span('retroaccount.install_patreon_key'):
+                self._install_update_all_patreon_key(transition.install_update_all_patreon_key_file)
 
         if transition.install_jtbeta_file:
-            self._logger.bench('RetroAccountService: Installing JTBeta START')
-            self._install_jtbeta(transition.install_jtbeta_file)
+            with self._logger.span('retroaccount.install_jtbeta'):
+                self._install_jtbeta(transition.install_jtbeta_file)
             if self._has_installed_jtbeta:
                 output.jtbeta_updated()
-            self._logger.bench('RetroAccountService: Installing JTBeta END')
 
         if transition.install_jt_mra_pack:
-            self._logger.bench('RetroAccountService: Installing JT MRA PACK START')
-            self._install_jt_mra_pack(transition.install_jt_mra_pack)
-            self._logger.bench('RetroAccountService: Installing JT MRA PACK END')
+            with self._logger.span('retroaccount.install_jt_mra_pack'):
+                self._install_jt_mra_pack(transition.install_jt_mra_pack)
 
         if transition.credentials_were_corrupted:
             self._report_forced_logout('Your credentials are corrupted!\nDo you have any problems with your storage (SD)?')
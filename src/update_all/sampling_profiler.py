@@ -0,0 +1,123 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+"""Signal driven stack sampler that aggregates whole runs into collapsed stacks for flame graphs."""
+
+import os
+import signal
+import sys
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_INTERVAL: float = 0.01
+PROFILE_MAX_DEPTH: int = 128
+
+# 'cpu' samples process CPU time (SIGPROF), 'wall' samples wall clock time (SIGALRM)
+_PROFILE_TIMERS: Dict[str, Tuple[int, int]] = {
+    'cpu': (signal.ITIMER_PROF, signal.SIGPROF),
+    'wall': (signal.ITIMER_REAL, signal.SIGALRM),
+} if hasattr(signal, 'setitimer') else {}
+
+
+class SamplingProfiler:
+    def __init__(self, mode: str = 'cpu', interval: float = PROFILE_INTERVAL):
+        if mode not in _PROFILE_TIMERS:
+            raise ValueError('Unsupported profiler mode: %s' % mode)
+        self._timer, self._signal = _PROFILE_TIMERS[mode]
+        self._interval = interval
+        self._samples: Counter = Counter()
+        self._frame_labels: Dict[object, str] = {}
+        self._previous_handler = None
+        self._running = False
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._previous_handler = signal.signal(self._signal, self._sample)
+        # restart interrupted system calls instead of surfacing EINTR to curses and sockets
+        signal.siginterrupt(self._signal, False)
+        signal.setitimer(self._timer, self._interval, self._interval)
+        self._running = True
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        signal.setitimer(self._timer, 0, 0)
+        signal.signal(self._signal, self._previous_handler if self._previous_handler is not None else signal.SIG_DFL)
+        self._running = False
+
+    def sample_count(self) -> int:
+        return sum(self._samples.values())
+
+    def collapsed_stacks(self) -> List[str]:
+        return ['%s %d' % (stack, count) for stack, count in sorted(self._samples.items())]
+
+    def write_collapsed_stacks(self, path: str) -> None:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(path, 'w') as f:
+            for line in self.collapsed_stacks():
+                f.write(line)
+                f.write('\n')
+
+    def _sample(self, _signum, frame) -> None:
+        # the handler runs on the main thread, so its interrupted frame stands in for the main thread's own
+        main_thread_id = threading.main_thread().ident
+        for thread_id, thread_frame in sys._current_frames().items():
+            if thread_id == main_thread_id:
+                self._samples[self._collapse(frame)] += 1
+            else:
+                self._samples['thread;' + self._collapse(thread_frame)] += 1
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+            code = frame.f_code
+            label = self._frame_labels.get(code)
+            if label is None:
+                label = '%s (%s:%d)' % (code.co_name, _short_path(code.co_filename), code.co_firstlineno)
+                self._frame_labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ';'.join(labels)
+
+
+def _short_path(path: str) -> str:
+    parent, name = os.path.split(path)
+    return os.path.basename(parent) + '/' + name
+
+
+def start_sampling_profiler(mode: str) -> Optional[SamplingProfiler]:
+    """Starts a profiler for the given UPDATE_ALL_PROFILE value, or returns None when profiling is off or unsupported."""
+    mode = mode.strip().lower()
+    if mode in ('', '0', 'false', 'no', 'off'):
+        return None
+    if mode in ('1', 'true', 'yes', 'on'):
+        mode = 'cpu'
+    if mode not in _PROFILE_TIMERS:
+        return None
+    profiler = SamplingProfiler(mode)
+    profiler.start()
+    return profiler
+
+
+def profile_file_path(logfile_path: str) -> str:
+    return os.path.splitext(logfile_path)[0] + '.profile.folded'
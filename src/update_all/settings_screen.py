@@ -53,17 +53,18 @@ from update_all.mister_ini_edits import (
     would_change,
 )
 from update_all.mister_video_mode_service import MisterVideoModeService
+from update_all.needs_save_tracker import NeedsSaveTracker
 from update_all.mister_video_mode_ui import MisterVideoModeMenu, MisterVideoAdjustMenu
 from update_all.os_utils import OsUtils
 from update_all.retroaccount import RetroAccountService, BenefitState
 from update_all.retroachievements_service import RetroAchievementsService
 from update_all.update_output import NoopUpdateOutput
 from update_all.zaparoo_service import ZaparooService
-from update_all.settings_screen_model import settings_screen_model
+from update_all.settings_screen_model_index import settings_screen_model_index
 from update_all.settings_screen_printer import SettingsScreenPrinter
 from update_all.ui_engine import UiContext, UiApplication, UiSectionFactory, execute_ui_engine, UiRuntime
 from update_all.ui_engine_dialog_application import DialogSectionFactory
-from update_all.ui_model_utilities import gather_variable_declarations, dynamic_convert_string, gather_effects_by_type
+from update_all.ui_model_utilities import dynamic_convert_string
 from update_all.uninstall_db_service import UninstallDbService
 from update_all.uninstall_db_ui import UninstallDbMenu
 
@@ -120,6 +121,7 @@ class SettingsScreen(UiApplication):
         self._mister_ini_adds = {}
         self._mister_ini_add_hooks = {}
         self._mister_ini_del_hooks = {}
+        self._needs_save_tracker = NeedsSaveTracker()
 
     def load_main_menu(self) -> None:
         if self._retroaccount.get_login_state():
@@ -136,9 +138,11 @@ class SettingsScreen(UiApplication):
 
     def _load_menu_entry(self, menu_entry, initial_history: Optional[List[str]] = None) -> None:
         def loader():
-            model = settings_screen_model()
+            with self._logger.span('settings_screen.model'):
+                model_index = settings_screen_model_index()
+                model = model_index.new_model()
             try:
-                execute_ui_engine(menu_entry, model, self, self._ui_runtime, initial_history=initial_history)
+                execute_ui_engine(menu_entry, model, self, self._ui_runtime, initial_history=initial_history, model_index=model_index)
             except Exception:
                 self._mister_video_mode_service.restore_mode_before_unsaved_keeps()
                 raise
@@ -158,13 +162,14 @@ class SettingsScreen(UiApplication):
         ui.set_value('needs_save', 'false')
 
         self._pending_mister_ini_edits = {}
+        self._needs_save_tracker = NeedsSaveTracker()
         # mister_ini_add declarations bound to database variables apply whenever the
         # db stays toggled in at save time, whether or not they were fired this
         # session. Everything else (zaparoo frontend add, all mister_ini_del) only
         # applies when fired.
         db_variables = set(db_ids_by_model_variables())
         self._mister_ini_adds = {}
-        for effect in gather_effects_by_type(settings_screen_model(), 'mister_ini_add'):
+        for effect in settings_screen_model_index().effects_by_type('mister_ini_add'):
             spec = parse_mister_ini_add(effect)
             if spec.variable in db_variables:
                 self._mister_ini_adds[spec.variable] = spec
@@ -180,7 +185,7 @@ class SettingsScreen(UiApplication):
 
         arcade_organizer_ini = self._ini_repository.get_arcade_organizer_ini()
 
-        for variable, description in gather_variable_declarations(settings_screen_model(), "ao_ini").items():
+        for variable, description in settings_screen_model_index().variable_declarations("ao_ini").items():
             value = arcade_organizer_ini.get_string(description['name'], description['default'])
             for possible_value in description['values']:
                 if possible_value.lower() == value.lower():
@@ -197,10 +202,10 @@ class SettingsScreen(UiApplication):
                     value = str(value).lower()
                 ui.set_value(variable, value)
 
-        for variable in gather_variable_declarations(settings_screen_model(), "db"):
+        for variable in settings_screen_model_index().variable_declarations("db"):
             ui.set_value(variable, 'true' if db_ids[variable] in config.databases else 'false')
 
-        for variable in gather_variable_declarations(settings_screen_model(), "separate_db"):
+        for variable in settings_screen_model_index().variable_declarations("separate_db"):
             ui.set_value(variable, 'true' if db_ids[variable] in config.databases else 'false')
 
         installed_db_ids = self._read_installed_db_ids()
@@ -843,41 +848,43 @@ class SettingsScreen(UiApplication):
         ui.set_value('firmware_needs_reboot', 'true' if self._original_firmware != firmware_md5 else 'false')
 
     def calculate_needs_save(self, ui: UiContext) -> None:
-        needs_save_file_set = set()
-
         current_config = self._config_provider.get()
-        self._ini_repository.refresh_database_sources(current_config)
-
-        temp_config = Config()
-        self._copy_temp_save_to_config(ui, temp_config)
-        if self._ini_repository.does_downloader_ini_need_save(temp_config):
-            needs_save_file_set.add("downloader.ini")
-
-        db_ids = db_ids_by_model_variables()
-        for variable in gather_variable_declarations(settings_screen_model(), "separate_db"):
-            db_id = db_ids[variable]
-            was_active = db_id in current_config.databases
-            is_active = ui.get_value(variable) == 'true'
-            if was_active != is_active:
-                ini_filename = SEPARATE_DB_INI_FILES.get(db_id.lower())
-                if ini_filename is not None:
-                    needs_save_file_set.add(ini_filename)
-
-        now_active = {db_id.lower() for db_id in temp_config.databases}
-        for db_id in {db_id.lower() for db_id in current_config.databases} - now_active:
-            for extra_file in current_config.database_sources.get(db_id, []):
-                needs_save_file_set.add(extra_file)
-
-        arcade_roms_db_id = ALL_DB_IDS['ARCADE_ROMS']
-        if arcade_roms_db_id in current_config.databases and ui.get_value('arcade_roms_db_downloader') == 'true':
-            if current_config.hbmame_filter != (ui.get_value('hbmame_filter') == 'true'):
-                needs_save_file_set.add(SEPARATE_DB_INI_FILES[arcade_roms_db_id.lower()])
-
-        if self._does_arcade_oganizer_need_save(ui):
-            needs_save_file_set.add("update_arcade-organizer.ini")
+        temp_config = None
+
+        def edited_config() -> Config:
+            nonlocal temp_config
+            if temp_config is None:
+                temp_config = Config()
+                self._copy_temp_save_to_config(ui, temp_config)
+            return temp_config
+
+        # Checks against files on disk are only computed again when the variables they read change.
+        databases = frozenset(current_config.databases)
+        tracker = self._needs_save_tracker
+        needs_save_file_set = set()
+        needs_save_file_set.update(tracker.reasons(
+            ui, 'downloader_ini', self._needs_save_config_variables, None,
+            lambda: ['downloader.ini'] if self._ini_repository.does_downloader_ini_need_save(edited_config()) else []
+        ))
+        needs_save_file_set.update(tracker.reasons(
+            ui, 'separate_db_ini', settings_screen_model_index().variable_declarations('separate_db'), databases,
+            lambda: self._separate_db_ini_needs_save_reasons(ui, current_config)
+        ))
+        needs_save_file_set.update(tracker.reasons(
+            ui, 'extra_db_ini', self._needs_save_config_variables, databases,
+            lambda: self._extra_db_ini_needs_save_reasons(current_config, edited_config())
+        ))
+        needs_save_file_set.update(tracker.reasons(
+            ui, 'arcade_roms_filter', ['arcade_roms_db_downloader', 'hbmame_filter'], (databases, current_config.hbmame_filter),
+            lambda: self._arcade_roms_filter_needs_save_reasons(ui, current_config)
+        ))
+        needs_save_file_set.update(tracker.reasons(
+            ui, 'arcade_organizer_ini', settings_screen_model_index().variable_declarations('ao_ini'), self._ini_repository.get_arcade_organizer_ini(),
+            lambda: ['update_arcade-organizer.ini'] if self._does_arcade_oganizer_need_save(ui) else []
+        ))
 
         temp_store = self._store_provider.get().clone()
-        self._fill_store(temp_store, ui, temp_config)
+        self._fill_store(temp_store, ui, edited_config())
 
         if temp_store.needs_save():
             needs_save_file_set.add(f"Internals ({', '.join(temp_store.changed_fields())})")
@@ -904,13 +911,44 @@ class SettingsScreen(UiApplication):
         ui.set_value('needs_save', str(len(needs_save_file_set) > 0).lower())
         ui.set_value('needs_save_file_list', needs_save_file_list)
 
+    def _separate_db_ini_needs_save_reasons(self, ui: UiContext, current_config: Config) -> List[str]:
+        reasons = []
+        db_ids = db_ids_by_model_variables()
+        for variable in settings_screen_model_index().variable_declarations("separate_db"):
+            db_id = db_ids[variable]
+            was_active = db_id in current_config.databases
+            is_active = ui.get_value(variable) == 'true'
+            if was_active != is_active:
+                ini_filename = SEPARATE_DB_INI_FILES.get(db_id.lower())
+                if ini_filename is not None:
+                    reasons.append(ini_filename)
+        return reasons
+
+    def _extra_db_ini_needs_save_reasons(self, current_config: Config, temp_config: Config) -> List[str]:
+        self._ini_repository.refresh_database_sources(current_config)
+
+        reasons = []
+        now_active = {db_id.lower() for db_id in temp_config.databases}
+        for db_id in {db_id.lower() for db_id in current_config.databases} - now_active:
+            reasons.extend(current_config.database_sources.get(db_id, []))
+        return reasons
+
+    @staticmethod
+    def _arcade_roms_filter_needs_save_reasons(ui: UiContext, current_config: Config) -> List[str]:
+        arcade_roms_db_id = ALL_DB_IDS['ARCADE_ROMS']
+        if arcade_roms_db_id in current_config.databases and ui.get_value('arcade_roms_db_downloader') == 'true':
+            if current_config.hbmame_filter != (ui.get_value('hbmame_filter') == 'true'):
+                return [SEPARATE_DB_INI_FILES[arcade_roms_db_id.lower()]]
+        return []
+
     def save(self, ui: UiContext) -> None:
+        self._needs_save_tracker.invalidate()
         config = self._config_provider.get()
         self._copy_ui_options_to_current_config(ui)
 
         if self._does_arcade_oganizer_need_save(ui):
             new_ao_ini = {}
-            for variable, description in gather_variable_declarations(settings_screen_model(), "ao_ini").items():
+            for variable, description in settings_screen_model_index().variable_declarations("ao_ini").items():
                 value = ui.get_value(variable)
 
                 if value != description['default']:
@@ -951,7 +989,7 @@ class SettingsScreen(UiApplication):
     def _read_installed_db_ids(self) -> Dict[str, bool]:
         installed_keys = read_installed_db_ids(self._file_system, self._logger)
         db_ids_by_variable = db_ids_by_model_variables()
-        model_variables = set(gather_variable_declarations(settings_screen_model()))
+        model_variables = set(settings_screen_model_index().variable_declarations())
         return {
             db_id: db_id.lower() in installed_keys
             for variable, db_id in db_ids_by_variable.items()
@@ -1007,7 +1045,7 @@ class SettingsScreen(UiApplication):
     def _does_arcade_oganizer_need_save(self, ui: UiContext):
         arcade_organizer_ini = self._ini_repository.get_arcade_organizer_ini()
 
-        for variable, description in gather_variable_declarations(settings_screen_model(), "ao_ini").items():
+        for variable, description in settings_screen_model_index().variable_declarations("ao_ini").items():
             old_value = arcade_organizer_ini.get_string(description['name'], description['default']).lower()
             new_value = ui.get_value(variable).lower()
             if old_value != new_value:
@@ -1030,13 +1068,13 @@ class SettingsScreen(UiApplication):
                 setattr(config, variable, value)
 
         enabled_db_ids = set()
-        for variable in gather_variable_declarations(settings_screen_model(), "db"):
+        for variable in settings_screen_model_index().variable_declarations("db"):
             if ui.get_value(variable) == 'false':
                 continue
 
             enabled_db_ids.add(db_ids[variable])
 
-        for variable in gather_variable_declarations(settings_screen_model(), "separate_db"):
+        for variable in settings_screen_model_index().variable_declarations("separate_db"):
             if ui.get_value(variable) == 'false':
                 continue
 
@@ -1055,19 +1093,27 @@ class SettingsScreen(UiApplication):
     @cached_property
     def _all_config_variables(self):
         return [
-            *gather_variable_declarations(settings_screen_model(), "ua_ini"),
-            *gather_variable_declarations(settings_screen_model(), "store"),
-            *gather_variable_declarations(settings_screen_model(), "summary"),
-            *gather_variable_declarations(settings_screen_model(), "jt_ini"),
-            *gather_variable_declarations(settings_screen_model(), "names_ini"),
-            *gather_variable_declarations(settings_screen_model(), "arcade_roms"),
-            *gather_variable_declarations(settings_screen_model(), "rannysnice_wallpapers"),
-            *gather_variable_declarations(settings_screen_model(), "pocket"),
+            *settings_screen_model_index().variable_declarations("ua_ini"),
+            *settings_screen_model_index().variable_declarations("store"),
+            *settings_screen_model_index().variable_declarations("summary"),
+            *settings_screen_model_index().variable_declarations("jt_ini"),
+            *settings_screen_model_index().variable_declarations("names_ini"),
+            *settings_screen_model_index().variable_declarations("arcade_roms"),
+            *settings_screen_model_index().variable_declarations("rannysnice_wallpapers"),
+            *settings_screen_model_index().variable_declarations("pocket"),
+        ]
+
+    @cached_property
+    def _needs_save_config_variables(self):
+        return [
+            *self._all_config_variables,
+            *settings_screen_model_index().variable_declarations("db"),
+            *settings_screen_model_index().variable_declarations("separate_db"),
         ]
 
     @cached_property
     def _ajgowans_manuals_db_variables(self):
-        return list(gather_variable_declarations(settings_screen_model(), "manuals"))
+        return list(settings_screen_model_index().variable_declarations("manuals"))
 
     def calculate_names_char_code_warning(self, ui: UiContext) -> None:
 
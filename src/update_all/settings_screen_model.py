@@ -2765,7 +2765,6 @@ def settings_screen_model():
                     "/media/fat/_Arcade": "Directly on 'Arcade' folder",
                     "/media/fat/_Arcade Organized": "On new folder 'Arcade Organized'",
                 },
-                'capitalize': lambda string_value: string_value.capitalize(),
             },
             "entries": [
                 {
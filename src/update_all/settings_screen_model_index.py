@@ -0,0 +1,28 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import functools
+
+from update_all.settings_screen_model import settings_screen_model
+from update_all.ui_model_utilities import ModelIndex
+
+
+@functools.lru_cache(maxsize=None)
+def settings_screen_model_index() -> ModelIndex:
+    """The Settings Screen model is built and indexed at most once per process."""
+    return ModelIndex(settings_screen_model())
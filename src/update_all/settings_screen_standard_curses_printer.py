@@ -114,14 +114,94 @@ class SettingsScreenStandardCursesPrinter(CursesRuntime, SettingsScreenPrinter):
             curses.curs_set(0)
         except curses.error:
             pass
-        layout = _Layout(self, screen_dims)
-        return _DrawerFactory(self, layout, screen_dims), layout, CursesDeviceLoginRenderer(self, screen_dims)
+        screen_buffer = _ScreenBuffer(self, screen_dims)
+        layout = _Layout(self, screen_dims, screen_buffer)
+        return _DrawerFactory(self, layout, screen_buffer, screen_dims), layout, CursesDeviceLoginRenderer(self, screen_dims)
 
 
-class _Layout(ColorThemeManager):
+class _ScreenBuffer:
+    """Back buffer with the cells (character and attribute) last sent to the runtime window.
+
+    Drawing goes to a pending frame first. flush() compares it with what the window already shows
+    and only writes the runs of cells that changed, so repainting an unchanged screen costs no
+    curses calls. Whoever paints the window behind its back must call invalidate().
+    """
+
     def __init__(self, runtime: CursesRuntime, screen_dims: ScreenDims):
         self._runtime = runtime
         self._sd = screen_dims
+        self._window = None
+        self._painted: dict[int, list[Optional[tuple[str, int]]]] = {}
+        self._pending: dict[int, list[Optional[tuple[str, int]]]] = {}
+
+    def invalidate(self) -> None:
+        self._painted = {}
+
+    def fill(self, y: int, x: int, n: int, char: str, attr: int) -> None:
+        row = self._pending_row(y)
+        n = min(n, len(row) - x)
+        if n > 0:
+            row[x:x + n] = [(char, attr)] * n
+
+    def write(self, y: int, x: int, text: str, attr: int) -> None:
+        row = self._pending_row(y)
+        text = text[0:len(row) - x]
+        row[x:x + len(text)] = [(char, attr) for char in text]
+
+    def flush(self) -> int:
+        window = self._runtime.window
+        if window is not self._window:
+            self._window = window
+            self._painted = {}
+
+        runs = 0
+        for y, row in self._pending.items():
+            painted = self._painted.get(y)
+            if painted is None:
+                painted = self._painted[y] = [None] * len(row)
+
+            x = 0
+            while x < len(row):
+                cell = row[x]
+                if cell is None or cell == painted[x]:
+                    x += 1
+                    continue
+
+                start = x
+                attr = cell[1]
+                while x < len(row) and row[x] is not None and row[x] != painted[x] and row[x][1] == attr:
+                    painted[x] = row[x]
+                    x += 1
+
+                self._addstr(window, y, start, ''.join(char for char, _attr in row[start:x]), attr)
+                runs += 1
+
+        self._pending = {}
+        return runs
+
+    def present(self) -> None:
+        self._runtime.window.noutrefresh()
+        curses.doupdate()
+
+    def _pending_row(self, y: int) -> list[Optional[tuple[str, int]]]:
+        row = self._pending.get(y)
+        if row is None:
+            row = self._pending[y] = [None] * self._sd.term_size.columns
+        return row
+
+    def _addstr(self, window, y: int, x: int, text: str, attr: int) -> None:
+        ts = self._sd.term_size
+        if y == ts.lines - 1 and x + len(text) >= ts.columns:
+            window.insstr(y, x, text, attr)  # addstr fails on the bottom right cell, as the cursor can't move past it.
+        else:
+            window.addstr(y, x, text, attr)
+
+
+class _Layout(ColorThemeManager):
+    def __init__(self, runtime: CursesRuntime, screen_dims: ScreenDims, screen_buffer: _ScreenBuffer):
+        self._runtime = runtime
+        self._sd = screen_dims
+        self._screen_buffer = screen_buffer
         self._painted = False
         self._box_id = None
         self._current_theme = None
@@ -159,6 +239,7 @@ class _Layout(ColorThemeManager):
         self._painted = True
         self._box_id = box_id
         self._runtime.window.erase()
+        self._screen_buffer.invalidate()
         self._runtime.window.bkgd(' ', curses.color_pair(colors.WINDOW_BACKGROUND_COLOR))
         if box_id == self._box_id:
             self._paint_box(h, w, y, x, has_header)
@@ -188,22 +269,26 @@ class _Layout(ColorThemeManager):
 
 
 class _DrawerFactory(UiDialogDrawerFactory):
-    def __init__(self, runtime: CursesRuntime, layout: _Layout, screen_dims: ScreenDims):
+    def __init__(self, runtime: CursesRuntime, layout: _Layout, screen_buffer: _ScreenBuffer, screen_dims: ScreenDims):
         self._runtime = runtime
         self._layout = layout
+        self._screen_buffer = screen_buffer
         self._sd = screen_dims
 
     def create_ui_dialog_drawer(self, interpolator: Interpolator) -> UiDialogDrawer:
-        return Drawer(self._runtime, self._layout, interpolator, self._sd)
+        return Drawer(self._runtime, self._layout, self._screen_buffer, interpolator, self._sd)
 
 
 class Drawer(UiDialogDrawer):
-    def __init__(self, runtime: CursesRuntime, layout: _Layout, interpolator: Interpolator, screen_dims: ScreenDims):
+    def __init__(self, runtime: CursesRuntime, layout: _Layout, screen_buffer: _ScreenBuffer, interpolator: Interpolator, screen_dims: ScreenDims):
         self._runtime = runtime
         self._layout = layout
+        self._screen_buffer = screen_buffer
         self._interpolator = interpolator
         self._sd = screen_dims
         self._text_lines = []
+        self._wrapped_text_lines = {}
+        self._previous_wrapped_text_lines = {}
         self._menu_entries = []
         self._actions = []
         self._effects = {}
@@ -217,6 +302,9 @@ class Drawer(UiDialogDrawer):
 
     def start(self, data):
         self._text_lines = []
+        # Wrapped lines are kept for one frame, so only text that changed since the previous paint is wrapped again.
+        self._previous_wrapped_text_lines = self._wrapped_text_lines
+        self._wrapped_text_lines = {}
         self._menu_entries = []
         self._actions = []
         self._effects = {}
@@ -232,18 +320,20 @@ class Drawer(UiDialogDrawer):
 
     def add_text_line(self, text):
         interpolated_text = self._interpolator.interpolate(text)
-        for line in interpolated_text.split('\n'):
-            ts = self._sd.term_size
-            oc = self._sd.overscan_dim
-            n = ts.columns - max(2, oc.cols * 2)
-            for chunk in _word_wrap_line(line, n):
-                find_tilda = chunk.find('~')
-                find_at = chunk.find('@')
-                if find_tilda != -1 or find_at != -1:
-                    chunk, effects = parse_effects(chunk)
-                    self._effects[chunk] = effects
+        ts = self._sd.term_size
+        oc = self._sd.overscan_dim
+        n = ts.columns - max(2, oc.cols * 2)
+        wrapped_key = (interpolated_text, n)
+        wrapped = self._wrapped_text_lines.get(wrapped_key) or self._previous_wrapped_text_lines.get(wrapped_key)
+        if wrapped is None:
+            wrapped = _wrap_text_line(interpolated_text, n)
+        self._wrapped_text_lines[wrapped_key] = wrapped
+
+        for chunk, effects in wrapped:
+            if effects is not None:
+                self._effects[chunk] = effects
 
-                self._text_lines.append(chunk)
+            self._text_lines.append(chunk)
 
     def set_text_scroll(self, offset: int) -> None:
         self._text_scroll_offset = offset
@@ -396,10 +486,12 @@ class Drawer(UiDialogDrawer):
                 x = max(co, (ts.columns - len(text)) // 2)
                 self._write_line(desc_y, x, text, mode)
 
+        self._screen_buffer.flush()
         if should_show_overscan_preview:
             self._paint_overscan_preview()
             self._printed_overscan_preview = True
 
+        self._screen_buffer.present()
         return self._runtime.read_key()
 
     def _marquee_read_key(self, text, avail, mode):
@@ -419,7 +511,9 @@ class Drawer(UiDialogDrawer):
                 visible = text[offset:offset + avail]
                 self._clear_line(y, 0, ord(' ') | mode, ts.columns)
                 self._write_line(y, co, visible, mode)
-                curses.doupdate()
+                # Only the marquee row is pending here (besides the rest of the first frame), so only it gets repainted.
+                self._screen_buffer.flush()
+                self._screen_buffer.present()
                 key = self._runtime.read_key()
                 if key != Key.NONE and key != -1:
                     return key
@@ -455,7 +549,7 @@ class Drawer(UiDialogDrawer):
         n = min(n, ts.columns - x)
         if n <= 0:
             return
-        self._runtime.window.hline(y, x, ch, n)
+        self._screen_buffer.fill(y, x, n, chr(ch & curses.A_CHARTEXT), ch & ~curses.A_CHARTEXT)
 
     def _write_line(self, y, x, text, mode):
         if not text:
@@ -481,7 +575,7 @@ class Drawer(UiDialogDrawer):
             text = text[0:(ts.columns - x - 1)]
         if not text:
             return
-        self._runtime.window.addstr(y, x, text, mode)
+        self._screen_buffer.write(y, x, text, mode)
 
     def _paint_overscan_preview(self) -> None:
         paint_overscan_preview(
@@ -489,6 +583,7 @@ class Drawer(UiDialogDrawer):
             self._sd,
             curses.A_NORMAL | curses.color_pair(colors.OVERSCAN_BOX_COLOR),
         )
+        self._screen_buffer.invalidate()
 
 
 def paint_overscan_preview(win, screen_dims: ScreenDims, attr: int) -> None:
@@ -1045,6 +1140,18 @@ def _is_selected_overscan_entry(menu_entries):
     return any(is_selected and option.endswith('Overscan') for option, _, is_selected in menu_entries)
 
 
+def _wrap_text_line(text, max_width):
+    wrapped = []
+    for line in text.split('\n'):
+        for chunk in _word_wrap_line(line, max_width):
+            effects = None
+            if chunk.find('~') != -1 or chunk.find('@') != -1:
+                chunk, effects = parse_effects(chunk)
+
+            wrapped.append((chunk, effects))
+    return wrapped
+
+
 def _word_wrap_line(line, max_width):
     if len(line) <= max_width:
         return [line]
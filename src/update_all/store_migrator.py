@@ -29,21 +29,19 @@ class StoreMigrator:
         self._logger = logger
 
     def migrate(self, local_store):
-        self._logger.bench('Migration start.')
-
-        current_version = local_store.get('migration_version', 0)
-        if current_version >= len(self._migrations):
-            self._logger.bench('Migration not necessary, early return.')
-            return
-
-        for i in range(current_version, len(self._migrations), 1):
-            self._logger.debug('Running migration version %s.' % (i + 1))
-            self._migrations[i](local_store)
-
-        local_store['migration_version'] = self.latest_migration_version()
-        local_store['_dirty'] = True
-
-        self._logger.bench('Migration done.')
+        with self._logger.span('store.migrate') as span:
+            current_version = local_store.get('migration_version', 0)
+            if current_version >= len(self._migrations):
+                span.set('migrations', 0)
+                return
+
+            for i in range(current_version, len(self._migrations), 1):
+                self._logger.debug('Running migration version %s.' % (i + 1))
+                self._migrations[i](local_store)
+                span.count('migrations')
+
+            local_store['migration_version'] = self.latest_migration_version()
+            local_store['_dirty'] = True
 
     def latest_migration_version(self) -> int:
         return len(self._migrations)
@@ -15,96 +15,202 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 
+import functools
+import json
 import tempfile
-from typing import Any
+from typing import Any, Callable, Optional
 
 from update_all.config import Config
-from update_all.constants import FILE_names_txt, FILE_timeline_plus2, FILE_patreon_key_prev
+from update_all.constants import FILE_names_txt, FILE_names_txt_index_cache, FILE_timeline_plus2, FILE_timeline_render_cache, FILE_patreon_key_prev
 from update_all.encryption import Encryption, EncryptionResult
 from update_all.file_system import FileSystem
+from update_all.log_document import BlockDocument
 from update_all.logger import Logger
+from update_all.names_index import NamesIndex
 from update_all.other import GenericProvider
 from update_all.retroaccount import RetroAccountService
 
+TIMELINE_RENDER_CACHE_VERSION: int = 1
+
 
 class Timeline:
-    def __init__(self, logger: Logger, config_provider: GenericProvider[Config], file_system: FileSystem, encryption: Encryption, retroaccount: RetroAccountService):
+    def __init__(self, logger: Logger, config_provider: GenericProvider[Config], file_system: FileSystem, encryption: Encryption, retroaccount: RetroAccountService, names_index: Optional[NamesIndex] = None):
         self._logger = logger
         self._config_provider = config_provider
         self._file_system = file_system
         self._encryption = encryption
         self._retroaccount = retroaccount
-        self._names_dict = {}
+        self._names_index = names_index or NamesIndex(file_system)
+        self._plus_cache: Optional[dict[str, Any]] = None
+        self._plus_render_cache: Optional[tuple[list[Any], list[str]]] = None
+
+    def load_timeline_doc(self, env_check_skip: bool = False) -> BlockDocument:
+        with self._logger.span('timeline.load_timeline_doc'):
+            return self._load_timeline_doc(env_check_skip)
 
-    def load_timeline_doc(self, env_check_skip: bool = False) -> list[str]:
+    def _load_timeline_doc(self, env_check_skip: bool) -> BlockDocument:
         config = self._config_provider.get()
 
         timeline_model = None
         timeline_plus_model = None
         not_yet_updated = False
+        plus_cache = None
 
         if self._file_system.is_file(config.timeline_plus_path):
-            with tempfile.NamedTemporaryFile() as temp_file:
-                if env_check_skip:
-                    self._logger.debug('Timeline: Skipping environment check for timeline decryption')
-                    self._encryption.skip_environment_check()
+            if env_check_skip:
+                self._logger.debug('Timeline: Skipping environment check for timeline decryption')
+                self._encryption.skip_environment_check()
 
-                timeline_plus_model, not_yet_updated = self._extract_plus_model(config.timeline_plus_path, temp_file.name)
-                if not_yet_updated and self._file_system.is_file(FILE_timeline_plus2):
-                    self._logger.debug("Timeline: Attempting to extract from timeline_plus2.")
-                    timeline_plus_model, not_yet_updated = self._extract_plus_model(FILE_timeline_plus2, temp_file.name)
+            plus_cache, not_yet_updated = self._load_plus_cache(config.timeline_plus_path)
+            if not_yet_updated and self._file_system.is_file(FILE_timeline_plus2):
+                self._logger.debug("Timeline: Attempting to extract from timeline_plus2.")
+                plus_cache, not_yet_updated = self._load_plus_cache(FILE_timeline_plus2)
 
+            if plus_cache is not None:
+                timeline_plus_model = plus_cache['model']
+
+        model_hash = None
         if timeline_plus_model is None and self._file_system.is_file(config.timeline_short_path):
             timeline_model = self._file_system.load_dict_from_file(config.timeline_short_path, '.json')
-
-        names_dict = self._load_names_dict(FILE_names_txt)
+            model_hash = self._hash_or_none(config.timeline_short_path)
+            if model_hash is not None:
+                model_hash = f'short:{model_hash}:{not_yet_updated}'
 
         usable_columns = config.term_size.columns - config.overscan_dim.cols * 2
 
         if timeline_model is not None:
-            timeline_doc = create_timeline_doc(timeline_model, names_dict, usable_columns)
-            timeline_doc.append("\n")
-            timeline_doc.append("[!!] This Timeline only covers the latest 7 days of updates [!!]\n")
-            timeline_doc.append("\n")
+            footer = ["\n", "[!!] This Timeline only covers the latest 7 days of updates [!!]\n", "\n"]
             if not_yet_updated:
-                timeline_doc.append("The Extended Timeline is being calculated, try again soon!:\n")
+                footer.append("The Extended Timeline is being calculated, try again soon!:\n")
             else:
-                timeline_doc.append("For an extended Timeline of 12 months:\n")
-                timeline_doc.append(" • Support www.patreon.com/theypsilon\n")
-                timeline_doc.append(" • Login in the Settings Screen\n")
-            timeline_doc.append("\n")
+                footer.append("For an extended Timeline of 12 months:\n")
+                footer.append(" • Support www.patreon.com/theypsilon\n")
+                footer.append(" • Login in the Settings Screen\n")
+            footer.append("\n")
         elif timeline_plus_model is not None:
-            timeline_doc = create_timeline_doc(timeline_plus_model, names_dict, usable_columns)
-            timeline_doc.append("\n")
-            timeline_doc.append("<theypsilon> That's all! Thank you so much for supporting my work!!\n")
+            timeline_model = timeline_plus_model
+            if plus_cache.get('cipher_hash') is not None:
+                model_hash = f"plus:{plus_cache['cipher_hash']}:{plus_cache['key_hash']}"
+            footer = ["\n", "<theypsilon> That's all! Thank you so much for supporting my work!!\n"]
         else:
-            timeline_doc = []
+            return BlockDocument([], config.term_size.columns, config.overscan_dim.cols)
+
+        render_key = None if model_hash is None else [model_hash, usable_columns, self._file_signature(FILE_names_txt)]
+        cached_lines = self._read_render_cache(render_key)
+        if cached_lines is not None:
+            return BlockDocument([(len(cached_lines), lambda: cached_lines)], config.term_size.columns, config.overscan_dim.cols)
+
+        names_dict = self._load_names_dict(FILE_names_txt)
+        blocks = timeline_doc_blocks(timeline_model, names_dict, usable_columns)
+        blocks.append((len(footer), lambda: footer))
+        on_complete = None if render_key is None else lambda lines: self._save_render_cache(render_key, lines)
+        return BlockDocument(blocks, config.term_size.columns, config.overscan_dim.cols, on_complete)
+
+    def _read_render_cache(self, render_key: Optional[list[Any]]) -> Optional[list[str]]:
+        if render_key is None:
+            return None
+        if _is_plus_render_key(render_key):
+            if self._plus_render_cache is not None and self._plus_render_cache[0] == render_key:
+                return self._plus_render_cache[1]
+            return None
+        if not self._file_system.is_file(FILE_timeline_render_cache):
+            return None
+        try:
+            cache = self._file_system.load_dict_from_file(FILE_timeline_render_cache, '.json')
+        except Exception as e:
+            self._logger.debug(e)
+            self._logger.debug('Timeline: Could not read the render cache.')
+            return None
+        if not isinstance(cache, dict) or cache.get('version') != TIMELINE_RENDER_CACHE_VERSION or cache.get('key') != render_key:
+            return None
+        return cache.get('lines')
+
+    def _save_render_cache(self, render_key: list[Any], lines: list[str]) -> None:
+        # the lines of the extended timeline are as private as the decrypted model, so only the public one is persisted
+        if _is_plus_render_key(render_key):
+            self._plus_render_cache = (render_key, lines)
+            return
+        try:
+            self._file_system.save_json({'version': TIMELINE_RENDER_CACHE_VERSION, 'key': render_key, 'lines': lines}, FILE_timeline_render_cache)
+        except Exception as e:
+            self._logger.debug(e)
+            self._logger.debug('Timeline: Could not save the render cache.')
 
-        return timeline_doc
+    def _hash_or_none(self, path: str) -> Optional[str]:
+        try:
+            return self._file_system.hash(path)
+        except Exception as e:
+            self._logger.debug(e)
+            return None
 
-    def _extract_plus_model(self, timeline_plus_model_path: str, output: str) -> tuple[Any, bool]:
+    def _load_plus_cache(self, timeline_plus_model_path: str) -> tuple[Optional[dict[str, Any]], bool]:
+        """The decrypted model, keyed by the ciphertext hash and the fingerprint of the key that decrypted it.
+
+        It only lives in memory for this process. The decrypted model is never written to disk."""
+        try:
+            cipher_hash = self._file_system.hash(timeline_plus_model_path)
+            key_hashes = {self._file_system.hash(key) for key in (self._config_provider.get().patreon_key_path, FILE_patreon_key_prev) if self._file_system.is_file(key)}
+        except Exception as e:
+            self._logger.debug(e)
+            self._logger.debug('Timeline: Could not fingerprint the timeline_plus file, skipping the cache.')
+            cipher_hash, key_hashes = None, set()
+
+        cache = self._plus_cache
+        if cache is not None and cipher_hash is not None and cache['cipher_hash'] == cipher_hash and cache['key_hash'] in key_hashes:
+            return cache, False
+
+        timeline_plus_model, not_yet_updated, key_hash = self._extract_plus_model(timeline_plus_model_path)
+        if timeline_plus_model is None:
+            return None, not_yet_updated
+
+        cache = {'cipher_hash': cipher_hash, 'key_hash': key_hash, 'model': timeline_plus_model}
+        self._plus_cache = cache
+        return cache, not_yet_updated
+
+    def _file_signature(self, path: str) -> str:
+        try:
+            if not self._file_system.is_file(path):
+                return ''
+            return f'{self._file_system.file_size(path)}:{self._file_system.file_mtime(path)}'
+        except Exception as e:
+            self._logger.debug(e)
+            return ''
+
+    def _extract_plus_model(self, timeline_plus_model_path: str) -> tuple[Any, bool, Optional[str]]:
         timeline_plus_model = None
         not_yet_updated = False
 
-        decrypt_result = self._encryption.decrypt_file(timeline_plus_model_path, output, self._config_provider.get().patreon_key_path)
+        key_path = self._config_provider.get().patreon_key_path
+        key_hash = None
+        decrypt_result, plaintext = self._encryption.decrypt_bytes(timeline_plus_model_path, key_path)
         try:
             # Fallback 1: Attempt local previous patreon key if exists
             if decrypt_result == EncryptionResult.InvalidKey and self._file_system.is_file(FILE_patreon_key_prev):
                 self._logger.debug("Encryption: Attempting with previously installed patreon key.")
-                decrypt_result = self._encryption.decrypt_file(timeline_plus_model_path, output, FILE_patreon_key_prev)
+                key_path = FILE_patreon_key_prev
+                decrypt_result, plaintext = self._encryption.decrypt_bytes(timeline_plus_model_path, key_path)
 
             # Fallback 2: Attempt remote previous patreon key if exists
             if decrypt_result == EncryptionResult.InvalidKey and self._retroaccount.has_prev_patreon_key_url():
                 self._logger.debug("Encryption: Attempting with patreon key from previous url.")
                 with tempfile.NamedTemporaryFile() as previous_patreon_key_file:
                     self._retroaccount.install_update_all_prev_patreon_key(previous_patreon_key_file.name)
-                    decrypt_result = self._encryption.decrypt_file(timeline_plus_model_path, output, previous_patreon_key_file.name)
+                    decrypt_result, plaintext = self._encryption.decrypt_bytes(timeline_plus_model_path, previous_patreon_key_file.name)
+                    if decrypt_result == EncryptionResult.Success:
+                        key_hash = self._file_system.hash(previous_patreon_key_file.name)
+                key_path = None
         except Exception as e:
             self._logger.debug(e)
             self._logger.debug('Timeline: Patreon key fallbacks failed.')
 
         if decrypt_result == EncryptionResult.Success:
-            timeline_plus_model = self._file_system.load_dict_from_file(output, '.json')
+            try:
+                timeline_plus_model = json.loads(plaintext)
+                if key_path is not None:
+                    key_hash = self._file_system.hash(key_path)
+            except Exception as e:
+                self._logger.debug(e)
+                self._logger.debug('Timeline: Could not parse the decrypted timeline_plus file.')
         elif decrypt_result == EncryptionResult.MissingKey:
             pass
         elif decrypt_result == EncryptionResult.InvalidKey:
@@ -118,36 +224,40 @@ class Timeline:
         else:
             self._logger.debug(f'Timeline: Could not decrypt timeline_plus_file: {decrypt_result}')
 
-        return timeline_plus_model, not_yet_updated
+        return timeline_plus_model, not_yet_updated, key_hash
 
     def _load_names_dict(self, names_path: str) -> dict[str, str]:
-        names_dict = {}
-
-        if self._file_system.is_file(names_path) is False:
-            return names_dict
-
         try:
-            names_txt: str = self._file_system.read_file_contents(names_path)
-            for line in names_txt.splitlines():
-                line = line.strip()
-                if not line or ':' not in line:
-                    continue
-
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-
-                if key and value:
-                    names_dict[key] = value
+            return self._names_index.names(names_path, FILE_names_txt_index_cache)
         except Exception as e:
             self._logger.debug(f"Timeline: Error reading names file {names_path}.")
             self._logger.debug(e)
+            return {}
 
-        return names_dict
+def _is_plus_render_key(render_key: list[Any]) -> bool:
+    return len(render_key) > 0 and isinstance(render_key[0], str) and render_key[0].startswith('plus:')
 
 def create_timeline_doc(model, names_dict: dict[str, str], columns: int):
-    doc = []
+    return [line for _count, render in timeline_doc_blocks(model, names_dict, columns) for line in render()]
+
+def timeline_doc_blocks(model, names_dict: dict[str, str], columns: int) -> list[tuple[int, Callable[[], list[str]]]]:
+    """The timeline doc as blocks for a BlockDocument: the line count of each section is known without rendering it."""
+    header = timeline_doc_header(columns)
+    blocks = [(len(header), lambda: header)]
     sections = model.get("sections", [])
+    if not sections:
+        no_sections_msg = list(model.get("summary", {}).get("no_sections_msg", ["Timeline is empty."]))
+        blocks.append((len(no_sections_msg), lambda: no_sections_msg))
+        return blocks
+
+    for section in sections:
+        blocks.append((section_line_count(section), functools.partial(render_doc_section, section, names_dict, columns)))
+
+    blocks.append((1, lambda: ["=" * columns + "\n"]))
+    return blocks
+
+def timeline_doc_header(columns: int) -> list[str]:
+    doc = []
     if columns < 80:
         doc.append("        ".center(columns))
         doc.append(" UPDATE ".center(columns))
@@ -191,16 +301,26 @@ def create_timeline_doc(model, names_dict: dict[str, str], columns: int):
             doc.append(_pad(line, "#"))
         doc.append("#" * columns + "\n")
         doc.append("\n")
+    return doc
 
-    if not sections:
-        doc.extend(model.get("summary", {}).get("no_sections_msg", ["Timeline is empty."]))
-        return doc
-
-    for section in sections:
-        add_doc_section(doc, section, names_dict, columns)
-
-    doc.append("=" * columns + "\n")
+def section_line_count(section: dict[str, Any]) -> int:
+    categories = section.get("categories", [])
+    if not categories:
+        return 0
 
+    count = 2
+    for category in categories:
+        files = category["files"]
+        if len(files) > 1:
+            count += 1 + sum(1 for file_entry in files if file_entry["type"] == "standalone" and file_entry["name"])
+        elif len(files) == 1:
+            count += 1
+        count += 1
+    return count
+
+def render_doc_section(section: dict[str, Any], names_dict: dict[str, str], columns: int) -> list[str]:
+    doc = []
+    add_doc_section(doc, section, names_dict, columns)
     return doc
 
 def add_doc_section(doc: list[str], section: dict[str, Any], names_dict: dict[str, str], columns: int):
@@ -0,0 +1,311 @@
+# Copyright (c) 2022-2026 José Manuel Barroso Galindo <theypsilon@gmail.com>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You can download the latest version of this tool from:
+# https://github.com/theypsilon/Update_All_MiSTer
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+FILE_proc_self_status: str = '/proc/self/status'
+FILE_proc_self_clear_refs: str = '/proc/self/clear_refs'
+# the tracer is enabled on every run, so the recorded spans must not grow without limit in long sessions
+TRACER_MAX_EVENTS: int = 10_000
+
+
+class SpanEvent(NamedTuple):
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+    thread_name: str
+    depth: int
+    args: Dict[str, Any]
+
+
+class Span:
+    __slots__ = ('_tracer', 'name', 'args', '_start', '_depth', '_peak_kb', '_tracks_memory')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self._start = 0.0
+        self._depth = 0
+        self._peak_kb = 0
+        self._tracks_memory = False
+
+    def __enter__(self) -> 'Span':
+        self._depth = self._tracer._push()
+        self._tracks_memory = self._tracer._enter_memory(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        end = time.perf_counter()
+        self._tracer._pop()
+        if self._tracks_memory:
+            self._tracer._exit_memory(self)
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self._tracer._record(self.name, self._start, end - self._start, self._depth, self.args)
+        return False
+
+    def count(self, key: str, amount: int = 1) -> None:
+        self.args[key] = self.args.get(key, 0) + amount
+
+    def set(self, key: str, value: Any) -> None:
+        self.args[key] = value
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return False
+
+    def count(self, key: str, amount: int = 1) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Records nested, per-thread timed spans. While disabled, span() returns a shared no-op object."""
+
+    def __init__(self):
+        self.enabled = False
+        self._origin = time.perf_counter()
+        self._events: List[SpanEvent] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners: List[Callable[[SpanEvent], None]] = []
+        self._counters: Dict[str, int] = {}
+        self._memory_probe: Optional[MemoryProbe] = None
+        self._memory_stack: List[Span] = []
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def enable_memory_tracking(self) -> None:
+        """Adds the memory high-water mark reached during each main thread span as its peak_rss_kb arg."""
+        if self._memory_probe is None:
+            self._memory_probe = make_memory_probe()
+
+    def run_peak_rss_kb(self) -> int:
+        """Memory high-water mark of the whole run, unaffected by the resets done between spans."""
+        if self._memory_probe is None:
+            return 0
+        return self._memory_probe.run_peak_kb()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, args)
+
+    def count(self, key: str, amount: int = 1) -> None:
+        """Adds to a run-wide counter that is not tied to any span."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def add_listener(self, listener: Callable[[SpanEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def events(self) -> List[SpanEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        trace_events: List[Dict[str, Any]] = []
+        thread_names: Dict[int, str] = {}
+        pid = os.getpid()
+        for event in self.events():
+            thread_names[event.thread_id] = event.thread_name
+            trace_events.append({
+                'name': event.name,
+                'cat': event.name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': round(event.start * 1_000_000, 1),
+                'dur': round(event.duration * 1_000_000, 1),
+                'pid': pid,
+                'tid': event.thread_id,
+                'args': _json_safe(event.args),
+            })
+        for thread_id, thread_name in thread_names.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id, 'args': {'name': thread_name}})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str) -> None:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _push(self) -> int:
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        return depth
+
+    def _pop(self) -> None:
+        self._local.depth -= 1
+
+    def _enter_memory(self, span: Span) -> bool:
+        # the high-water mark is process wide, so only the main thread spans can reset it without interfering
+        if self._memory_probe is None or threading.current_thread() is not threading.main_thread():
+            return False
+        peak_before = self._memory_probe.peak_kb()
+        if len(self._memory_stack) > 0:
+            parent = self._memory_stack[-1]
+            parent._peak_kb = max(parent._peak_kb, peak_before)
+        self._memory_probe.reset()
+        self._memory_stack.append(span)
+        return True
+
+    def _exit_memory(self, span: Span) -> None:
+        self._memory_stack.pop()
+        peak = max(span._peak_kb, self._memory_probe.peak_kb())
+        span.args['peak_rss_kb'] = peak
+        if len(self._memory_stack) > 0:
+            parent = self._memory_stack[-1]
+            parent._peak_kb = max(parent._peak_kb, peak)
+
+    def _record(self, name: str, start: float, duration: float, depth: int, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event = SpanEvent(name, start - self._origin, duration, thread.ident or 0, thread.name, depth, args)
+        with self._lock:
+            if len(self._events) < TRACER_MAX_EVENTS:
+                self._events.append(event)
+            else:
+                self._counters['dropped_trace_events'] = self._counters.get('dropped_trace_events', 0) + 1
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass
+
+
+class MemoryProbe(ABC):
+    @abstractmethod
+    def peak_kb(self) -> int:
+        """High-water mark since the last reset."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Starts a new high-water mark."""
+
+    @abstractmethod
+    def run_peak_kb(self) -> int:
+        """High-water mark since the probe was created, across resets."""
+
+
+class ProcStatusMemoryProbe(MemoryProbe):
+    """Reads VmHWM and resets it through /proc/self/clear_refs, so it costs nothing between spans.
+
+    The reset also resets ru_maxrss, so the peak is kept across resets for run_peak_kb."""
+
+    def __init__(self):
+        self._can_reset = True
+        self._run_peak_kb = 0
+
+    def peak_kb(self) -> int:
+        peak = self._read_vm_hwm()
+        self._run_peak_kb = max(self._run_peak_kb, peak)
+        return peak
+
+    def reset(self) -> None:
+        if not self._can_reset:
+            return
+        self.peak_kb()
+        try:
+            with open(FILE_proc_self_clear_refs, 'w') as f:
+                f.write('5')
+        except OSError:
+            # without a reset VmHWM is still a valid, although looser, upper bound
+            self._can_reset = False
+
+    def run_peak_kb(self) -> int:
+        self.peak_kb()
+        return self._run_peak_kb
+
+    def _read_vm_hwm(self) -> int:
+        try:
+            with open(FILE_proc_self_status, 'r') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return 0
+
+
+class TracemallocMemoryProbe(MemoryProbe):
+    """Fallback for systems without /proc. It only sees Python allocations and slows them down."""
+
+    def __init__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._run_peak_kb = 0
+
+    def peak_kb(self) -> int:
+        peak = tracemalloc.get_traced_memory()[1] // 1024
+        self._run_peak_kb = max(self._run_peak_kb, peak)
+        return peak
+
+    def reset(self) -> None:
+        self.peak_kb()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def run_peak_kb(self) -> int:
+        self.peak_kb()
+        return self._run_peak_kb
+
+
+def make_memory_probe() -> MemoryProbe:
+    if os.path.isfile(FILE_proc_self_status):
+        return ProcStatusMemoryProbe()
+    return TracemallocMemoryProbe()
+
+
+def _json_safe(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value if isinstance(value, (int, float, str, bool)) or value is None else str(value) for key, value in args.items()}
+
+
+def trace_file_path(logfile_path: str) -> str:
+    return os.path.splitext(logfile_path)[0] + '.trace.json'
+
+
+tracer = Tracer()
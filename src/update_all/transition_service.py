@@ -30,9 +30,9 @@ from update_all.local_store import LocalStore
 from update_all.logger import Logger
 from update_all.mister_ini_repository import MisterIniRepository
 from update_all.os_utils import OsUtils
-from update_all.settings_screen_model import settings_screen_model
+from update_all.settings_screen_model_index import settings_screen_model_index
 from update_all.update_output import UpdateOutput
-from update_all.ui_model_utilities import gather_variable_declarations, dynamic_convert_string
+from update_all.ui_model_utilities import dynamic_convert_string
 
 
 default_arcade_organizer_enabled = Config().arcade_organizer
@@ -241,7 +241,7 @@ class TransitionService:
             config.hbmame_filter = True
             self._logger.debug('hbmame_filter=true')
 
-        for variable in gather_variable_declarations(settings_screen_model(), 'store'):
+        for variable in settings_screen_model_index().variable_declarations('store'):
             if hasattr(config, variable):
                 value = getattr(config, variable)
                 store.generic_set(variable, value)
@@ -253,7 +253,7 @@ class TransitionService:
         ini_content = self._ini_repository.read_old_ini_file(ini_file)
         db_ids = db_ids_by_model_variables()
 
-        for variable, description in gather_variable_declarations(settings_screen_model(), ini_group).items():
+        for variable, description in settings_screen_model_index().variable_declarations(ini_group).items():
             string_value = ini_content.get_string(variable, None)
             if string_value is None:
                 string_value = description['default']
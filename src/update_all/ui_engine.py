@@ -16,9 +16,15 @@
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
 import abc
-from typing import Dict, Callable, Any, Union, Optional, List
+import functools
+from typing import Dict, Callable, Any, Union, Optional, List, NamedTuple, Tuple, FrozenSet, Iterable
 
-from update_all.ui_model_utilities import gather_variable_declarations, expand_type, Key
+from update_all.ui_model_utilities import gather_variable_declarations, expand_type, Key, ModelIndex
+
+# available to every model without declaring them, models and custom formatters can override them
+BUILTIN_FORMATTERS: Dict[str, Callable[[str], str]] = {
+    'capitalize': lambda value: value.capitalize(),
+}
 
 
 class UiContext(abc.ABC):
@@ -32,7 +38,15 @@ class UiContext(abc.ABC):
         """Add effects during initialization"""
 
     def add_custom_formatters(self, formatters: Dict[str, Callable[[str], str]]):
-        """Add callable formatters during initialization"""
+        """Add callable formatters during initialization. They should only depend on the value they receive"""
+
+    def revision(self) -> int:
+        """Counter that increases every time a variable changes its value"""
+        return 0
+
+    def changed_since(self, revision: int, variables: Iterable[str]) -> bool:
+        """Whether any of the variables changed its value after the given revision. True when changes are not tracked."""
+        return True
 
 
 class UiRuntime(abc.ABC):
@@ -56,6 +70,18 @@ class Interpolator(abc.ABC):
     def get_value(self, key: str) -> str:
         """Gets the current value of a UI variable"""
 
+    def dependencies(self, text: str) -> FrozenSet[str]:
+        """Variables read when interpolating text, so it only needs to be interpolated again when one of them changes"""
+        return compile_template(text).variables
+
+    def revision(self) -> int:
+        """Counter that increases every time a UI variable changes its value"""
+        return 0
+
+    def changed_since(self, revision: int, variables: Iterable[str]) -> bool:
+        """Whether any of the variables changed its value after the given revision. True when changes are not tracked."""
+        return True
+
 
 Effect = Dict[str, Any]
 
@@ -90,20 +116,23 @@ class UiApplication(abc.ABC):
 
 
 def execute_ui_engine(entrypoint: str, model: Dict[str, Any], ui_application: UiApplication, ui_runtime: UiRuntime,
-                      initial_history: Optional[List[str]] = None):
-    ui = _UiSystem(entrypoint, model, ui_application, ui_runtime, initial_history)
+                      initial_history: Optional[List[str]] = None, model_index: Optional[ModelIndex] = None):
+    ui = _UiSystem(entrypoint, model, ui_application, ui_runtime, initial_history, model_index)
     ui.execute()
 
 
 class _UiSystem(UiContext):
     def __init__(self, entrypoint, model, ui_application: UiApplication, ui_runtime: UiRuntime,
-                 initial_history: Optional[List[str]] = None):
+                 initial_history: Optional[List[str]] = None, model_index: Optional[ModelIndex] = None):
         self._entrypoint = entrypoint
         self._model = model
+        self._model_index = model_index
         self._ui_application = ui_application
         self._ui_runtime = ui_runtime
         self._initial_history = list(initial_history or [])
         self._values = {}
+        self._revision = 0
+        self._variable_revisions: Dict[str, int] = {}
         self._custom_effects = {}
         self._custom_formatters = {}
         self._is_initializing = False
@@ -112,10 +141,25 @@ class _UiSystem(UiContext):
         return self._values[key]
 
     def set_value(self, key: str, value: Any) -> None:
+        if key in self._values and self._values[key] == value:
+            return
+
         self._values[key] = value
+        self._revision += 1
+        self._variable_revisions[key] = self._revision
+
+    def revision(self) -> int:
+        return self._revision
+
+    def changed_since(self, revision: int, variables: Iterable[str]) -> bool:
+        for variable in variables:
+            if self._variable_revisions.get(variable, 0) > revision:
+                return True
+        return False
 
     def execute(self):
-        self._values.update({k: v['default'] for k, v in gather_variable_declarations(self._model).items()})
+        declarations = gather_variable_declarations(self._model) if self._model_index is None else self._model_index.variable_declarations()
+        self._values.update({k: v['default'] for k, v in declarations.items()})
 
         self._is_initializing = True
 
@@ -220,6 +264,8 @@ class _UiMainLoop:
             for section in self._history:
                 data[field].update(self._items[section].get(field, {}))
 
+        for name, formatter in BUILTIN_FORMATTERS.items():
+            data['formatters'].setdefault(name, formatter)
         data['formatters'].update(self._ui_system.custom_formatters())
 
         hotkeys = {}
@@ -275,66 +321,56 @@ class _UiSectionProcessor:
 
 
 class _Interpolator(Interpolator):
-    def __init__(self, formatters: Dict[str, Union[Dict[str, str], Callable[[str], str]]], ui: UiContext):
+    def __init__(self, formatters: Dict[str, Union[Dict[str, str], Callable[[str], str]]], ui: _UiSystem):
         self._formatters = formatters
         self._ui = ui
+        self._rendered: Dict[str, Tuple[int, str]] = {}
 
     def get_value(self, key: str) -> str:
         return self._ui.get_value(key)
 
     def interpolate(self, text):
-        reading_state = 0
-        reading_value = ''
-        reading_modifier = ''
-        reading_arguments = []
-        reading_current_argument = ''
-        values = dict()
-
-        for character in text:
-            if reading_state == 0:
-                if character == '{':
-                    reading_state = 1
-                    reading_value = ''
-
-            elif reading_state == 1:
-                if character == '}':
-                    reading_state = 0
-                    values[reading_value] = self._call_formatter(reading_value, reading_value) if reading_value in self._formatters else self._ui.get_value(reading_value)
-                elif character == ':':
-                    reading_state = 2
-                    reading_modifier = ''
-                else:
-                    reading_value += character
-
-            elif reading_state == 2:
-                if character == '=':
-                    reading_arguments = []
-                    reading_current_argument = ''
-                    reading_state = 3
-                elif character == '}':
-                    reading_state = 0
-                    values[reading_value + ':' + reading_modifier] = self._call_formatter(reading_modifier, reading_value)
-                else:
-                    reading_modifier += character
-
-            elif reading_state == 3:
-                if character == '}':
-                    reading_arguments.append(reading_current_argument)
-                    reading_state = 0
-                    values[reading_value + ':' + reading_modifier + '=' + ','.join(reading_arguments)] = self._call_formatter(reading_modifier, reading_value, reading_arguments)
-                elif character == ',':
-                    reading_arguments.append(reading_current_argument)
-                    reading_current_argument = ''
-                else:
-                    reading_current_argument += character
+        template = compile_template(text)
+        if len(template.placeholders) == 0:
+            return text
 
-            else:
-                raise NotImplementedError(reading_state)
+        rendered = self._rendered.get(text)
+        if rendered is not None and not self._ui.changed_since(rendered[0], template.variables):
+            return rendered[1]
 
-        for var_name, var_value in values.items():
-            text = text.replace("{" + var_name + "}", str(var_value))
+        revision = self._ui.revision()
+        result = self._render(template)
+        self._rendered[text] = (revision, result)
+        return result
 
-        return text
+    def _render(self, template: 'CompiledTemplate') -> str:
+        values: Dict[str, str] = {}
+        rendered = []
+        for part in template.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+            value = values.get(part.key)
+            if value is None:
+                value = str(self._placeholder_value(part))
+                values[part.key] = value
+            rendered.append(value)
+        return ''.join(rendered)
+
+    def revision(self) -> int:
+        return self._ui.revision()
+
+    def changed_since(self, revision: int, variables: Iterable[str]) -> bool:
+        return self._ui.changed_since(revision, variables)
+
+    def _placeholder_value(self, placeholder: 'Placeholder') -> str:
+        if placeholder.modifier is None:
+            if placeholder.variable in self._formatters:
+                return self._call_formatter(placeholder.variable, placeholder.variable)
+            return self._ui.get_value(placeholder.variable)
+        if placeholder.arguments is None:
+            return self._call_formatter(placeholder.modifier, placeholder.variable)
+        return self._call_formatter(placeholder.modifier, placeholder.variable, list(placeholder.arguments))
 
     def _call_formatter(self, reading_modifier: str, reading_value: str, reading_arguments: List[str] = None) -> str:
         if reading_modifier not in self._formatters:
@@ -362,6 +398,56 @@ class _Interpolator(Interpolator):
             ) from e
 
 
+class Placeholder(NamedTuple):
+    key: str
+    variable: str
+    modifier: Optional[str]
+    arguments: Optional[Tuple[str, ...]]
+
+
+class CompiledTemplate(NamedTuple):
+    parts: Tuple[Union[str, Placeholder], ...]
+    placeholders: Tuple[Placeholder, ...]
+    variables: FrozenSet[str]
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(text: str) -> CompiledTemplate:
+    """Splits text into literals and {variable}, {variable:formatter} or {variable:formatter=arg1,arg2} placeholders.
+    An unterminated placeholder stays as literal text.
+    """
+    parts: List[Union[str, Placeholder]] = []
+    literal_start = 0
+    position = 0
+    while True:
+        start = text.find('{', position)
+        if start == -1:
+            break
+        end = text.find('}', start + 1)
+        if end == -1:
+            break
+        if start > literal_start:
+            parts.append(text[literal_start:start])
+        parts.append(_parse_placeholder(text[start + 1:end]))
+        literal_start = position = end + 1
+
+    if literal_start < len(text):
+        parts.append(text[literal_start:])
+
+    placeholders = tuple(part for part in parts if isinstance(part, Placeholder))
+    return CompiledTemplate(tuple(parts), placeholders, frozenset(placeholder.variable for placeholder in placeholders))
+
+
+def _parse_placeholder(key: str) -> Placeholder:
+    variable, colon, modifier = key.partition(':')
+    if not colon:
+        return Placeholder(key, variable, None, None)
+    modifier, equals, arguments = modifier.partition('=')
+    if not equals:
+        return Placeholder(key, variable, modifier, None)
+    return Placeholder(key, variable, modifier, tuple(arguments.split(',')))
+
+
 class _EffectResolver:
     def __init__(self, ui, data, additional_effects: Dict[str, Callable[[Effect], None]]):
         self._ui = ui
@@ -259,6 +259,13 @@ class _Menu(UiSection):
 
         self._data['entries'] = entries
         self._append_conditional_action_buttons()
+        self._condition_variables = frozenset(
+            entry_action['if']
+            for entry in self._data['entries']
+            for entry_action in entry.get('actions', {}).values()
+            if isinstance(entry_action, dict) and entry_action.get('if') is not None
+        )
+        self._visible_actions_cache = None
 
     def _append_conditional_action_buttons(self):
         # The layout is derived from the entries: any entry action carrying an "if"
@@ -354,7 +361,16 @@ class _Menu(UiSection):
         # would render it active; the holes for the other entries are what keeps the
         # row layout stable. Entries where the action is missing or its 'if'
         # evaluates false do not count as active.
-        return [action for action in self._data['actions'] if self._is_slot_visible(action)]
+        # Only the "if" variables decide it, so it is reused until one of them changes.
+        if self._visible_actions_cache is not None:
+            revision, actions = self._visible_actions_cache
+            if not self._interpolator.changed_since(revision, self._condition_variables):
+                return actions
+
+        revision = self._interpolator.revision()
+        actions = [action for action in self._data['actions'] if self._is_slot_visible(action)]
+        self._visible_actions_cache = (revision, actions)
+        return actions
 
     def _is_slot_visible(self, action):
         if action['type'] != 'symbol':
@@ -15,8 +15,10 @@
 
 # You can download the latest version of this tool from:
 # https://github.com/theypsilon/Update_All_MiSTer
+import marshal
+from collections.abc import Mapping
 from enum import Enum
-from typing import Callable, Any, TypeVar, Dict
+from typing import Callable, Any, TypeVar, Dict, List, Optional, Tuple, Iterator
 
 
 class Key(Enum):
@@ -106,12 +108,106 @@ def _add_variables_descriptions(result, item, group):
         result[variable] = description
 
 
+class ModelIndex:
+    """Lookups over a model computed with a single walk, which also expands all its base types.
+
+    Variables by group, effects by type and the variables declared within each section are
+    all precomputed. The model is owned by the index afterwards. new_model() hands out mutable
+    copies of it, already expanded, that only deserialize the sections that are actually visited.
+    """
+
+    def __init__(self, model: Dict[str, Any], base_types: Optional[Dict[str, Any]] = None):
+        self._model = model
+        self._nodes: List[Any] = []
+        self._effects_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self._variables_by_group: Dict[Optional[str], Dict[str, Any]] = {None: {}}
+        self._variables_by_section: Dict[str, Dict[str, Any]] = {}
+        _walk_model(model.get('base_types', {}) if base_types is None else base_types, model, None, self._add_node)
+
+        self._serialized_sections: Optional[Dict[str, bytes]] = None
+        self._serialized_root: Optional[bytes] = None
+
+    def _add_node(self, node: Any, section: Optional[str]) -> None:
+        self._nodes.append(node)
+        if not isinstance(node, dict):
+            return
+
+        if 'type' in node:
+            self._effects_by_type.setdefault(node['type'], []).append(node)
+
+        for variable, description in node.get('variables', {}).items():
+            self._add_variable_description(variable, description, section)
+
+    def _add_variable_description(self, variable: str, description: Dict[str, Any], section: Optional[str]) -> None:
+        self._variables_by_group[None][variable] = description
+        if section is not None:
+            self._variables_by_section.setdefault(section, {})[variable] = description
+
+        if 'group' not in description:
+            return
+
+        description_group = description['group'] if isinstance(description['group'], list) else [description['group']]
+        for group in description_group:
+            self._variables_by_group.setdefault(group, {})[variable] = description
+
+    def nodes(self) -> Tuple[Any, ...]:
+        return tuple(self._nodes)
+
+    def variable_declarations(self, group: Optional[str] = None) -> Dict[str, Any]:
+        result = dict(self._variables_by_group.get(group, {}))
+        if group is not None:
+            # like gather_variable_declarations, only the descriptions of the requested group get their name
+            for variable, description in result.items():
+                description['name'] = description['rename'] if 'rename' in description else variable
+        return result
+
+    def section_variables(self, section: str) -> Dict[str, Any]:
+        """Variables declared anywhere within the given section: its entries, actions and effects."""
+        return dict(self._variables_by_section.get(section, {}))
+
+    def effects_by_type(self, effect_type: str) -> List[Dict[str, Any]]:
+        return list(self._effects_by_type.get(effect_type, []))
+
+    def new_model(self) -> Dict[str, Any]:
+        if self._serialized_root is None:
+            self._serialized_sections = {name: marshal.dumps(section) for name, section in self._model.get('items', {}).items()}
+            self._serialized_root = marshal.dumps({key: value for key, value in self._model.items() if key != 'items'})
+
+        model = marshal.loads(self._serialized_root)
+        if 'items' in self._model:
+            model['items'] = _LazySections(self._serialized_sections)
+        return model
+
+
+class _LazySections(Mapping):
+    def __init__(self, serialized_sections: Dict[str, bytes]):
+        self._serialized_sections = serialized_sections
+        self._sections: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        section = self._sections.get(name)
+        if section is None:
+            section = marshal.loads(self._serialized_sections[name])
+            self._sections[name] = section
+        return section
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._serialized_sections)
+
+    def __len__(self) -> int:
+        return len(self._serialized_sections)
+
+
 TResult = TypeVar('TResult')
 
 
 def search_in_model(result: TResult, base_types: Dict[str, Any], item, cb: Callable[[TResult, Any], None]) -> None:
+    _walk_model(base_types, item, None, lambda node, _section: cb(result, node))
+
+
+def _walk_model(base_types: Dict[str, Any], item, section: Optional[str], cb: Callable[[Any, Optional[str]], None]) -> None:
     expand_type(item, base_types)
-    cb(result, item)
+    cb(item, section)
 
     if 'actions' in item:
         if isinstance(item['actions'], dict):
@@ -120,27 +216,27 @@ def search_in_model(result: TResult, base_types: Dict[str, Any], item, cb: Calla
                 # {"if": variable, "target": chain}.
                 chain = action_chain if isinstance(action_chain, list) else action_chain.get('chain', [])
                 for action in chain:
-                    search_in_model(result, base_types, action, cb)
+                    _walk_model(base_types, action, section, cb)
 
         elif isinstance(item['actions'], list):
             for action in item['actions']:
-                search_in_model(result, base_types, action, cb)
+                _walk_model(base_types, action, section, cb)
 
     if 'entries' in item:
         for entry in item['entries']:
-            search_in_model(result, base_types, entry, cb)
+            _walk_model(base_types, entry, section, cb)
 
     if 'effects' in item:
         for effect in item['effects']:
-            search_in_model(result, base_types, effect, cb)
+            _walk_model(base_types, effect, section, cb)
 
     if 'items' in item:
-        for item in item['items'].values():
-            search_in_model(result, base_types, item, cb)
+        for name, section_item in item['items'].items():
+            _walk_model(base_types, section_item, name, cb)
 
     if 'on_idle' in item:
         for idle_effect in item['on_idle']:
-            search_in_model(result, base_types, idle_effect, cb)
+            _walk_model(base_types, idle_effect, section, cb)
 
     if 'type' not in item:
         return
@@ -148,14 +244,14 @@ def search_in_model(result: TResult, base_types: Dict[str, Any], item, cb: Calla
     node_type = item['type']
     if node_type == 'fixed':
         for fixed in item['fixed']:
-            search_in_model(result, base_types, fixed, cb)
+            _walk_model(base_types, fixed, section, cb)
 
     elif node_type == 'condition':
         for key, branch in item.items():
             if key in ('type', 'variable') or not isinstance(branch, list):
                 continue
             for effect in branch:
-                search_in_model(result, base_types, effect, cb)
+                _walk_model(base_types, effect, section, cb)
 
 
 def dynamic_convert_string(value):
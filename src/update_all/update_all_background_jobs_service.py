@@ -17,7 +17,7 @@
 # https://github.com/theypsilon/Update_All_MiSTer
 import time
 from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, wait
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from update_all.constants import BACKGROUND_JOBS_HARD_TIMEOUT, BACKGROUND_JOBS_SOFT_TIMEOUT
 from update_all.logger import Logger
@@ -25,6 +25,8 @@ from update_all.retroaccount import RetroAccountService
 from update_all.update_all_self_update_service import UpdateAllSelfUpdateService
 from update_all.update_output import NoopUpdateOutput
 
+T = TypeVar('T')
+
 
 class UpdateAllSelfUpdateCheck:
     def __init__(self, expected_hashes_future: Future, installed_hashes_future: Future):
@@ -94,16 +96,16 @@ class UpdateAllBackgroundJobsService:
         if self._retroaccount_future is None:
             return
 
-        self._logger.bench("UpdateAllService: Background Soft Wait START")
-        try:
-            self._retroaccount_future.result(timeout=BACKGROUND_JOBS_SOFT_TIMEOUT)
-            self._logger.bench("UpdateAllService: Background Soft Wait END completed")
-        except TimeoutError:
-            self._logger.bench("UpdateAllService: Background Soft Wait END pending")
-        except Exception as e:
-            self._logger.debug('RetroAccount background job failed before Downloader.')
-            self._logger.debug(e)
-            self._logger.bench("UpdateAllService: Background Soft Wait END failed")
+        with self._logger.span('background_jobs.soft_wait') as span:
+            try:
+                self._retroaccount_future.result(timeout=BACKGROUND_JOBS_SOFT_TIMEOUT)
+                span.set('result', 'completed')
+            except TimeoutError:
+                span.set('result', 'pending')
+            except Exception as e:
+                self._logger.debug('RetroAccount background job failed before Downloader.')
+                self._logger.debug(e)
+                span.set('result', 'failed')
 
     def stop_background_jobs_for_restart(self) -> None:
         if self._retroaccount_future is not None and not self._retroaccount_future.done():
@@ -144,9 +146,8 @@ class UpdateAllBackgroundJobsService:
         self._executor = None
 
     def _sync_retroaccount(self) -> None:
-        self._logger.bench('UpdateAllService: Background job START')
-        self._retroaccount.mister_sync(NoopUpdateOutput())
-        self._logger.bench('UpdateAllService: Background job END')
+        with self._logger.span('background_jobs.retroaccount_sync'):
+            self._retroaccount.mister_sync(NoopUpdateOutput())
 
     def _start_self_update_check(
             self,
@@ -156,6 +157,10 @@ class UpdateAllBackgroundJobsService:
             self._logger.debug('Early Update All check skipped.')
             return None
         return UpdateAllSelfUpdateCheck(
-            executor.submit(self._self_update_service.fetch_expected_hashes),
-            executor.submit(self._self_update_service.hash_installed_files),
+            executor.submit(self._traced, 'background_jobs.fetch_expected_hashes', self._self_update_service.fetch_expected_hashes),
+            executor.submit(self._traced, 'background_jobs.hash_installed_files', self._self_update_service.hash_installed_files),
         )
+
+    def _traced(self, name: str, job: Callable[[], T]) -> T:
+        with self._logger.span(name):
+            return job()
@@ -37,16 +37,20 @@ from update_all.constants import UPDATE_ALL_VERSION, FILE_update_all_log, FILE_m
     EXIT_CODE_CAN_CONTINUE, supporter_plus_patrons, FILE_downloader_needs_reboot_after_linux_update, \
     FILE_downloader_launcher_downloader_script, FILE_downloader_launcher_update_script, \
     COMMAND_TIMELINE, COMMAND_LATEST_LOG, COMMAND_SHOW_CHIP_ID_RESULT, \
-    FILE_update_all_print_tmp_log, FILE_mister_version, FILE_JOTEGO_mra_pack_ini
+    FILE_update_all_print_tmp_log, FILE_mister_version, FILE_JOTEGO_mra_pack_ini, FILE_update_all_perf_history
 from update_all.countdown import Countdown, CountdownImpl, CountdownOutcome
 from update_all.ini_repository import IniRepository, active_databases
 from update_all.local_store import LocalStore
+from update_all.log_document import ConcatDocument, ListDocument, ViewerDocument
 from update_all.log_viewer import LogViewer, create_log_document, to_overscanned_doc
 from update_all.mister_ini_repository import MisterIniRepository
+from update_all.names_index import NamesIndex
 from update_all.jtcores_service import JtcoresService
 from update_all.other import GenericProvider, terminal_size
 from update_all.logger import Logger, close_print_tmp_log_file
 from update_all.os_utils import OsUtils, LinuxOsUtils
+from update_all.perf_history import append_perf_record, find_regressions, format_regressions, make_perf_record, \
+    peak_rss_kb, perf_history_runs
 from update_all.settings_screen import SettingsScreen
 from update_all.settings_screen_standard_curses_printer import SettingsScreenStandardCursesPrinter
 from update_all.store_migrator import StoreMigrator
@@ -55,6 +59,7 @@ from update_all.local_repository import LocalRepository
 from update_all.file_system import FileSystemFactory, FileSystem
 from update_all.config_reader import ConfigReader
 from update_all.timeline import Timeline
+from update_all.tracing import tracer
 from update_all.transition_service import TransitionService
 from update_all.fetcher import Fetcher
 from update_all.mister_video_mode_service import MisterVideoModeService
@@ -104,7 +109,8 @@ class UpdateAllServiceFactory:
         self._local_repository_provider.initialize(local_repository)
         transition_service = TransitionService(logger=self._logger, file_system=file_system, os_utils=os_utils, ini_repository=ini_repository, mister_ini_repository=mister_ini_repository)
         printer = SettingsScreenStandardCursesPrinter()
-        ao_service = ArcadeOrganizerService(self._logger, fetcher)
+        names_index = NamesIndex(file_system)
+        ao_service = ArcadeOrganizerService(self._logger, fetcher, names_index)
         encryption = Encryption(self._logger, config_provider, file_system)
         retroaccount_gateway = RetroAccountGateway(config_provider, self._logger, file_system, fetcher)
         jtcores_service = JtcoresService(config_provider, store_provider, ini_repository)
@@ -169,7 +175,7 @@ class UpdateAllServiceFactory:
             store_provider=store_provider,
             file_system=file_system
         )
-        timeline = Timeline(self._logger, config_provider, file_system, encryption, retroaccount)
+        timeline = Timeline(self._logger, config_provider, file_system, encryption, retroaccount, names_index)
         return UpdateAllService(
             config_provider,
             self._logger,
@@ -299,6 +305,12 @@ class UpdateAllService:
         self._timeline_after_log_doc: list[str] = []
 
     def full_run(self, run_pass: UpdateAllServicePass) -> int:
+        with self._logger.span('update_all.full_run', run_pass=run_pass.name) as span:
+            exit_code = self._full_run(run_pass)
+            span.set('exit_code', exit_code)
+            return exit_code
+
+    def _full_run(self, run_pass: UpdateAllServicePass) -> int:
         if self._is_media_fat_read_only():
             self._logger.print('The SD card is temporarily not writable.')
             self._logger.print('This is usually resolved by rebooting your MiSTer.')
@@ -311,7 +323,8 @@ class UpdateAllService:
         should_print_sequence = False
 
         if run_pass == UpdateAllServicePass.Continue:
-            self._environment_setup.setup_environment(ts, NoopUpdateOutput())
+            with self._logger.span('update_all.setup_environment'):
+                self._environment_setup.setup_environment(ts, NoopUpdateOutput())
             consumed_resume_point = self._self_update_service.take_resume_point()
             destination = (
                 'downloader'
@@ -325,13 +338,15 @@ class UpdateAllService:
                 should_print_sequence = True
         elif run_pass == UpdateAllServicePass.RetroAccountSync:
             update_output = LtsvUpdateOutput()
-            env_result = self._environment_setup.setup_environment(ts, update_output)
+            with self._logger.span('update_all.setup_environment'):
+                env_result = self._environment_setup.setup_environment(ts, update_output)
             if env_result.requires_early_exit:
                 return EXIT_CODE_REQUIRES_EARLY_EXIT
             self._retroaccount.mister_sync(update_output)
             return self._exit_code
         else:
-            env_result = self._environment_setup.setup_environment(ts, NoopUpdateOutput())
+            with self._logger.span('update_all.setup_environment'):
+                env_result = self._environment_setup.setup_environment(ts, NoopUpdateOutput())
             command = self._config_provider.get().command
             self._logger.debug(f'Update All flow command: {command}.')
             if env_result.requires_early_exit:
@@ -354,7 +369,8 @@ class UpdateAllService:
                 check_for_self_update=run_pass == UpdateAllServicePass.NewRun,
             )
             self._show_intro()
-            countdown_outcome = self._countdown_for_settings_screen()
+            with self._logger.span('update_all.countdown'):
+                countdown_outcome = self._countdown_for_settings_screen()
             open_settings_screen = countdown_outcome == CountdownOutcome.SETTINGS_SCREEN
             destination = 'settings-screen' if open_settings_screen else 'downloader'
             self._logger.debug(f'Update All flow destination: {destination}.')
@@ -377,8 +393,10 @@ class UpdateAllService:
 
         if consumed_resume_point != UpdateAllResumePoint.AFTER_DOWNLOADER:
             self._background_jobs_service.wait_for_retroaccount_before_downloader()
-            standard_downloader_ran_successfully = self._run_standard_downloader_if_enabled()
-            self._sync_downloader_launcher()
+            with self._logger.span('update_all.downloader'):
+                standard_downloader_ran_successfully = self._run_standard_downloader_if_enabled()
+            with self._logger.span('update_all.sync_downloader_launcher'):
+                self._sync_downloader_launcher()
 
             # Reset point 2 is prepared only after this full Downloader phase succeeds.
             if (
@@ -391,12 +409,17 @@ class UpdateAllService:
             ):
                 return EXIT_CODE_CAN_CONTINUE
 
-        self._run_pocket_tools()
-        self._run_arcade_organizer()
-        self._cleanup()
-        self._background_jobs_service.finish_background_jobs_before_outro(deferred_self_update_check)
+        with self._logger.span('update_all.pocket_tools'):
+            self._run_pocket_tools()
+        with self._logger.span('update_all.arcade_organizer'):
+            self._run_arcade_organizer()
+        with self._logger.span('update_all.cleanup'):
+            self._cleanup()
+        with self._logger.span('update_all.finish_background_jobs'):
+            self._background_jobs_service.finish_background_jobs_before_outro(deferred_self_update_check)
         self._show_outro()
-        self._show_interactive_log_viewer_and_timeline()
+        with self._logger.span('update_all.log_viewer_and_timeline'):
+            self._show_interactive_log_viewer_and_timeline()
         self._reboot_if_needed()
         return self._exit_code
 
@@ -424,16 +447,11 @@ class UpdateAllService:
             oc = config.overscan_dim
             columns = ts.columns
             cols_overscan = oc.cols
-            log_doc = create_log_document(FILE_update_all_log if self._file_system.is_file(FILE_update_all_log) else 'test_log_viewer.log')
+            log_doc = create_log_document(FILE_update_all_log if self._file_system.is_file(FILE_update_all_log) else 'test_log_viewer.log', columns, cols_overscan)
             timeline_doc = self._timeline.load_timeline_doc(env_check_skip=True)
-            log_doc = to_overscanned_doc(log_doc, columns, cols_overscan)
-            timeline_doc = to_overscanned_doc(timeline_doc, columns, cols_overscan)
-            total_doc = [*log_doc, *timeline_doc]
-            index = len(timeline_doc)
-            if index > 2:
-                index -= 2
-
-            self._log_viewer.show(total_doc, {}, index)
+            bottom_line = log_doc.line_count() + (1 if timeline_doc.line_count() > 2 else -1)
+
+            self._log_viewer.show(ConcatDocument([log_doc, timeline_doc]), {}, bottom_line=max(0, bottom_line))
         elif test_routine == 'SETTINGS_SCREEN':
             self._settings_screen.load_test_menu()
         elif test_routine == 'POCKET_FIRMWARE_UPDATE':
@@ -533,7 +551,8 @@ class UpdateAllService:
 
         self._logger.debug('Loading Settings Screen main menu.')
         try:
-            self._settings_screen.load_main_menu()
+            with self._logger.span('update_all.settings_screen'):
+                self._settings_screen.load_main_menu()
         except Exception as e:
             self._logger.print()
             self._logger.debug(e)
@@ -545,7 +564,7 @@ class UpdateAllService:
     def _pre_run_tweaks(self):
         config = self._config_provider.get()
 
-        self._logger.bench("Time reset on pre-run stage")
+        self._logger.debug("Time reset on pre-run stage.")
         config.start_time = time.monotonic()
 
         if config.not_mister:
@@ -658,6 +677,7 @@ class UpdateAllService:
         self._end_time = time.monotonic()
         run_time = format_run_time(self._end_time - config.start_time)
         self._logger.print(calculate_outro_summary(config, run_time, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        self._record_perf_history(config)
         self._logger.debug(f"Commit: {config.commit}")
         self._logger.debug(f"Boot time: {config.boot_time}")
         if self._zaparoo_service.frontend_activation_applied():
@@ -690,6 +710,31 @@ class UpdateAllService:
         supporter_of_the_day = supporter_plus_patrons[days_since_epoch % len(supporter_plus_patrons)]
         self._logger.print(calculate_supporter_shoutout(self._config_provider.get(), supporter_of_the_day))
 
+    def _record_perf_history(self, config: Config) -> None:
+        # the memory tracking spans reset ru_maxrss, so the tracer keeps the peak of the whole run
+        peak_rss = max(peak_rss_kb(), tracer.run_peak_rss_kb())
+        record = make_perf_record(tracer.events(), tracer.counters(), self._end_time - config.start_time, peak_rss, config.commit)
+        try:
+            history = self._file_system.load_dict_from_file(FILE_update_all_perf_history) if self._file_system.is_file(FILE_update_all_perf_history) else None
+        except Exception as e:
+            self._logger.debug('Could not read the performance history.')
+            self._logger.debug(e)
+            history = None
+
+        runs = perf_history_runs(history)
+        regressions = find_regressions(runs, record)
+        for regression in regressions:
+            self._logger.debug(f'Performance regression: {regression.phase} took {regression.seconds:.3f}s, median {regression.median:.3f}s.')
+        if len(regressions) > 0:
+            self._logger.print(format_regressions(regressions))
+
+        try:
+            self._file_system.make_dirs_parent(FILE_update_all_perf_history)
+            self._file_system.save_json(append_perf_record(runs, record), FILE_update_all_perf_history)
+        except Exception as e:
+            self._logger.debug('Could not save the performance history.')
+            self._logger.debug(e)
+
     def _show_interactive_log_viewer_and_timeline(self) -> None:
         config = self._config_provider.get()
         if config.non_interactive:
@@ -699,8 +744,7 @@ class UpdateAllService:
         if config.log_viewer:
             try:
                 close_print_tmp_log_file()
-                log_doc = create_log_document(FILE_update_all_print_tmp_log) if config.log_viewer else []
-                timeline_doc = []
+                timeline_doc: ViewerDocument = ListDocument([])
                 if config.timeline_after_logs:
                     try:
                         timeline_doc = self._timeline.load_timeline_doc()
@@ -715,21 +759,24 @@ class UpdateAllService:
                 cols_overscan = oc.cols
                 usable = columns - cols_overscan * 2
 
-                if len(log_doc) > 0 and len(timeline_doc) > 0:
-                    log_doc.append("\n")
-                    log_doc.append("=" * usable + "\n")
-                    log_doc.append("\n")
-                    log_doc.append("GO DOWN TO CHECK A SUMMARY OF WHAT'S BEEN UPDATED!!".center(usable) + "\n")
-
-                log_doc = to_overscanned_doc(log_doc, columns, cols_overscan)
-                timeline_doc = to_overscanned_doc(timeline_doc, columns, cols_overscan)
-                total_doc = [*log_doc, *timeline_doc]
-                index = len(timeline_doc)
-                if index > 5:
-                    index -= 5
-
-                if len(total_doc) > 0:
-                    self._log_viewer.show(total_doc, {}, index)
+                with self._logger.span('log_viewer.load_log_document'):
+                    log_doc = create_log_document(FILE_update_all_print_tmp_log, columns, cols_overscan)
+                separator_doc = []
+                if log_doc.line_count() > 0 and timeline_doc.line_count() > 0:
+                    separator_doc = to_overscanned_doc([
+                        "\n",
+                        "=" * usable + "\n",
+                        "\n",
+                        "GO DOWN TO CHECK A SUMMARY OF WHAT'S BEEN UPDATED!!".center(usable) + "\n",
+                    ], columns, cols_overscan)
+
+                total_doc = ConcatDocument([log_doc, ListDocument(separator_doc), timeline_doc])
+                timeline_start = log_doc.line_count() + len(separator_doc)
+                bottom_line = timeline_start + (4 if timeline_doc.line_count() > 5 else -1)
+
+                # no follow: background jobs are done and the print log is closed, so nothing grows while this is shown
+                if total_doc.line_count() > 0:
+                    self._log_viewer.show(total_doc, {}, bottom_line=max(0, bottom_line))
             except Exception as e:
                 self._logger.debug(e)
                 self._logger.debug('Recovering from error by suspending log viewer.')
@@ -739,8 +786,8 @@ class UpdateAllService:
         ts = config.term_size
         oc = config.overscan_dim
         try:
-            latest_log = create_log_document(self._file_system.resolve(FILE_update_all_log))
-            latest_log = to_overscanned_doc(latest_log, ts.columns, oc.cols)
+            # no follow: a run only copies its log over update_all.log when it finalizes, so nothing appends to it
+            latest_log = create_log_document(self._file_system.resolve(FILE_update_all_log), ts.columns, oc.cols, save_index=True)
             self._log_viewer.show(latest_log, {}, 0)
         except Exception as e:
             self._logger.debug(e)
@@ -758,14 +805,13 @@ class UpdateAllService:
             self._logger.print('The Timeline data could not be updated because of an internet connection problem. Try again later to see an updated Timeline.')
 
         timeline_doc = self._timeline.load_timeline_doc(env_check_skip=True)
-        if len(timeline_doc) > 0:
+        if timeline_doc.line_count() > 0:
             self._logger.print('Showing interactive Update Timeline viewer:')
-            timeline_doc = to_overscanned_doc(timeline_doc, config.term_size.columns, config.overscan_dim.cols)
-            self._log_viewer.show(timeline_doc, {}, len(timeline_doc))
+            self._log_viewer.show(timeline_doc, {}, bottom_line=0)
         else:
             self._logger.print('No timeline entries found. Try again later!')
 
-        self._logger.print(''.join(timeline_doc))
+        self._logger.print(''.join(timeline_doc.rows()))
 
     def _reboot_if_needed(self) -> None:
         config = self._config_provider.get()